@@ -0,0 +1,218 @@
+from typing import Optional
+
+import numpy as np
+
+from constants import DEFAULT_CAPACITY, DEFAULT_LOWER_FLOOR, DEFAULT_TOP_FLOOR, DEFAULT_PASSENGER_COUNT, \
+    TRIP_PROBABILITY
+from exceptions import InvalidFloorError
+
+RESTING = 0
+ACTIVE = 1
+AWAITING = 2
+RIDING = 3
+
+UP = 1
+IDLE = 0
+DOWN = -1
+
+
+class BatchSimulation:
+    """
+    Simulates many independent single-car buildings at once with NumPy arrays.
+
+    Every building follows the semantics of `Elevator.move` followed by `Passenger.move` of all of its
+    passengers, but a tick of all buildings is a handful of vectorized operations instead of a Python
+    loop over objects. Floors are stored as offsets from `lower_floor`.
+
+    Attributes:
+        buildings (int): Number of simulated buildings.
+        lower_floor (int): The lowest floor of every building.
+        top_floor (np.ndarray): The highest floor of each building.
+        capacity (np.ndarray): Car capacity of each building.
+        trip_probability (float): Chance that a resting passenger starts a trip on a tick.
+        car_floor (np.ndarray): Current floor offset of each car.
+        direction (np.ndarray): Direction of each car, UP, DOWN or IDLE.
+        doors_open (np.ndarray): Door state of each car.
+        calls (np.ndarray): Per-floor bitmap of the floors each car intends to visit.
+        exists (np.ndarray): Marks the passenger slots in use, buildings may have fewer passengers than slots.
+        passenger_floor (np.ndarray): Current floor offset of each passenger.
+        passenger_target (np.ndarray): Target floor offset of each passenger.
+        passenger_state (np.ndarray): RESTING, ACTIVE (going to call), AWAITING or RIDING.
+        trips (np.ndarray): Number of passengers delivered to their target floor in each building.
+        ticks (int): Number of simulated ticks.
+    """
+
+    def __init__(self,
+                 buildings: int,
+                 passenger_count=DEFAULT_PASSENGER_COUNT,
+                 capacity=DEFAULT_CAPACITY,
+                 lower_floor: int = DEFAULT_LOWER_FLOOR,
+                 top_floor=DEFAULT_TOP_FLOOR,
+                 trip_probability: float = TRIP_PROBABILITY,
+                 seed: Optional[int] = None) -> None:
+        """
+        Creates the buildings with randomly placed resting passengers and cars on the lowest floor.
+
+        `passenger_count`, `capacity` and `top_floor` are either scalars or one value per building.
+        """
+        self.rng = np.random.default_rng(seed)
+        self.buildings = buildings
+        self.lower_floor = lower_floor
+        self.top_floor = np.broadcast_to(np.asarray(top_floor, dtype=np.int64), (buildings,)).copy()
+        self.capacity = np.broadcast_to(np.asarray(capacity, dtype=np.int64), (buildings,)).copy()
+        self.trip_probability = trip_probability
+        self._floor_count = self.top_floor - lower_floor + 1
+        floors = int(self._floor_count.max())
+        counts = np.broadcast_to(np.asarray(passenger_count, dtype=np.int64), (buildings,))
+        slots = int(counts.max()) if buildings else 0
+
+        self.car_floor = np.zeros(buildings, dtype=np.int64)
+        self.direction = np.zeros(buildings, dtype=np.int8)
+        self.doors_open = np.zeros(buildings, dtype=bool)
+        self.calls = np.zeros((buildings, floors), dtype=bool)
+        self.exists = np.arange(slots) < counts[:, None]
+        span = self._floor_count[:, None]
+        self.passenger_floor = (self.rng.random((buildings, slots)) * span).astype(np.int64)
+        self.passenger_target = (self.rng.random((buildings, slots)) * span).astype(np.int64)
+        self.passenger_state = np.full((buildings, slots), RESTING, dtype=np.int8)
+        self.trips = np.zeros(buildings, dtype=np.int64)
+        self.ticks = 0
+        self._floors = np.arange(floors)
+        self._rows = np.arange(buildings)
+
+    @classmethod
+    def from_scalar(cls, scenarios: list, trip_probability: float = TRIP_PROBABILITY,
+                    seed: Optional[int] = None) -> 'BatchSimulation':
+        """
+        Copies the state of `(elevator, passengers)` pairs into a new batch, one building per pair.
+
+        All elevators must share the same lowest floor.
+        """
+        lower_floor = scenarios[0][0].lower_floor
+        batch = cls(len(scenarios),
+                    passenger_count=[len(passengers) for _, passengers in scenarios],
+                    capacity=[elevator.capacity for elevator, _ in scenarios],
+                    lower_floor=lower_floor,
+                    top_floor=[elevator.top_floor for elevator, _ in scenarios],
+                    trip_probability=trip_probability,
+                    seed=seed)
+        directions = {None: IDLE, 'up': UP, 'down': DOWN}
+        for building, (elevator, passengers) in enumerate(scenarios):
+            batch.car_floor[building] = elevator.current_floor - lower_floor
+            batch.direction[building] = directions[elevator.direction]
+            batch.doors_open[building] = elevator.doors_open
+            batch.calls[building, [floor - lower_floor for floor in elevator.queue]] = True
+            for slot, passenger in enumerate(passengers):
+                batch.passenger_floor[building, slot] = passenger.current_floor - lower_floor
+                batch.passenger_target[building, slot] = passenger.target_floor - lower_floor
+                if passenger._in_elevator:
+                    state = RIDING
+                elif passenger._is_resting:
+                    state = RESTING
+                else:
+                    state = AWAITING if passenger._awaits else ACTIVE
+                batch.passenger_state[building, slot] = state
+        return batch
+
+    def step(self) -> None:
+        """Advances every building by one tick: the cars move first, then every passenger acts."""
+        self._move_cars()
+        self._move_passengers()
+        self.ticks += 1
+
+    def run(self, ticks: int) -> None:
+        """Advances every building by `ticks` ticks."""
+        for _ in range(ticks):
+            self.step()
+
+    def _move_cars(self) -> None:
+        """Vectorized `Elevator.move` of every car."""
+        rows = self._rows
+        busy = self.calls.any(axis=1)
+        idle = ~busy
+        self.direction[idle] = IDLE
+        self.doors_open[idle] = False
+        if not busy.any():
+            return
+
+        self._eject_overload(busy)
+
+        # choose_direction: the closest call wins, ties go to the lower floor.
+        offset = self._floors[None, :] - self.car_floor[:, None]
+        distance = np.where(self.calls, 2 * np.abs(offset) + (offset > 0), np.iinfo(np.int64).max)
+        closest = distance.argmin(axis=1)
+        calls_above = (self.calls & (offset > 0)).any(axis=1)
+        calls_below = (self.calls & (offset < 0)).any(axis=1)
+        direction = self.direction
+        start = busy & (direction == IDLE)
+        turn_down = busy & (direction == UP) & ~calls_above & calls_below
+        turn_up = busy & (direction == DOWN) & ~calls_below & calls_above
+        # At the end of the shaft with no call ahead, the car heads for the closest call.
+        at_end = (busy & ~turn_down & ~turn_up
+                  & (((direction == UP) & (self.car_floor == self._floor_count - 1))
+                     | ((direction == DOWN) & (self.car_floor == 0))))
+        towards_closest = np.sign(closest - self.car_floor)
+        direction[start | at_end] = towards_closest[start | at_end]
+        direction[turn_down] = DOWN
+        direction[turn_up] = UP
+
+        self.doors_open[busy] = False
+        # A car leaving its shaft fails as `Elevator.current_floor` does, it is never silently held back.
+        moved = self.car_floor + direction
+        outside = busy & ((moved < 0) | (moved >= self._floor_count))
+        if outside.any():
+            building = int(np.flatnonzero(outside)[0])
+            raise InvalidFloorError(int(moved[building]) + self.lower_floor, self.lower_floor,
+                                    int(self.top_floor[building]))
+        self.car_floor[busy] = moved[busy]
+
+        stop = busy & self.calls[rows, self.car_floor]
+        self.doors_open[stop] = True
+        arrived = (busy[:, None] & (self.passenger_state == RIDING)
+                   & (self.passenger_target == self.car_floor[:, None]))
+        self.passenger_state[arrived] = RESTING
+        self.passenger_floor[arrived] = np.broadcast_to(self.car_floor[:, None], arrived.shape)[arrived]
+        self.trips += arrived.sum(axis=1)
+        self.calls[rows[busy], self.car_floor[busy]] = False
+
+    def _eject_overload(self, busy: np.ndarray) -> None:
+        """Vectorized `Elevator.eject_random_passenger`: random riders leave until the car is within capacity."""
+        riding = self.passenger_state == RIDING
+        excess = np.where(busy, riding.sum(axis=1) - self.capacity, 0)
+        if not (excess > 0).any():
+            return
+        keys = np.where(riding, self.rng.random(riding.shape), np.inf)
+        rank = keys.argsort(axis=1).argsort(axis=1)
+        ejected = riding & (rank < excess[:, None])
+        self.passenger_state[ejected] = RESTING
+        self.passenger_floor[ejected] = np.broadcast_to(self.car_floor[:, None], ejected.shape)[ejected]
+
+    def _move_passengers(self) -> None:
+        """Vectorized `Passenger.move` of every passenger."""
+        state = self.passenger_state
+        resting = self.exists & (state == RESTING)
+        active = self.exists & ((state == ACTIVE) | (state == AWAITING))
+
+        at_car = active & (self.passenger_floor == self.car_floor[:, None])
+        boarding = at_car & self.doors_open[:, None]
+        calling = active & ~at_car & (state == ACTIVE)
+
+        starting = resting & (self.rng.random(state.shape) < self.trip_probability)
+        if starting.any():
+            # A uniformly chosen floor other than the current one.
+            span = np.broadcast_to(self._floor_count[:, None] - 1, state.shape)[starting]
+            target = (self.rng.random(span.shape) * span).astype(np.int64)
+            target += target >= self.passenger_floor[starting]
+            self.passenger_target[starting] = target
+            state[starting] = ACTIVE
+
+        building, _ = np.nonzero(boarding)
+        self.calls[building, self.passenger_target[boarding]] = True
+        state[boarding] = RIDING
+        building, _ = np.nonzero(calling)
+        self.calls[building, self.passenger_floor[calling]] = True
+        state[calling] = AWAITING
+
+    def riders(self) -> np.ndarray:
+        """Returns the number of passengers inside each car."""
+        return (self.passenger_state == RIDING).sum(axis=1)
@@ -0,0 +1,115 @@
+from random import Random
+
+import numpy as np
+
+import pytest
+
+from batch import BatchSimulation, RESTING, RIDING
+from elevator import Elevator, Passenger
+from events import NullSink
+from exceptions import InvalidFloorError
+from utils import set_elevator_for_passengers
+
+
+def scalar_scenario(seed: int, top_floor: int = 10, passenger_count: int = 8, resting: int = 0):
+    """
+    Builds an elevator with passengers already heading somewhere, so no randomness is left in the run, but
+    for the first `resting` passengers, who rest until they start a trip.
+    """
+    rng = Random(seed)
+    elevator = Elevator(capacity=passenger_count, top_floor=top_floor, sink=NullSink())
+    elevator.current_floor = rng.randint(1, top_floor)
+    passengers = []
+    for _ in range(passenger_count):
+        current_floor = rng.randint(1, top_floor)
+        target_floor = rng.choice([floor for floor in range(1, top_floor + 1) if floor != current_floor])
+        passenger = Passenger(name='p', current_floor=current_floor, target_floor=target_floor)
+        passenger._is_resting = len(passengers) < resting
+        passengers.append(passenger)
+    set_elevator_for_passengers(passengers, elevator)
+    return elevator, passengers
+
+
+class TestBatchSimulation:
+    """Test suite for the vectorized batch simulator."""
+
+    def test_matches_scalar_semantics(self):
+        """Every building of the batch follows the same trajectory as the object model."""
+        scenarios = [scalar_scenario(seed, top_floor=8 + seed % 5) for seed in range(12)]
+        batch = BatchSimulation.from_scalar(scenarios, trip_probability=0)
+        for _ in range(40):
+            batch.step()
+            for building, (elevator, passengers) in enumerate(scenarios):
+                elevator.move()
+                for passenger in passengers:
+                    # Resting passengers stay put, as with a zero trip probability.
+                    if not passenger._is_resting:
+                        passenger.move()
+                assert batch.car_floor[building] + 1 == elevator.current_floor
+                assert batch.doors_open[building] == elevator.doors_open
+                assert {floor + 1 for floor in np.flatnonzero(batch.calls[building])} == set(elevator.queue)
+                assert batch.riders()[building] == len(elevator.passengers)
+        for building, (_, passengers) in enumerate(scenarios):
+            assert list(batch.passenger_floor[building] + 1) == [passenger.current_floor for passenger in passengers]
+
+    def test_matches_scalar_semantics_with_trips(self):
+        """With passengers starting trips, the buildings follow the object model making the same draws."""
+        scenarios = [scalar_scenario(seed, top_floor=8 + seed % 5, resting=4) for seed in range(12)]
+        batch = BatchSimulation.from_scalar(scenarios, trip_probability=0.05, seed=5)
+        for _ in range(300):
+            batch.step()
+            for building, (elevator, passengers) in enumerate(scenarios):
+                elevator.move()
+                for slot, passenger in enumerate(passengers):
+                    if not passenger._is_resting:
+                        passenger.move()
+                    elif batch.passenger_state[building, slot] != RESTING:
+                        # The batch drew a trip for the passenger, the object model starts the same one.
+                        passenger._is_resting = False
+                        passenger.target_floor = int(batch.passenger_target[building, slot]) + 1
+                assert batch.car_floor[building] + 1 == elevator.current_floor
+                assert {floor + 1 for floor in np.flatnonzero(batch.calls[building])} == set(elevator.queue)
+                assert batch.trips[building] == elevator.trips
+        assert batch.trips.sum() > 2 * sum(len(passengers) for _, passengers in scenarios)
+
+    def test_car_turns_at_the_end_of_the_shaft(self):
+        """A car with only its own floor called at the top stays, a car sent beyond its shaft raises."""
+        batch = BatchSimulation(2, passenger_count=0, top_floor=[5, 8])
+        batch.car_floor[:] = 4
+        batch.direction[:] = 1
+        batch.calls[0, 4] = True
+        batch._move_cars()
+        assert batch.car_floor.tolist() == [4, 4] and batch.doors_open[0]
+        # A call past the top floor of the smaller building, which only a corrupt state can hold.
+        batch.direction[0] = 1
+        batch.calls[0, 6] = True
+        with pytest.raises(InvalidFloorError):
+            batch._move_cars()
+
+    def test_capacity_is_enforced(self):
+        """Overloaded cars eject passengers before moving."""
+        batch = BatchSimulation(50, passenger_count=40, capacity=2, trip_probability=0.2, seed=3)
+        for _ in range(200):
+            batch._move_cars()
+            assert (batch.riders() <= 2).all()
+            batch._move_passengers()
+
+    def test_varying_parameters(self):
+        """Buildings of one batch may differ in size, capacity and population."""
+        batch = BatchSimulation(3, passenger_count=[5, 10, 20], capacity=[2, 4, 8], top_floor=[5, 10, 40], seed=1)
+        batch.run(500)
+        assert batch.ticks == 500
+        assert batch.exists.sum(axis=1).tolist() == [5, 10, 20]
+        assert (batch.car_floor <= batch.top_floor - 1).all()
+        assert (batch.passenger_floor[batch.exists] <= np.repeat(batch.top_floor - 1, [5, 10, 20])).all()
+        assert (batch.trips > 0).all()
+
+    def test_seed_makes_runs_reproducible(self):
+        """Two batches with the same seed produce identical results."""
+        first = BatchSimulation(10, seed=42)
+        second = BatchSimulation(10, seed=42)
+        first.run(300)
+        second.run(300)
+        assert (first.trips == second.trips).all()
+        assert (first.passenger_state == second.passenger_state).all()
+        assert not (first.passenger_state[~first.exists] == RIDING).any()
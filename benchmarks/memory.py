@@ -0,0 +1,69 @@
+"""
+Measures the memory taken by a passenger in each storage layout.
+
+Run from the repository root:
+    python -m benchmarks.memory --passengers 100000
+"""
+import argparse
+import gc
+import tracemalloc
+from random import Random
+
+from constants import DEFAULT_PASSENGER_WEIGHT
+from elevator import generate_random_passengers
+from naming import IdNames
+from population import PassengerPopulation
+
+
+class DictPassenger:
+    """The passenger layout before `__slots__`: the same attributes kept in an instance `__dict__`."""
+
+    def __init__(self, current_floor: int, target_floor: int, passenger_id: int) -> None:
+        self.passenger_id = passenger_id
+        self._name = None
+        self._naming = None
+        self.current_floor = current_floor
+        self.target_floor = target_floor
+        self.weight = DEFAULT_PASSENGER_WEIGHT
+        self._is_resting = True
+        self._awaits = False
+        self._in_elevator = False
+        self._elevator = None
+        self._bank = None
+
+
+def generate_dict_passengers(count, lower_floor, top_floor, rng, naming):
+    """Creates passengers with the `__dict__` layout."""
+    return [DictPassenger(rng.randint(lower_floor, top_floor), rng.randint(lower_floor, top_floor), passenger_id)
+            for passenger_id in range(count)]
+
+
+LAYOUTS = {
+    'dict objects': generate_dict_passengers,
+    'slotted objects': generate_random_passengers,
+    'columnar population': PassengerPopulation.generate,
+}
+
+
+def bytes_per_passenger(generate, count: int) -> float:
+    """Returns the memory allocated per passenger while creating `count` passengers with `generate`."""
+    gc.collect()
+    tracemalloc.start()
+    passengers = generate(count, 1, 100, Random(0), IdNames())
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del passengers
+    return allocated / count
+
+
+def main(argv=None) -> None:
+    """Prints the bytes per passenger of every layout."""
+    parser = argparse.ArgumentParser(description="Measures the memory taken by a passenger.")
+    parser.add_argument('--passengers', type=int, default=100000, help="number of passengers per layout")
+    args = parser.parse_args(argv)
+    for layout, generate in LAYOUTS.items():
+        print(f"{layout:>20}: {bytes_per_passenger(generate, args.passengers):7.1f} bytes per passenger")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Compares the passenger wait times of the parking policies, which decide where the idle cars wait for
+their next call.
+
+Every scenario runs with the same seeds under each policy. The residents travelling at random spread
+their calls evenly over the floors, so there is little demand to predict; the traffic profiles show
+what parking gains when the calls gather on some floors, like the lobby in the morning. A light load
+leaves the cars idle often enough for their parking to matter.
+
+Run from the repository root:
+    python -m benchmarks.parking
+    python -m benchmarks.parking --engine kinematic --ticks 600 --rate 3
+"""
+import argparse
+from dataclasses import replace
+
+from parking import PARKING_POLICIES
+from simulation import SIMULATIONS, SimulationConfig
+
+BASE = SimulationConfig(ticks=2000, passenger_count=30, cars=3, top_floor=20, capacity=8, dispatch='eta',
+                        scheduler='collective', admission=True, naming='id', metrics=True)
+# The resident passengers of the simulator, then the traffic profiles.
+SCENARIOS = (None, 'up-peak', 'down-peak', 'lunch', 'interfloor')
+DEFAULT_SEEDS = 4
+DEFAULT_RATE = 0.3
+
+
+def measure(config: SimulationConfig, seeds: int = DEFAULT_SEEDS) -> tuple:
+    """Returns the mean and the 95th percentile of the wait times, averaged over the seeds."""
+    means, tails = [], []
+    for seed in range(seeds):
+        wait = SIMULATIONS[config.engine](replace(config, seed=seed)).run().metrics.wait
+        means.append(wait['mean'] or 0.0)
+        tails.append(wait['p95'] or 0.0)
+    return sum(means) / seeds, sum(tails) / seeds
+
+
+def main(argv=None) -> None:
+    """Prints the wait times of every parking policy in every scenario, and the change against `stay`."""
+    parser = argparse.ArgumentParser(description="Compares the wait times of the parking policies.")
+    parser.add_argument('--engine', choices=list(SIMULATIONS), default=BASE.engine, help="simulation engine")
+    parser.add_argument('--ticks', type=int, default=BASE.ticks, help="ticks per run")
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE, help="arrivals per minute of the traffic profiles")
+    parser.add_argument('--seeds', type=int, default=DEFAULT_SEEDS, help="runs per scenario and policy")
+    parser.add_argument('--parking', nargs='+', choices=list(PARKING_POLICIES), default=list(PARKING_POLICIES),
+                        help="policies to compare, the first one is the reference")
+    args = parser.parse_args(argv)
+
+    base = replace(BASE, engine=args.engine, ticks=args.ticks, traffic_rate=args.rate)
+    print(f"{'scenario':>11} {'parking':>8} {'mean wait':>10} {'p95 wait':>9} {'mean':>6} {'p95':>6}")
+    for scenario in SCENARIOS:
+        reference = None
+        for parking in args.parking:
+            mean, tail = measure(replace(base, traffic=scenario, parking=parking), args.seeds)
+            if reference is None:
+                reference = (mean, tail)
+            changes = [f"{value / previous - 1:+.0%}" if previous else ''
+                       for value, previous in zip((mean, tail), reference)]
+            print(f"{scenario or 'residents':>11} {parking:>8} {mean:10.2f} {tail:9.2f} "
+                  f"{changes[0]:>6} {changes[1]:>6}")
+
+
+if __name__ == "__main__":
+    main()
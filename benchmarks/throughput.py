@@ -0,0 +1,139 @@
+"""
+Measures the throughput of the simulation loop in ticks and passenger trips per second, and its peak memory,
+across floor counts, passenger populations, car capacities and car counts.
+
+Every case changes one parameter of a base building. Timings are the best of several runs, the memory
+peak is taken in a separate run because tracing allocations slows the loop down. Results can be saved
+as a baseline and later runs compared against it; the comparison fails when a case got slower or
+bigger than the tolerance allows, or when its trip count changed, which means the behaviour changed.
+
+Run from the repository root:
+    python -m benchmarks.throughput --output baseline.json
+    python -m benchmarks.throughput --baseline baseline.json
+"""
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from dataclasses import asdict, dataclass, replace
+
+from simulation import SIMULATIONS, SimulationConfig
+
+BASE = SimulationConfig(ticks=1000, passenger_count=200, capacity=5, top_floor=10, cars=1, naming='id', seed=0)
+# The values every axis takes, the other parameters keep the values of the base building.
+AXES = {
+    'top_floor': (10, 40, 160),
+    'passenger_count': (100, 1000, 10000),
+    'capacity': (2, 8, 32),
+    'cars': (1, 4, 16),
+}
+DEFAULT_REPEAT = 3
+DEFAULT_TOLERANCE = 0.2
+
+
+@dataclass
+class Measurement:
+    """
+    Throughput and memory of a single case.
+
+    Attributes:
+        ticks_per_second (float): Simulated ticks per wall-clock second, the best of the repeated runs.
+        trips_per_second (float): Passengers delivered per wall-clock second in the same run.
+        trips (int): Passengers delivered during the run, the same on every machine.
+        peak_kib (float): The peak of the memory allocated while building and running the simulation.
+    """
+    ticks_per_second: float
+    trips_per_second: float
+    trips: int
+    peak_kib: float
+
+
+def cases(base: SimulationConfig, axes: dict) -> dict:
+    """Returns the config of every case by name, varying one parameter of `base` at a time."""
+    configs = {}
+    for axis, values in axes.items():
+        for value in values:
+            configs[f"{axis}={value}"] = replace(base, **{axis: value})
+    return configs
+
+
+def measure(config: SimulationConfig, repeat: int = DEFAULT_REPEAT) -> Measurement:
+    """Runs the case `repeat` times for the timing and once more under tracemalloc for the memory peak."""
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        result = SIMULATIONS[config.engine](config).run()
+        if best is None or result.elapsed < best.elapsed:
+            best = result
+    gc.collect()
+    tracemalloc.start()
+    SIMULATIONS[config.engine](config).run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return Measurement(ticks_per_second=best.ticks_per_second,
+                       trips_per_second=best.trips / best.elapsed if best.elapsed else float('inf'),
+                       trips=best.trips,
+                       peak_kib=peak / 1024)
+
+
+def compare(results: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> list:
+    """
+    Returns the regressions of `results` against `baseline`: cases whose throughput fell or whose memory
+    peak grew by more than `tolerance`, and cases delivering a different number of trips.
+    """
+    regressions = []
+    for case, measurement in results.items():
+        reference = baseline.get(case)
+        if reference is None:
+            continue
+        if measurement.ticks_per_second < reference['ticks_per_second'] * (1 - tolerance):
+            regressions.append(f"{case}: {measurement.ticks_per_second:.0f} ticks/s, "
+                               f"baseline {reference['ticks_per_second']:.0f}")
+        if measurement.peak_kib > reference['peak_kib'] * (1 + tolerance):
+            regressions.append(f"{case}: {measurement.peak_kib:.0f} KiB peak, baseline {reference['peak_kib']:.0f}")
+        if measurement.trips != reference['trips']:
+            regressions.append(f"{case}: {measurement.trips} trips, baseline {reference['trips']}")
+    return regressions
+
+
+def main(argv=None) -> None:
+    """Prints the throughput of every case, saves it or compares it with a baseline."""
+    parser = argparse.ArgumentParser(description="Measures the throughput of the simulation loop.")
+    parser.add_argument('--engine', choices=list(SIMULATIONS), default=BASE.engine, help="simulation engine")
+    parser.add_argument('--ticks', type=int, default=BASE.ticks, help="ticks per run")
+    parser.add_argument('--axis', nargs='+', choices=list(AXES), default=list(AXES), help="parameters to vary")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="timed runs per case, the best counts")
+    parser.add_argument('--output', metavar='PATH', help="save the results as a JSON baseline")
+    parser.add_argument('--baseline', metavar='PATH', help="compare the results with a saved baseline")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="relative slowdown or memory growth reported as a regression")
+    args = parser.parse_args(argv)
+
+    base = replace(BASE, engine=args.engine, ticks=args.ticks)
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+    results = {}
+    print(f"{'case':>22} {'ticks/s':>10} {'trips/s':>10} {'trips':>7} {'peak KiB':>9} {'vs baseline':>11}")
+    for case, config in cases(base, {axis: AXES[axis] for axis in args.axis}).items():
+        measurement = results[case] = measure(config, args.repeat)
+        reference = baseline.get(case)
+        change = f"{measurement.ticks_per_second / reference['ticks_per_second'] - 1:+.0%}" if reference else ''
+        print(f"{case:>22} {measurement.ticks_per_second:10.0f} {measurement.trips_per_second:10.0f} "
+              f"{measurement.trips:7d} {measurement.peak_kib:9.0f} {change:>11}")
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({case: asdict(measurement) for case, measurement in results.items()}, file, indent=2)
+    if args.baseline:
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"Regression in {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+from array import array
+from collections import deque
+from typing import Iterable, NamedTuple, Optional
+
+from constants import DEFAULT_LOWER_FLOOR, DEFAULT_TOP_FLOOR
+from exceptions import InvalidFloorError
+
+
+def random_floor_except(rng, lower_floor: int, top_floor: int, excluded: int) -> int:
+    """
+    Returns a random floor from `lower_floor` to `top_floor` other than `excluded`, every floor equally
+    likely. Draws the same number as choosing from the list of those floors, without building the list.
+    """
+    if lower_floor <= excluded <= top_floor:
+        floor = lower_floor + rng.randrange(top_floor - lower_floor)
+        return floor + (floor >= excluded)
+    return lower_floor + rng.randrange(top_floor - lower_floor + 1)
+
+
+class Route(NamedTuple):
+    """The way from a floor to another: the floor where to change cars, None for a direct ride, and the cars
+    serving the first leg."""
+    transfer: Optional[int]
+    cars: tuple
+
+
+class Building:
+    """
+    The floors of a building and the floors every car of its bank serves.
+
+    Floors served by the same cars form a group, and the route between every two groups is worked out
+    when the building is created, so finding the cars able to serve a call and the floor where a
+    passenger changes cars are two lookups, whatever the number of floors.
+
+    Attributes:
+        lower_floor (int): The lowest floor, below the lobby when the building has basements.
+        top_floor (int): The highest floor.
+        lobby (int): The entrance floor.
+        served (tuple): The floors every car stops at, as frozensets, in the order of the cars of the bank.
+    """
+
+    def __init__(self, lower_floor: int, top_floor: int, served: Iterable[Iterable[int]],
+                 lobby: Optional[int] = None) -> None:
+        """Initializes the building and its routes, every floor must be reachable from every other."""
+        if top_floor <= lower_floor:
+            raise ValueError(f"The top floor {top_floor} must be above the lowest floor {lower_floor}.")
+        self.lower_floor = lower_floor
+        self.top_floor = top_floor
+        self.lobby = default_lobby(lower_floor, top_floor) if lobby is None else lobby
+        self.served = tuple(frozenset(floors) for floors in served)
+        if not self.served:
+            raise ValueError("A building needs at least one car.")
+        for floors in self.served:
+            for floor in floors:
+                if not lower_floor <= floor <= top_floor:
+                    raise InvalidFloorError(floor, lower_floor, top_floor)
+        self._build_routes()
+
+    @classmethod
+    def uniform(cls, lower_floor: int, top_floor: int, cars: int, lobby: Optional[int] = None) -> 'Building':
+        """Creates a building whose cars all serve every floor."""
+        return cls(lower_floor, top_floor, [range(lower_floor, top_floor + 1)] * cars, lobby)
+
+    @classmethod
+    def zoned(cls, lower_floor: int, top_floor: int, cars: int, zones: int = 1, sky_lobbies: Iterable[int] = (),
+              shuttles: int = 0, lobby: Optional[int] = None) -> 'Building':
+        """
+        Creates a building split at its sky lobbies into sections stacked above the lobby, each section
+        split into `zones` low- to high-rise zones of consecutive floors. The cars of a zone serve the
+        floors of the zone and the lobby of its section, the basements belong to the lowest zone, and
+        `shuttles` express cars link the lobby with every sky lobby. The other cars are shared out among
+        the zones, the lower zones getting the extra ones.
+        """
+        lobby = default_lobby(lower_floor, top_floor) if lobby is None else lobby
+        lobbies = [lobby, *sorted(sky_lobbies)]
+        for floor in lobbies:
+            if not lower_floor <= floor <= top_floor:
+                raise InvalidFloorError(floor, lower_floor, top_floor)
+        if len(set(lobbies)) != len(lobbies) or any(floor < lobby for floor in lobbies):
+            raise ValueError(f"The sky lobbies {tuple(sky_lobbies)} must be distinct floors above the lobby {lobby}.")
+        if sky_lobbies and not shuttles:
+            raise ValueError("Sky lobbies need shuttles to reach them.")
+        groups = []
+        for section, section_lobby in enumerate(lobbies):
+            end = lobbies[section + 1] - 1 if section + 1 < len(lobbies) else top_floor
+            floors = list(range(section_lobby + 1, end + 1))
+            if len(floors) < zones:
+                raise ValueError(f"The section above floor {section_lobby} has fewer floors than {zones} zones.")
+            for zone in range(zones):
+                zone_floors = {section_lobby, *floors[zone * len(floors) // zones:(zone + 1) * len(floors) // zones]}
+                if not groups:
+                    zone_floors.update(range(lower_floor, lobby))
+                groups.append(zone_floors)
+        local_cars = cars - shuttles
+        if local_cars < len(groups):
+            raise ValueError(f"{len(groups)} zones need at least {len(groups)} cars besides the {shuttles} shuttles.")
+        served = []
+        for zone, zone_floors in enumerate(groups):
+            served.extend([zone_floors] * (local_cars // len(groups) + (zone < local_cars % len(groups))))
+        served.extend([set(lobbies)] * shuttles)
+        return cls(lower_floor, top_floor, served, lobby)
+
+    def _build_routes(self) -> None:
+        """Groups the floors by the cars serving them and finds the route between every two groups."""
+        groups = {}
+        self._groups = array('H')
+        for floor in range(self.lower_floor, self.top_floor + 1):
+            cars = tuple(car for car, floors in enumerate(self.served) if floor in floors)
+            if not cars:
+                raise ValueError(f"No car serves floor {floor}.")
+            self._groups.append(groups.setdefault(cars, len(groups)))
+        self._group_cars = list(groups)
+        # The lowest floor of every group stands for the group when picking transfer floors.
+        self._group_floors = [self.lower_floor + self._groups.index(group) for group in range(len(groups))]
+        self._routes = [self._find_route(origin, destination)
+                        for origin in range(len(groups)) for destination in range(len(groups))]
+
+    def _find_route(self, origin: int, destination: int) -> Route:
+        """Returns the route between two groups of floors, changing cars as few times as possible."""
+        origin_cars = self._group_cars[origin]
+        destination_cars = set(self._group_cars[destination])
+        direct = tuple(car for car in origin_cars if car in destination_cars)
+        if direct:
+            return Route(None, direct)
+        # A breadth-first search over the cars, two cars being linked when they share a floor.
+        first_car = {car: car for car in origin_cars}
+        second_car = {car: None for car in origin_cars}
+        pending = deque(origin_cars)
+        while pending:
+            car = pending.popleft()
+            if car in destination_cars:
+                first, second = first_car[car], second_car[car]
+                shared = self.served[first] & self.served[second]
+                start, end = self._group_floors[origin], self._group_floors[destination]
+                transfer = min(shared, key=lambda floor: (abs(floor - start) + abs(end - floor), floor))
+                return Route(transfer, tuple(candidate for candidate in origin_cars
+                                             if transfer in self.served[candidate]))
+            for other in range(len(self.served)):
+                if other not in first_car and self.served[car] & self.served[other]:
+                    first_car[other] = first_car[car]
+                    second_car[other] = other if second_car[car] is None else second_car[car]
+                    pending.append(other)
+        raise ValueError(f"Floor {self._group_floors[destination]} cannot be reached from "
+                         f"floor {self._group_floors[origin]}.")
+
+    def route(self, origin: int, destination: int) -> Route:
+        """Returns the route of a trip from `origin` to `destination`."""
+        groups = self._groups
+        return self._routes[groups[origin - self.lower_floor] * len(self._group_cars)
+                            + groups[destination - self.lower_floor]]
+
+    def next_stop(self, origin: int, destination: int) -> int:
+        """Returns the floor a passenger going from `origin` to `destination` rides to in the next car."""
+        transfer = self.route(origin, destination).transfer
+        return destination if transfer is None else transfer
+
+    def cars_serving(self, floor: int) -> tuple:
+        """Returns the indexes of the cars stopping at `floor`."""
+        return self._group_cars[self._groups[floor - self.lower_floor]]
+
+    def __len__(self) -> int:
+        return self.top_floor - self.lower_floor + 1
+
+
+def default_lobby(lower_floor: int = DEFAULT_LOWER_FLOOR, top_floor: int = DEFAULT_TOP_FLOOR) -> int:
+    """Returns the entrance floor: the default lowest floor, the floors below it being basements."""
+    return min(max(DEFAULT_LOWER_FLOOR, lower_floor), top_floor)
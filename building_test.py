@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from building import Building, random_floor_except
+from exceptions import InvalidFloorError
+
+
+class TestBuilding:
+    """Test suite for the building model and its routes."""
+
+    def test_random_floor_except_matches_a_choice_from_the_list(self):
+        """The target drawn without a list is the one drawn from the list of the other floors."""
+        for current in (-3, 1, 7, 40, 99):
+            listed, computed = random.Random(current), random.Random(current)
+            for _ in range(200):
+                floors = [floor for floor in range(-3, 41) if floor != current]
+                assert random_floor_except(computed, -3, 40, current) == listed.choice(floors)
+
+    def test_uniform_building(self):
+        """Every car serves every floor, every trip is a direct ride."""
+        building = Building.uniform(-2, 300, cars=3)
+        assert len(building) == 303
+        assert building.lobby == 1
+        assert building.cars_serving(-2) == (0, 1, 2)
+        assert building.route(-2, 300) == (None, (0, 1, 2))
+        assert building.next_stop(5, 250) == 250
+
+    def test_zones(self):
+        """Low- and high-rise cars share the lobby, the basements belong to the low-rise cars."""
+        building = Building.zoned(-2, 40, cars=5, zones=2)
+        assert [(min(floors), max(floors)) for floors in building.served] == [(-2, 20)] * 3 + [(1, 40)] * 2
+        assert building.served[3] == {1, *range(21, 41)}
+        assert building.cars_serving(1) == (0, 1, 2, 3, 4)
+        assert building.cars_serving(30) == (3, 4)
+        assert building.route(-1, 15) == (None, (0, 1, 2))
+        assert building.route(10, 30) == (1, (0, 1, 2))
+        assert building.next_stop(30, -2) == 1
+
+    def test_sky_lobbies(self):
+        """Trips across sections change cars at the sky lobbies and ride the shuttles in between."""
+        building = Building.zoned(1, 120, cars=6, sky_lobbies=(40, 80), shuttles=2)
+        assert building.served[4] == {1, 40, 80}
+        assert building.route(10, 100) == (1, (0, 1))
+        assert building.route(1, 100) == (80, (4, 5))
+        assert building.route(80, 100) == (None, (3,))
+        assert building.route(100, 50) == (80, (3,))
+        assert building.next_stop(40, 10) == 1
+
+    def test_invalid_buildings(self):
+        """Unreachable floors and floors outside of the building are rejected."""
+        with pytest.raises(ValueError):
+            Building(1, 10, [range(1, 6), range(6, 11)])
+        with pytest.raises(ValueError):
+            Building(1, 10, [range(1, 10)])
+        with pytest.raises(InvalidFloorError):
+            Building(1, 10, [range(1, 12)])
+        with pytest.raises(ValueError):
+            Building.zoned(1, 60, cars=4, sky_lobbies=(30,))
+        with pytest.raises(ValueError):
+            Building.zoned(1, 60, cars=3, zones=2, sky_lobbies=(30,), shuttles=1)
@@ -0,0 +1,113 @@
+import bisect
+from typing import Iterable, Optional
+
+from utils import find_closest
+
+
+class CallQueue:
+    """
+    The floors an elevator intends to visit, kept sorted as floors are added and removed.
+
+    Behaves like a set of floors, but the sorted order is maintained on every change, so the
+    direction decisions of the elevator are binary searches and no list is sorted per move.
+    """
+    __slots__ = ('_floors', '_members')
+
+    def __init__(self, floors: Iterable[int] = ()) -> None:
+        """Initializes the queue with the given floors."""
+        self._members = set(floors)
+        self._floors = sorted(self._members)
+
+    def add(self, floor: int) -> None:
+        """Adds a floor to the queue."""
+        if floor not in self._members:
+            self._members.add(floor)
+            bisect.insort(self._floors, floor)
+
+    def update(self, floors: Iterable[int]) -> None:
+        """Adds several floors to the queue."""
+        for floor in floors:
+            self.add(floor)
+
+    def discard(self, floor: int) -> None:
+        """Removes a floor from the queue if present."""
+        if floor in self._members:
+            self._members.remove(floor)
+            del self._floors[bisect.bisect_left(self._floors, floor)]
+
+    def remove(self, floor: int) -> None:
+        """Removes a floor from the queue, raising KeyError when it is absent."""
+        if floor not in self._members:
+            raise KeyError(floor)
+        self.discard(floor)
+
+    def clear(self) -> None:
+        """Removes every floor from the queue."""
+        self._members.clear()
+        self._floors.clear()
+
+    def closest(self, floor: int) -> Optional[int]:
+        """Returns the queued floor closest to `floor`, the lower one on a tie, or None for an empty queue."""
+        if not self._floors:
+            return None
+        return find_closest(self._floors, floor)
+
+    def closest_other(self, floor: int) -> Optional[int]:
+        """Returns the queued floor closest to `floor` other than `floor` itself, the lower one on a tie."""
+        index = bisect.bisect_left(self._floors, floor)
+        below = self._floors[index - 1] if index else None
+        index = bisect.bisect_right(self._floors, floor)
+        above = self._floors[index] if index < len(self._floors) else None
+        if below is None or (above is not None and above - floor < floor - below):
+            return above
+        return below
+
+    def has_above(self, floor: int) -> bool:
+        """Checks whether a floor above `floor` is queued."""
+        return bool(self._floors) and self._floors[-1] > floor
+
+    def has_below(self, floor: int) -> bool:
+        """Checks whether a floor below `floor` is queued."""
+        return bool(self._floors) and self._floors[0] < floor
+
+    def above(self, floor: int) -> list:
+        """Returns the queued floors above `floor` in ascending order."""
+        return self._floors[bisect.bisect_right(self._floors, floor):]
+
+    def below(self, floor: int) -> list:
+        """Returns the queued floors below `floor` in ascending order."""
+        return self._floors[:bisect.bisect_left(self._floors, floor)]
+
+    @property
+    def lowest(self) -> Optional[int]:
+        """Returns the lowest queued floor."""
+        return self._floors[0] if self._floors else None
+
+    @property
+    def highest(self) -> Optional[int]:
+        """Returns the highest queued floor."""
+        return self._floors[-1] if self._floors else None
+
+    def __contains__(self, floor) -> bool:
+        return floor in self._members
+
+    def __iter__(self):
+        return iter(self._floors)
+
+    def __len__(self) -> int:
+        return len(self._floors)
+
+    def __bool__(self) -> bool:
+        return bool(self._floors)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CallQueue):
+            return self._floors == other._floors
+        if isinstance(other, (set, frozenset, dict)):
+            return self._members == set(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"CallQueue({self._floors})"
@@ -0,0 +1,61 @@
+from random import Random
+
+from call_queue import CallQueue
+from elevator import Elevator
+from utils import find_closest, has_larger, has_smaller
+
+
+class TestCallQueue:
+    """Test suite for the incrementally sorted call queue."""
+
+    def test_kept_sorted(self):
+        """Floors come out sorted whatever order they were added and removed in."""
+        queue = CallQueue()
+        queue.update([7, 2, 9, 2, 4])
+        assert list(queue) == [2, 4, 7, 9]
+        queue.discard(7)
+        queue.discard(8)
+        queue.add(1)
+        assert list(queue) == [1, 2, 4, 9]
+        assert len(queue) == 4
+        assert 4 in queue and 7 not in queue
+        assert queue.lowest == 1 and queue.highest == 9
+
+    def test_behaves_like_a_set(self):
+        """The queue compares equal to the set of its floors."""
+        queue = CallQueue({3, 1})
+        assert queue == {1, 3}
+        assert queue != {1}
+        assert CallQueue() == {}
+        assert not CallQueue()
+        assert queue == CallQueue([3, 1])
+
+    def test_matches_sorted_list_helpers(self):
+        """Direction queries agree with the bisect helpers on a freshly sorted list."""
+        rng = Random(1)
+        queue = CallQueue()
+        floors = set()
+        for _ in range(500):
+            floor = rng.randint(1, 120)
+            if rng.random() < 0.6:
+                queue.add(floor)
+                floors.add(floor)
+            else:
+                queue.discard(floor)
+                floors.discard(floor)
+            current = rng.randint(1, 120)
+            sorted_floors = sorted(floors)
+            assert queue.closest(current) == (find_closest(sorted_floors, current) if floors else None)
+            others = [floor for floor in sorted_floors if floor != current]
+            assert queue.closest_other(current) == (find_closest(others, current) if others else None)
+            assert queue.has_above(current) == has_larger(sorted_floors, current)
+            assert queue.has_below(current) == has_smaller(sorted_floors, current)
+            assert queue.above(current) == [floor for floor in sorted_floors if floor > current]
+            assert queue.below(current) == [floor for floor in sorted_floors if floor < current]
+
+    def test_elevator_queue_assignment(self):
+        """Assigning any collection of floors to the elevator queue keeps it a call queue."""
+        elevator = Elevator(top_floor=10)
+        elevator.queue = {8, 2}
+        assert isinstance(elevator.queue, CallQueue)
+        assert list(elevator.queue) == [2, 8]
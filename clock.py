@@ -0,0 +1,60 @@
+from time import monotonic, sleep
+
+from constants import DEFAULT_TICK_DURATION
+
+
+class VirtualClock:
+    """
+    Simulation clock that advances instantly, running the simulation at CPU speed.
+
+    Attributes:
+        now (float): The current simulation time, measured in ticks.
+        tick_duration (float): Wall-clock seconds that correspond to one simulation tick.
+    """
+
+    def __init__(self, tick_duration: float = DEFAULT_TICK_DURATION) -> None:
+        """Initializes the clock at time zero."""
+        self.now = 0
+        self.tick_duration = tick_duration
+
+    def advance_to(self, time: float) -> None:
+        """Moves the simulation time forward to `time`."""
+        self.now = time
+
+    def tick(self) -> None:
+        """Advances the simulation time by one tick."""
+        self.advance_to(self.now + 1)
+
+
+class RealTimeClock(VirtualClock):
+    """
+    Simulation clock paced against the wall clock.
+
+    Every tick takes `tick_duration` seconds of real time. Deadlines are measured from the
+    moment of the first advance, so time spent simulating a tick does not accumulate as drift.
+    """
+
+    def __init__(self, tick_duration: float = DEFAULT_TICK_DURATION) -> None:
+        """Initializes the clock at time zero."""
+        super().__init__(tick_duration)
+        self._origin = None
+
+    def advance_to(self, time: float) -> None:
+        """Sleeps until the wall-clock deadline of `time`, then moves the simulation time forward."""
+        if self._origin is None:
+            self._origin = monotonic() - self.now * self.tick_duration
+        delay = self._origin + time * self.tick_duration - monotonic()
+        if delay > 0:
+            sleep(delay)
+        self.now = time
+
+    def __getstate__(self) -> dict:
+        # A restored clock is paced from its first advance, not from the wall clock of the original run.
+        return dict(self.__dict__, _origin=None)
+
+
+def create_clock(realtime: bool = False, tick_duration: float = DEFAULT_TICK_DURATION) -> VirtualClock:
+    """Creates a real-time or a fast-forward clock."""
+    if realtime:
+        return RealTimeClock(tick_duration)
+    return VirtualClock(tick_duration)
@@ -3,3 +3,12 @@ DEFAULT_TOP_FLOOR = 10
 DEFAULT_CAPACITY = 4
 UP_NAME = 'up'
 DOWN_NAME = 'down'
+DEFAULT_PASSENGER_COUNT = 20
+DEFAULT_TICKS = 100
+DEFAULT_TICK_DURATION = 1.0
+TRIP_PROBABILITY = 1 / 51
+TICK_ENGINE = 'tick'
+EVENT_ENGINE = 'event'
+KINEMATIC_ENGINE = 'kinematic'
+TICK_SECONDS = 60
+DEFAULT_PASSENGER_WEIGHT = 75.0
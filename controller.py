@@ -0,0 +1,380 @@
+import argparse
+import asyncio
+from dataclasses import dataclass
+from functools import partial
+from typing import Optional, Union
+
+from dispatcher import ElevatorBank, POLICIES, create_bank
+from events import NullSink
+from exceptions import ControllerFailedError, FloorNotServedError, InvalidFloorError
+from metrics import StreamingHistogram
+from scheduling import HallCall, SCHEDULERS, direction_towards
+
+# Wall-clock seconds a car takes for one move: a floor of travel or a door operation.
+DEFAULT_STEP_TIME = 1.0
+DEFAULT_QUEUE_SIZE = 65536
+# Calls assigned in one go before the cars get a turn.
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_SUBSCRIBER_QUEUE = 1024
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+# Errors answered to the caller instead of stopping the controller.
+CALL_ERRORS = (InvalidFloorError, FloorNotServedError, ControllerFailedError, ValueError)
+
+
+@dataclass(frozen=True)
+class CarCall:
+    """
+    A floor selected inside a car.
+
+    Attributes:
+        car (int): Index of the car in the bank.
+        floor (int): The selected floor.
+    """
+    car: int
+    floor: int
+
+
+@dataclass(frozen=True)
+class CarState:
+    """
+    The state of a car published to the subscribers after each of its moves.
+
+    Attributes:
+        car (int): Index of the car in the bank.
+        floor (int): The floor the car is on.
+        direction (str or None): The direction the car moves in, None when idle.
+        doors_open (bool): Whether the doors are open.
+        queue (tuple): The floors the car intends to visit.
+        time (float): Event loop time of the update.
+    """
+    car: int
+    floor: int
+    direction: Optional[str]
+    doors_open: bool
+    queue: tuple
+    time: float
+
+    def __str__(self) -> str:
+        """Renders the state as a line of the BMS protocol."""
+        queue = ','.join(map(str, self.queue)) or '-'
+        return (f"STATE car={self.car} floor={self.floor} direction={self.direction or '-'} "
+                f"doors={'open' if self.doors_open else 'closed'} queue={queue}")
+
+
+class ElevatorController:
+    """
+    Runs an elevator bank as a live controller on an asyncio event loop.
+
+    Hall and car calls arrive through the `calls` queue from any number of producers. A dispatcher task
+    assigns them in batches, so a burst of calls costs one wake-up of the loop per batch, and every car
+    runs as a task of its own that moves once per `step_time` while it has calls and sleeps otherwise.
+    After every move the state of the car is published to the subscribers. A subscriber that does not
+    keep up loses its oldest updates rather than slowing the cars down. Should a task fail, the calls that
+    follow are answered with the failure, and `stop` raises it.
+
+    Attributes:
+        bank (ElevatorBank): The controlled cars and their assignment policy.
+        step_time (float): Wall-clock seconds of one move of a car, 0 to move as fast as the loop allows.
+        batch_size (int): The largest number of calls assigned before the cars get a turn.
+        calls (asyncio.Queue): Pending calls with their submission time and the future of their assignment.
+        latency (StreamingHistogram): Seconds from the submission of a call to its assignment.
+        assigned (int): Number of calls assigned so far.
+        failure (Exception or None): The error a task of the controller failed with, None while all is well.
+    """
+
+    def __init__(self,
+                 bank: ElevatorBank,
+                 step_time: float = DEFAULT_STEP_TIME,
+                 queue_size: int = DEFAULT_QUEUE_SIZE,
+                 batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        """Initializes the controller of `bank`, the tasks start with `start`."""
+        self.bank = bank
+        self.step_time = step_time
+        self.batch_size = batch_size
+        self.calls = asyncio.Queue(queue_size)
+        self.latency = StreamingHistogram()
+        self.assigned = 0
+        self.failure = None
+        self._indexes = {car: index for index, car in enumerate(bank.elevators)}
+        self._wake = [asyncio.Event() for _ in bank.elevators]
+        self._subscribers = set()
+        self._tasks = []
+
+    async def start(self) -> None:
+        """Starts the dispatcher and one task per car."""
+        if self._tasks:
+            return
+        self._tasks.append(asyncio.create_task(self._dispatch()))
+        self._tasks.extend(asyncio.create_task(self._run_car(index)) for index in range(len(self.bank.elevators)))
+        for task in self._tasks:
+            task.add_done_callback(self._task_done)
+
+    async def stop(self) -> None:
+        """Cancels the tasks and the calls still queued, then raises the failure of a task if there was one."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        while not self.calls.empty():
+            _, _, future = self.calls.get_nowait()
+            future.cancel()
+        if self.failure is not None:
+            raise self.failure
+
+    def _task_done(self, task: asyncio.Task) -> None:
+        """Keeps the first error a task failed with."""
+        if not task.cancelled() and task.exception() is not None and self.failure is None:
+            self.failure = task.exception()
+
+    async def __aenter__(self) -> 'ElevatorController':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    async def submit(self, call: Union[HallCall, CarCall]) -> asyncio.Future:
+        """Queues a call, waiting while the queue is full, and returns the future of the assigned car index."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        await self.calls.put((call, loop.time(), future))
+        return future
+
+    async def call(self, call: Union[HallCall, CarCall]) -> int:
+        """Queues a call and returns the index of the car it was assigned to."""
+        return await (await self.submit(call))
+
+    def assign(self, call: Union[HallCall, CarCall]) -> int:
+        """
+        Registers the call with a car right away, wakes the car and returns its index. The floors of the call
+        are checked first, a call the car could not serve would stop it.
+        """
+        if self.failure is not None:
+            raise ControllerFailedError(self.failure)
+        bank = self.bank
+        if not bank.lower_floor <= call.floor <= bank.top_floor:
+            raise InvalidFloorError(call.floor, bank.lower_floor, bank.top_floor)
+        if isinstance(call, CarCall):
+            if not 0 <= call.car < len(bank.elevators):
+                raise ValueError(f"There is no car {call.car}.")
+            index = call.car
+            car = bank.elevators[index]
+            if not car.serves(call.floor):
+                raise FloorNotServedError(call.floor)
+            car.add_floor_to_queue(call.floor)
+        else:
+            destination = call.destination
+            if destination is not None:
+                if not bank.lower_floor <= destination <= bank.top_floor:
+                    raise InvalidFloorError(destination, bank.lower_floor, bank.top_floor)
+                direction = direction_towards(destination, call.floor)
+                if direction is None or call.direction not in (None, direction):
+                    going = f" going {call.direction}" if call.direction else ''
+                    raise ValueError(f"A call from floor {call.floor}{going} cannot go to floor {destination}.")
+            car = bank.policy.assign(bank, call)
+            if destination is not None and not car.serves(destination):
+                raise FloorNotServedError(destination)
+            car.add_hall_call(call)
+            index = self._indexes[car]
+        self._wake[index].set()
+        return index
+
+    async def _dispatch(self) -> None:
+        """Assigns the queued calls, a batch at a time."""
+        loop = asyncio.get_running_loop()
+        calls = self.calls
+        while True:
+            batch = [await calls.get()]
+            while len(batch) < self.batch_size and not calls.empty():
+                batch.append(calls.get_nowait())
+            for call, submitted, future in batch:
+                try:
+                    index = self.assign(call)
+                except CALL_ERRORS as error:
+                    if not future.done():
+                        future.set_exception(error)
+                    continue
+                self.latency.record(loop.time() - submitted)
+                self.assigned += 1
+                if not future.done():
+                    future.set_result(index)
+            # Lets the cars and the producers run between two batches.
+            await asyncio.sleep(0)
+
+    async def _run_car(self, index: int) -> None:
+        """Moves the car while it has calls, then sleeps until a new call wakes it."""
+        car = self.bank.elevators[index]
+        wake = self._wake[index]
+        while True:
+            if not car.queue:
+                if car.doors_open or car.direction:
+                    car.move()
+                    self._publish(index)
+                wake.clear()
+                await wake.wait()
+                continue
+            car.move()
+            self._publish(index)
+            await asyncio.sleep(self.step_time)
+
+    def state(self, index: int) -> CarState:
+        """Returns the current state of a car."""
+        car = self.bank.elevators[index]
+        return CarState(car=index,
+                        floor=car.current_floor,
+                        direction=car.direction,
+                        doors_open=car.doors_open,
+                        queue=tuple(car.queue),
+                        time=asyncio.get_running_loop().time())
+
+    def subscribe(self, maxsize: int = DEFAULT_SUBSCRIBER_QUEUE) -> asyncio.Queue:
+        """Returns a queue receiving the state of every car after each of its moves."""
+        queue = asyncio.Queue(maxsize)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """Stops publishing to the queue."""
+        self._subscribers.discard(queue)
+
+    def _publish(self, index: int) -> None:
+        """Sends the state of a car to every subscriber, dropping the oldest update of a full queue."""
+        if not self._subscribers:
+            return
+        state = self.state(index)
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(state)
+
+
+def parse_command(words: list) -> Union[HallCall, CarCall]:
+    """Parses a `HALL floor [up|down] [destination]` or `CAR car floor` command into a call."""
+    command, arguments = words[0].upper(), words[1:]
+    if command == 'HALL' and 1 <= len(arguments) <= 3:
+        direction = arguments[1].lower() if len(arguments) > 1 else None
+        if direction not in (None, 'up', 'down'):
+            raise ValueError(f"Unknown direction {arguments[1]}.")
+        destination = int(arguments[2]) if len(arguments) > 2 else None
+        return HallCall(int(arguments[0]), direction, destination)
+    if command == 'CAR' and len(arguments) == 2:
+        return CarCall(int(arguments[0]), int(arguments[1]))
+    raise ValueError(f"Cannot parse {' '.join(words)!r}.")
+
+
+async def _write_replies(replies: asyncio.Queue, writer: asyncio.StreamWriter) -> None:
+    """Writes the replies in the order of the commands, waiting for the assignment of each call."""
+    while True:
+        reply = await replies.get()
+        if reply is None:
+            break
+        if isinstance(reply, asyncio.Future):
+            try:
+                reply = f"OK {await reply}"
+            except CALL_ERRORS as error:
+                reply = f"ERR {error}"
+            except asyncio.CancelledError:
+                if not reply.cancelled():
+                    raise
+                reply = "ERR the controller stopped"
+        writer.write(f"{reply}\n".encode())
+        if replies.empty():
+            await writer.drain()
+
+
+async def _stream_states(controller: ElevatorController, replies: asyncio.Queue) -> None:
+    """Forwards the published car states to a subscribed client."""
+    queue = controller.subscribe()
+    try:
+        while True:
+            replies.put_nowait(str(await queue.get()))
+    finally:
+        controller.unsubscribe(queue)
+
+
+async def handle_client(controller: ElevatorController, reader: asyncio.StreamReader,
+                        writer: asyncio.StreamWriter) -> None:
+    """
+    Serves a client of the line protocol standing in for the building management system:
+
+        HALL floor [up|down] [destination]  ->  OK car
+        CAR car floor                       ->  OK car
+        STATE                               ->  one STATE line per car
+        SUBSCRIBE                           ->  a STATE line after every move of a car from now on
+        QUIT
+
+    Commands are pipelined, the replies come in the order of the commands. Errors are answered with
+    `ERR message`.
+    """
+    replies = asyncio.Queue()
+    writer_task = asyncio.create_task(_write_replies(replies, writer))
+    stream_task = None
+    try:
+        async for line in reader:
+            words = line.decode(errors='replace').split()
+            if not words:
+                continue
+            command = words[0].upper()
+            if command == 'QUIT':
+                break
+            if command == 'STATE':
+                for index in range(len(controller.bank.elevators)):
+                    replies.put_nowait(str(controller.state(index)))
+            elif command == 'SUBSCRIBE':
+                if stream_task is None:
+                    stream_task = asyncio.create_task(_stream_states(controller, replies))
+                replies.put_nowait("OK")
+            else:
+                try:
+                    call = parse_command(words)
+                except ValueError as error:
+                    replies.put_nowait(f"ERR {error}")
+                    continue
+                replies.put_nowait(await controller.submit(call))
+    finally:
+        if stream_task:
+            stream_task.cancel()
+        replies.put_nowait(None)
+        await writer_task
+        writer.close()
+        await writer.wait_closed()
+
+
+async def serve(controller: ElevatorController, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.Server:
+    """Starts a TCP server speaking the line protocol of `handle_client`, port 0 picks a free port."""
+    return await asyncio.start_server(partial(handle_client, controller), host, port)
+
+
+async def run_server(args: argparse.Namespace) -> None:
+    """Runs the controller and its server until cancelled."""
+    bank = create_bank(args.cars, args.dispatch, args.scheduler, lower_floor=args.lower_floor,
+                       top_floor=args.top_floor, sink=NullSink())
+    async with ElevatorController(bank, args.step_time) as controller:
+        server = await serve(controller, args.host, args.port)
+        print(f"Serving {args.cars} cars on {', '.join(str(socket.getsockname()) for socket in server.sockets)}")
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None) -> None:
+    """Runs a live controller serving calls over TCP."""
+    parser = argparse.ArgumentParser(description="Runs the elevator bank as a live controller.")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="address to listen on")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="port to listen on")
+    parser.add_argument('--cars', type=int, default=4, help="number of cars")
+    parser.add_argument('--lower-floor', type=int, default=1, help="lowest floor")
+    parser.add_argument('--top-floor', type=int, default=20, help="highest floor")
+    parser.add_argument('--dispatch', choices=list(POLICIES), default='eta', help="policy assigning hall calls")
+    parser.add_argument('--scheduler', choices=list(SCHEDULERS), default='collective', help="car scheduler")
+    parser.add_argument('--step-time', type=float, default=DEFAULT_STEP_TIME,
+                        help="seconds a car takes to travel a floor or operate its doors")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(run_server(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
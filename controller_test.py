@@ -0,0 +1,158 @@
+import asyncio
+import random
+import time
+
+import pytest
+
+from controller import CarCall, ElevatorController, parse_command, serve
+from dispatcher import create_bank
+from events import NullSink
+from exceptions import ControllerFailedError, InvalidFloorError
+from scheduling import HallCall, LookScheduler
+
+
+class BrokenScheduler(LookScheduler):
+    def choose_direction(self, elevator) -> None:
+        raise RuntimeError("motor fault")
+
+
+def create_controller(cars: int = 4, **options) -> ElevatorController:
+    bank = create_bank(cars, 'eta', 'collective', top_floor=20, sink=NullSink())
+    return ElevatorController(bank, step_time=0, **options)
+
+
+async def wait_until_idle(controller: ElevatorController) -> None:
+    while any(car.queue or car.doors_open for car in controller.bank.elevators):
+        await asyncio.sleep(0)
+
+
+def test_concurrent_producers_are_all_assigned():
+    async def scenario():
+        async with create_controller() as controller:
+            async def produce(seed):
+                rng = random.Random(seed)
+                futures = []
+                for _ in range(500):
+                    floor = rng.randint(1, 20)
+                    direction = 'up' if floor == 1 else 'down' if floor == 20 else rng.choice(('up', 'down'))
+                    futures.append(await controller.submit(HallCall(floor, direction)))
+                return await asyncio.gather(*futures)
+
+            started = time.perf_counter()
+            assignments = await asyncio.gather(*(produce(seed) for seed in range(10)))
+            elapsed = time.perf_counter() - started
+            await asyncio.wait_for(wait_until_idle(controller), 10)
+        return controller, assignments, elapsed
+
+    controller, assignments, elapsed = asyncio.run(scenario())
+    assert controller.assigned == 5000
+    assert all(0 <= car < 4 for cars in assignments for car in cars)
+    assert len({car for cars in assignments for car in cars}) > 1
+    assert elapsed < 10
+    assert controller.latency.count == 5000
+    assert controller.latency.maximum < 5
+
+
+def test_car_call_moves_the_car_and_publishes_its_states():
+    async def scenario():
+        async with create_controller(cars=2) as controller:
+            states = controller.subscribe()
+            assert await controller.call(CarCall(1, 5)) == 1
+            seen = []
+            while not (seen and seen[-1].floor == 5 and seen[-1].doors_open):
+                seen.append(await asyncio.wait_for(states.get(), 5))
+            await asyncio.wait_for(wait_until_idle(controller), 5)
+            return seen, controller.state(1)
+
+    seen, final = asyncio.run(scenario())
+    assert all(state.car == 1 for state in seen)
+    assert [state.floor for state in seen] == [2, 3, 4, 5]
+    assert final.floor == 5 and not final.doors_open and final.queue == ()
+
+
+def test_invalid_calls_are_rejected_without_stopping_the_controller():
+    async def scenario():
+        async with create_controller(cars=2) as controller:
+            with pytest.raises(InvalidFloorError):
+                await controller.call(HallCall(21, 'down'))
+            with pytest.raises(ValueError):
+                await controller.call(CarCall(2, 5))
+            return await controller.call(HallCall(20, 'down'))
+
+    assert asyncio.run(scenario()) in (0, 1)
+
+
+def test_bad_destinations_are_rejected_before_reaching_a_car():
+    async def scenario():
+        bank = create_bank(1, 'eta', 'destination', top_floor=20, sink=NullSink())
+        async with ElevatorController(bank, step_time=0) as controller:
+            with pytest.raises(InvalidFloorError):
+                await controller.call(HallCall(3, 'up', 99))
+            for call in (HallCall(3, 'down', 9), HallCall(3, None, 3)):
+                with pytest.raises(ValueError):
+                    await controller.call(call)
+            assert await controller.call(HallCall(3, 'up', 9)) == 0
+            await asyncio.wait_for(wait_until_idle(controller), 5)
+            return bank.elevators[0]
+
+    car = asyncio.run(scenario())
+    assert car.current_floor == 9 and not car.queue
+
+
+def test_a_failed_car_is_reported():
+    async def scenario():
+        async with create_controller(cars=1) as controller:
+            controller.bank.elevators[0].scheduler = BrokenScheduler()
+            await controller.call(CarCall(0, 5))
+            while controller.failure is None:
+                await asyncio.sleep(0)
+            with pytest.raises(ControllerFailedError):
+                await controller.call(CarCall(0, 7))
+
+    with pytest.raises(RuntimeError, match="motor fault"):
+        asyncio.run(scenario())
+
+
+def test_slow_subscriber_keeps_the_latest_states():
+    async def scenario():
+        async with create_controller(cars=1) as controller:
+            states = controller.subscribe(maxsize=2)
+            await controller.call(CarCall(0, 10))
+            await asyncio.wait_for(wait_until_idle(controller), 5)
+            return [states.get_nowait() for _ in range(states.qsize())]
+
+    latest = asyncio.run(scenario())
+    assert len(latest) == 2
+    assert latest[-1].floor == 10 and not latest[-1].doors_open
+
+
+def test_parse_command():
+    assert parse_command(['HALL', '3']) == HallCall(3)
+    assert parse_command(['hall', '3', 'UP', '7']) == HallCall(3, 'up', 7)
+    assert parse_command(['CAR', '1', '9']) == CarCall(1, 9)
+    for words in (['HALL', '3', 'sideways'], ['CAR', '1'], ['JUMP', '3'], ['HALL', 'three']):
+        with pytest.raises(ValueError):
+            parse_command(words)
+
+
+def test_line_protocol_server():
+    async def scenario():
+        async with create_controller(cars=2) as controller:
+            server = await serve(controller, port=0)
+            async with server:
+                port = server.sockets[0].getsockname()[1]
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                writer.write(b"HALL 3 up\nCAR 1 7\nHALL 99 up\nJUMP\n\nSTATE\nQUIT\n")
+                await writer.drain()
+                lines = [line.decode().strip() async for line in reader]
+                writer.close()
+                await writer.wait_closed()
+            return lines
+
+    lines = asyncio.run(scenario())
+    assert lines[0] in ("OK 0", "OK 1")
+    assert lines[1] == "OK 1"
+    assert lines[2].startswith("ERR ")
+    assert lines[3].startswith("ERR ")
+    assert [line.split()[1] for line in lines[4:]] == ["car=0", "car=1"]
+    assert len(lines) == 6
@@ -0,0 +1,299 @@
+import random
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from building import Building, default_lobby
+from constants import UP_NAME, DOWN_NAME
+from elevator import Elevator
+from eta import EtaService
+from kinematics import Kinematics
+from parking import PARKING_POLICIES, ParkingPolicy
+from scheduling import HallCall, SCHEDULERS
+
+
+class AssignmentPolicy(ABC):
+    """Decides which car of a bank serves a hall call."""
+
+    @abstractmethod
+    def assign(self, bank: 'ElevatorBank', call: HallCall) -> Elevator:
+        """Returns the car that will serve the call."""
+
+
+class NearestCarPolicy(AssignmentPolicy):
+    """Assigns the call to the closest car, preferring the less busy one when distances are equal."""
+
+    def assign(self, bank: 'ElevatorBank', call: HallCall) -> Elevator:
+        return min(bank.cars_for(call), key=lambda car: (abs(car.current_floor - call.floor), len(car.queue)))
+
+
+class EstimatedTimeOfArrivalPolicy(AssignmentPolicy):
+    """
+    Assigns the call to the car that would reach the floor first.
+
+    A car keeps travelling in its direction while it has calls ahead, so a floor behind a moving car
+    is reached only after the car has turned around at its farthest call.
+    """
+
+    def assign(self, bank: 'ElevatorBank', call: HallCall) -> Elevator:
+        return min(bank.cars_for(call), key=lambda car: (self.estimate(car, call.floor), len(car.queue)))
+
+    @staticmethod
+    def estimate(car: Elevator, floor: int) -> int:
+        """Returns the number of ticks `car` needs to reach `floor`."""
+        current = car.current_floor
+        if car.direction == UP_NAME and car.queue:
+            if floor >= current:
+                return floor - current
+            turn = max(car.queue.highest, current)
+            return (turn - current) + (turn - floor)
+        if car.direction == DOWN_NAME and car.queue:
+            if floor <= current:
+                return current - floor
+            turn = min(car.queue.lowest, current)
+            return (current - turn) + (floor - turn)
+        return abs(current - floor)
+
+
+class ZoningPolicy(AssignmentPolicy):
+    """
+    Splits the floors above the lobby into contiguous zones, one per car, and assigns each call to the car of
+    its zone, the basements belonging to the lowest zone.
+
+    Calls from the lobby go to the nearest car since every zone starts there, and so do the calls of a
+    caller the car of the zone has just turned away. In a building with zones of its own, the calls go to
+    the nearest of the cars serving them.
+    """
+
+    def __init__(self, fallback: Optional[AssignmentPolicy] = None) -> None:
+        """Initializes the policy with the one used for lobby calls."""
+        self.fallback = fallback or NearestCarPolicy()
+
+    def assign(self, bank: 'ElevatorBank', call: HallCall) -> Elevator:
+        lobby = bank.lobby
+        if call.floor == lobby or bank.building is not None:
+            return self.fallback.assign(bank, call)
+        zone = max(call.floor - lobby - 1, 0) * len(bank.elevators) // (bank.top_floor - lobby)
+        car = bank.elevators[zone]
+        if car not in bank.cars_for(call):
+            return self.fallback.assign(bank, call)
+        return car
+
+
+class DestinationGroupingPolicy(EstimatedTimeOfArrivalPolicy):
+    """
+    Assigns calls from destination-dispatch panels so that riders going to the same floor share a car.
+
+    A car already stopping at the destination of the call gets a head start of `bonus` ticks over the
+    estimated arrival times of the other cars, calls without a destination are assigned by arrival time.
+    """
+
+    def __init__(self, bonus: int = 3) -> None:
+        """Initializes the policy with the head start of the cars sharing the destination."""
+        self.bonus = bonus
+
+    def assign(self, bank: 'ElevatorBank', call: HallCall) -> Elevator:
+        def cost(car: Elevator) -> int:
+            estimate = self.estimate(car, call.floor)
+            if call.destination is not None and call.destination in car.queue:
+                estimate -= self.bonus
+            return estimate
+
+        return min(bank.cars_for(call), key=lambda car: (cost(car), len(car.queue)))
+
+
+class TravelTimePolicy(AssignmentPolicy):
+    """
+    Assigns the call to the car that would reach the floor first, counting the time of its runs and of
+    every stop on the way from the travel times of the bank.
+
+    Unlike `EstimatedTimeOfArrivalPolicy`, a car with many stops ahead loses to an express one further away,
+    and with kinematics the runs cost what the motion profile of the car takes. Cars reaching the floor at
+    the same time are told apart by the time they need to serve their whole queue.
+    """
+
+    def assign(self, bank: 'ElevatorBank', call: HallCall) -> Elevator:
+        travel_times = bank.travel_times
+        return min(bank.cars_for(call),
+                   key=lambda car: (travel_times.estimate(car, call.floor), travel_times.remaining_time(car)))
+
+
+POLICIES = {
+    'nearest': NearestCarPolicy,
+    'eta': EstimatedTimeOfArrivalPolicy,
+    'travel-time': TravelTimePolicy,
+    'zoning': ZoningPolicy,
+    'destination': DestinationGroupingPolicy,
+}
+
+
+class ElevatorBank:
+    """
+    A group of elevator cars with a dispatcher assigning hall calls to them.
+
+    Attributes:
+        elevators (list): The cars of the bank.
+        policy (AssignmentPolicy): Decides which car serves a hall call.
+        building (Building or None): The floors every car serves and the routes between them, None when
+            every car serves every floor.
+        lobby (int): The entrance floor, above the basements: the lobby of the building when given.
+        parking (ParkingPolicy or None): Decides where the idle cars wait, None to leave them where they stop.
+        travel_times (EtaService): Estimates when the cars can reach a floor.
+        parked (dict): The floor every idle car was sent to wait on, until the car gets a call.
+        waiting (dict): Passengers waiting for a car, keyed by the car and the floor they wait on.
+    """
+
+    def __init__(self, elevators: list, policy: Optional[AssignmentPolicy] = None,
+                 building: Optional[Building] = None, parking: Optional[ParkingPolicy] = None,
+                 travel_times: Optional[EtaService] = None, lobby: Optional[int] = None) -> None:
+        """Initializes the bank with its cars and assignment policy."""
+        self.elevators = elevators
+        self.policy = policy or NearestCarPolicy()
+        self.building = building
+        if building is not None:
+            lobby = building.lobby
+        self.lobby = default_lobby(self.lower_floor, self.top_floor) if lobby is None else lobby
+        self.parking = parking
+        self.travel_times = travel_times or EtaService()
+        self.parked = {}
+        self.waiting = {}
+        if building is not None:
+            if len(building.served) != len(elevators):
+                raise ValueError(f"The building describes {len(building.served)} cars, the bank has {len(elevators)}.")
+            for car, floors in zip(elevators, building.served):
+                car.served_floors = floors
+
+    @property
+    def lower_floor(self) -> int:
+        """Returns the lowest floor reachable by any car."""
+        return min(car.lower_floor for car in self.elevators)
+
+    @property
+    def top_floor(self) -> int:
+        """Returns the highest floor reachable by any car."""
+        return max(car.top_floor for car in self.elevators)
+
+    def cars_for(self, call: HallCall) -> list:
+        """
+        Returns the cars able to serve the call: stopping on its floor and at its destination when given, and
+        other than the car that turned the caller away unless no other car can serve the call.
+        """
+        building = self.building
+        if building is None:
+            cars = self.elevators
+        elif call.destination is None:
+            cars = [self.elevators[car] for car in building.cars_serving(call.floor)]
+        else:
+            cars = [self.elevators[car] for car in building.route(call.floor, call.destination).cars]
+        if call.refused_by is not None:
+            others = [car for car in cars if car is not call.refused_by]
+            if others:
+                return others
+        return cars
+
+    def hall_call(self, floor: int, passenger=None, refused_by: Optional[Elevator] = None) -> Elevator:
+        """
+        Assigns the call from `floor` to a car, registers the call with that car and returns the car.
+        A call from a passenger carries the direction and the destination of their trip, and the
+        passenger is put on the waiting list of the car on that floor. A passenger turned away by
+        `refused_by` gets another car when there is one.
+        """
+        if passenger is None:
+            call = HallCall(floor, refused_by=refused_by)
+        else:
+            call = HallCall(floor, passenger.travel_direction, passenger.leg_target, refused_by)
+        car = self.policy.assign(self, call)
+        if self.parking is not None:
+            self.parking.observe(call)
+            # A car on its way to park gives up the trip for the call.
+            parked = self.parked.pop(car, None)
+            if parked is not None and not car.passengers:
+                car.remove_floor_from_queue(parked)
+        car.add_hall_call(call)
+        if passenger is not None:
+            waiting = self.waiting.get((car, floor))
+            if waiting is None:
+                waiting = self.waiting[(car, floor)] = []
+            waiting.append(passenger)
+        return car
+
+    def board_waiting_passengers(self, car: Elevator) -> list:
+        """
+        Lets in the passengers waiting for `car` on its current floor. When the car serves a single
+        direction there, the passengers going the other way keep waiting for it. Returns the passengers
+        a full car turned away, who called a car again.
+        """
+        key = (car, car.current_floor)
+        waiting = self.waiting.pop(key, None)
+        if not waiting:
+            return []
+        direction = car.boarding_direction
+        if direction is not None:
+            staying = [passenger for passenger in waiting if passenger.travel_direction != direction]
+            if staying:
+                self.waiting[key] = staying
+                waiting = [passenger for passenger in waiting if passenger.travel_direction == direction]
+        refused = []
+        for passenger in waiting:
+            passenger.enter_the_elevator()
+            if passenger._in_elevator:
+                passenger.select_floor()
+            else:
+                refused.append(passenger)
+        return refused
+
+    def car_with_open_doors_at(self, floor: int, direction: Optional[str] = None,
+                               passenger=None) -> Optional[Elevator]:
+        """
+        Returns a car standing on `floor` with open doors that lets in passengers going `direction`, and
+        that admits `passenger` and stops where they ride to when given.
+        """
+        for car in self.elevators:
+            if (car.doors_open and car.current_floor == floor
+                    and (direction is None or car.boarding_direction in (None, direction))
+                    and (passenger is None or (car.admits(passenger)
+                                               and (car.served_floors is None
+                                                    or passenger.leg_target in car.served_floors)))):
+                return car
+        return None
+
+    def park_if_idle(self, car: Elevator) -> bool:
+        """Sends an idle car to the floor picked by the parking policy. Returns whether the car was sent."""
+        if self.parking is None or car.queue or car.doors_open:
+            return False
+        floor = self.parking.park(self, car)
+        if floor is None:
+            self.parked.pop(car, None)
+            return False
+        self.parked[car] = floor
+        if floor == car.current_floor:
+            return False
+        car.add_floor_to_queue(floor)
+        return True
+
+    def move(self, rng: Optional[random.Random] = None) -> None:
+        """
+        Moves every car of the bank and lets the waiting passengers into the cars that opened, the cars left
+        with nothing to do go parking.
+        """
+        for car in self.elevators:
+            car.move(rng)
+            if car.doors_open:
+                self.board_waiting_passengers(car)
+            elif self.parking is not None:
+                self.park_if_idle(car)
+
+    def __str__(self) -> str:
+        """Returns the status of every car."""
+        return ''.join(str(car) for car in self.elevators)
+
+
+def create_bank(cars: int, policy: str = 'nearest', scheduler: str = 'legacy', building: Optional[Building] = None,
+                parking: str = 'stay', kinematics: Optional[Kinematics] = None, **elevator_options) -> ElevatorBank:
+    """
+    Creates a bank of identical cars with the named assignment policy, each car with its own named scheduler,
+    stopping at the floors `building` gives them and waiting where the named parking policy sends them.
+    Travel times are estimated with `kinematics`, in ticks without.
+    """
+    elevators = [Elevator(scheduler=SCHEDULERS[scheduler](), **elevator_options) for _ in range(cars)]
+    return ElevatorBank(elevators, POLICIES[policy](), building, PARKING_POLICIES[parking](),
+                        EtaService(kinematics))
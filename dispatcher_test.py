@@ -0,0 +1,165 @@
+from building import Building
+from constants import UP_NAME
+from dispatcher import (DestinationGroupingPolicy, ElevatorBank, EstimatedTimeOfArrivalPolicy, NearestCarPolicy,
+                        ZoningPolicy, create_bank)
+from elevator import Elevator, Passenger
+from events import NullSink
+from scheduling import HallCall, LegacyScheduler
+from simulation import SIMULATIONS, SimulationConfig
+from utils import set_bank_for_passengers
+
+
+class TestElevatorBank:
+    """Test suite for the elevator bank and its assignment policies."""
+
+    def setup_method(self):
+        """Creates a bank of three cars standing on floors 1, 5 and 10."""
+        self.cars = [Elevator(top_floor=10, sink=NullSink()) for _ in range(3)]
+        for car, floor in zip(self.cars, (1, 5, 10)):
+            car.current_floor = floor
+
+    def test_nearest_car(self):
+        """The closest car gets the call."""
+        bank = ElevatorBank(self.cars, NearestCarPolicy())
+        assert bank.hall_call(6) is self.cars[1]
+        assert 6 in self.cars[1].queue
+        assert bank.hall_call(2) is self.cars[0]
+
+    def test_estimated_time_of_arrival(self):
+        """A car moving away from the call is penalized for the detour."""
+        bank = ElevatorBank(self.cars, EstimatedTimeOfArrivalPolicy())
+        self.cars[1].direction = UP_NAME
+        self.cars[1].add_floor_to_queue(9)
+        # The car on floor 5 reaches floor 4 only after visiting floor 9: 4 + 5 ticks.
+        assert EstimatedTimeOfArrivalPolicy.estimate(self.cars[1], 4) == 9
+        assert bank.hall_call(4) is self.cars[0]
+        assert bank.hall_call(7) is self.cars[1]
+
+    def test_zoning(self):
+        """Every car serves its own zone, lobby calls go to the nearest car."""
+        bank = ElevatorBank(self.cars, ZoningPolicy())
+        assert bank.hall_call(2) is self.cars[0]
+        assert bank.hall_call(6) is self.cars[1]
+        assert bank.hall_call(10) is self.cars[2]
+        self.cars[0].current_floor = 4
+        assert bank.hall_call(1) is self.cars[0]
+
+    def test_zoning_with_basements(self):
+        """The zones start above the lobby, the basements go with the lowest zone and a refused caller
+        gets another car."""
+        cars = [Elevator(lower_floor=-2, top_floor=10, sink=NullSink()) for _ in range(3)]
+        for car, floor in zip(cars, (4, 6, 10)):
+            car.current_floor = floor
+        bank = ElevatorBank(cars, ZoningPolicy())
+        assert bank.lobby == 1
+        assert bank.hall_call(1) is cars[0]
+        assert bank.hall_call(-2) is cars[0]
+        assert bank.hall_call(7) is cars[1]
+        assert bank.hall_call(7, refused_by=cars[1]) is cars[2]
+
+    def test_destination_grouping(self):
+        """A car already stopping at the destination of a call gets it over a slightly closer car."""
+        bank = ElevatorBank(self.cars, DestinationGroupingPolicy())
+        self.cars[0].current_floor = 3
+        self.cars[1].add_floor_to_queue(8)
+        passenger = Passenger(current_floor=3, target_floor=8)
+        set_bank_for_passengers([passenger], bank)
+        passenger.call_elevator()
+        assert passenger._elevator is self.cars[1]
+        assert self.cars[1].up_calls == {3}
+        assert bank.hall_call(2) is self.cars[0]
+
+    def test_passenger_calls_go_through_the_bank(self):
+        """A passenger rides the car the dispatcher assigned to their call."""
+        bank = ElevatorBank(self.cars)
+        passenger = Passenger(current_floor=9, target_floor=2)
+        set_bank_for_passengers([passenger], bank)
+        passenger._is_resting = False
+        passenger.move()
+        assert passenger._elevator is self.cars[2]
+        for _ in range(10):
+            bank.move()
+            passenger.move()
+        assert passenger.current_floor == 2
+
+    def test_waiting_lists(self):
+        """A car opening on a floor takes exactly the passengers waiting for it there."""
+        bank = ElevatorBank(self.cars)
+        passengers = [Passenger(current_floor=floor, target_floor=8) for floor in (4, 4, 6, 2)]
+        set_bank_for_passengers(passengers, bank)
+        for passenger in passengers:
+            passenger.call_elevator()
+        assert [passenger._elevator for passenger in passengers] == [self.cars[1]] * 3 + [self.cars[0]]
+        assert bank.waiting[(self.cars[1], 4)] == passengers[:2]
+
+        bank.move()
+        assert self.cars[1].current_floor == 4
+        assert list(self.cars[1].passengers) == passengers[:2]
+        assert (self.cars[1], 4) not in bank.waiting
+        assert bank.waiting[(self.cars[1], 6)] == [passengers[2]]
+
+    def test_refused_passengers_call_again(self):
+        """Passengers turned away by a full car stay waiting, and a car with room takes them."""
+        cars = [Elevator(capacity=2, top_floor=10, admission=True, sink=NullSink()) for _ in range(2)]
+        cars[1].current_floor = 10
+        bank = ElevatorBank(cars)
+        passengers = [Passenger(current_floor=1, target_floor=8) for _ in range(3)]
+        set_bank_for_passengers(passengers, bank)
+        for passenger in passengers:
+            passenger.call_elevator()
+        cars[0].open_doors()
+        assert bank.board_waiting_passengers(cars[0]) == [passengers[2]]
+        assert list(cars[0].passengers) == passengers[:2]
+        assert passengers[2]._awaits
+        # The call goes to the other car rather than back to the full one.
+        assert passengers[2]._elevator is cars[1]
+        assert bank.car_with_open_doors_at(1, UP_NAME, passengers[2]) is None
+
+        for _ in range(30):
+            bank.move()
+        assert [passenger.current_floor for passenger in passengers] == [8, 8, 8]
+
+    def test_transfer_at_the_sky_lobby(self):
+        """A passenger rides a shuttle to the sky lobby, then a car of the upper section to their floor."""
+        building = Building.zoned(1, 20, cars=3, sky_lobbies=(10,), shuttles=1)
+        bank = create_bank(3, 'nearest', building=building, top_floor=20, sink=NullSink())
+        local, upper, shuttle = bank.elevators
+        upper.current_floor = 10
+        passenger = Passenger(current_floor=1, target_floor=15)
+        set_bank_for_passengers([passenger], bank)
+        assert passenger.leg_target == 10
+        passenger._is_resting = False
+        passenger.move()
+        assert passenger._elevator is shuttle
+        rides = []
+        for _ in range(30):
+            bank.move()
+            passenger.move()
+            if passenger._in_elevator and passenger._elevator not in rides:
+                rides.append(passenger._elevator)
+            if passenger._is_resting:
+                # A resting passenger may set off on a new trip at random.
+                break
+        assert rides == [shuttle, upper]
+        assert passenger.current_floor == 15 and passenger._is_resting
+        # Only the car reaching the target floor delivers the passenger.
+        assert local.trips == shuttle.trips == 0 and upper.trips == 1
+        assert bank.cars_for(HallCall(5)) == [local]
+
+    def test_create_bank(self):
+        """Banks of identical cars are created by policy name."""
+        bank = create_bank(4, 'eta', capacity=8, top_floor=20, sink=NullSink())
+        assert len(bank.elevators) == 4
+        assert isinstance(bank.policy, EstimatedTimeOfArrivalPolicy)
+        assert all(isinstance(car.scheduler, LegacyScheduler) for car in bank.elevators)
+        assert bank.top_floor == 20
+        assert all(car.capacity == 8 for car in bank.elevators)
+
+    def test_simulation_with_several_cars(self):
+        """Both engines spread the calls over the cars of the bank."""
+        for engine in SIMULATIONS.values():
+            config = SimulationConfig(ticks=500, passenger_count=100, cars=4, top_floor=20)
+            simulation = engine(config)
+            simulation.run()
+            assigned = {id(passenger._elevator) for passenger in simulation.passengers if passenger._elevator}
+            assert len(assigned) > 1
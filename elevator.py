@@ -1,11 +1,23 @@
-from random import choice, randint
-from time import sleep
-from typing import Optional
-
-from constants import DEFAULT_LOWER_FLOOR, DEFAULT_TOP_FLOOR, DEFAULT_CAPACITY, UP_NAME, DOWN_NAME
-from exceptions import InvalidFloorError, ElevatorOverloadedError
+import random
+from itertools import count
+from typing import Callable, Iterable, Optional, TYPE_CHECKING
+
+from call_queue import CallQueue
+from constants import (DEFAULT_LOWER_FLOOR, DEFAULT_TOP_FLOOR, DEFAULT_CAPACITY, DEFAULT_PASSENGER_WEIGHT, UP_NAME,
+                       DOWN_NAME)
+from events import (Alighted, Arrived, Boarded, Called, DoorsClosed, DoorsOpened, Ejected, EventSink, FloorSelected,
+                    Refused, Transferred, console_sink)
+from building import random_floor_except
+from exceptions import InvalidFloorError, ElevatorOverloadedError, FloorNotServedError
 from interfaces import ElevatorInterface, PassengerInterface
-from utils import find_closest, has_larger, has_smaller, generate_full_name, set_elevator_for_passengers
+from naming import DEFAULT_NAMING
+from scheduling import HallCall, LegacyScheduler, Scheduler
+
+if TYPE_CHECKING:
+    from dispatcher import ElevatorBank
+
+# Ids of the passengers created without an explicit id.
+_passenger_ids = count()
 
 
 class Elevator(ElevatorInterface):
@@ -15,33 +27,72 @@ class Elevator(ElevatorInterface):
     Attributes:
         lower_floor (int): The lowest floor the elevator can reach.
         top_floor (int): The highest floor the elevator can reach.
+        served_floors (frozenset or None): The floors the elevator stops at, None for every floor in reach.
         capacity (int): The maximum number of passengers the elevator can carry.
+        max_load (float or None): The maximum total weight of the passengers in kg, None for no limit.
+        load (float): The total weight of the passengers in the elevator.
+        admission (bool): Turns passengers away at the door when they would overload the elevator, instead
+            of pushing the overload out before departure.
         doors_open (bool): Indicates if the elevator doors are open.
         _current_floor (int): The floor where the elevator currently is.
         direction (str or None): The direction in which the elevator is moving. Can be 'up', 'down' or None.
-        queue (set): A set of floors the elevator intends to visit.
-        passengers (set): A set of passengers currently in the elevator.
+        queue (CallQueue): The floors the elevator intends to visit, kept sorted.
+        queue_factory (callable): Makes the queue of the elevator from an iterable of floors, `CallQueue` or a
+            subclass keeping more about the route; setting it rebuilds the queue with the same floors.
+        car_calls (CallQueue): The floors selected inside the car, and the calls made without a direction.
+        up_calls (CallQueue): The floors with a landing call going up.
+        down_calls (CallQueue): The floors with a landing call going down.
+        scheduler (Scheduler): Decides where the car goes and on which floors it stops.
+        boarding_direction (str or None): The direction of the callers served at the current stop,
+            None when everyone may board.
+        passengers (dict): Passengers currently in the elevator, used as a set that keeps the boarding order.
+        riders_by_floor (dict): The passengers of the elevator grouped by their target floor.
         directions (dict): Dictionary mapping directions to methods.
+        sink (EventSink): Receives the events of the elevator and its passengers.
+        trips (int): Number of passengers delivered to their target floor.
     """
+    __slots__ = ('lower_floor', 'top_floor', 'served_floors', 'capacity', 'max_load', 'load', 'admission',
+                 'doors_open', '_current_floor', 'direction', '_queue', '_queue_factory', 'car_calls', 'up_calls',
+                 'down_calls', 'scheduler', 'boarding_direction', 'passengers', 'riders_by_floor', 'directions', 'sink',
+                 'trips')
 
     def __init__(self,
                  capacity: int = DEFAULT_CAPACITY,
                  lower_floor: int = DEFAULT_LOWER_FLOOR,
-                 top_floor: int = DEFAULT_TOP_FLOOR) -> None:
+                 top_floor: int = DEFAULT_TOP_FLOOR,
+                 sink: Optional[EventSink] = None,
+                 scheduler: Optional[Scheduler] = None,
+                 max_load: Optional[float] = None,
+                 admission: bool = False,
+                 served_floors: Optional[Iterable[int]] = None,
+                 queue_factory: Callable[[Iterable[int]], CallQueue] = CallQueue) -> None:
         """Initializes the elevator with default or given parameters."""
         self.lower_floor = lower_floor
         self.top_floor = top_floor
+        self.served_floors = None if served_floors is None else frozenset(served_floors)
         self.capacity = capacity
+        self.max_load = max_load
+        self.load = 0.0
+        self.admission = admission
         self.doors_open = False
         self._current_floor = self.lower_floor
         self.direction = None
-        self.queue = set()
-        self.passengers = set()
+        self._queue_factory = queue_factory
+        self._queue = queue_factory(())
+        self.car_calls = CallQueue()
+        self.up_calls = CallQueue()
+        self.down_calls = CallQueue()
+        self.scheduler = scheduler if scheduler else LegacyScheduler()
+        self.boarding_direction = None
+        self.passengers = {}
+        self.riders_by_floor = {}
         self.directions = {
             None: self.rest,
             UP_NAME: self.up_one_floor,
             DOWN_NAME: self.down_one_floor,
         }
+        self.sink = sink if sink else console_sink()
+        self.trips = 0
 
     @property
     def state(self) -> str:
@@ -64,58 +115,164 @@ class Elevator(ElevatorInterface):
             raise InvalidFloorError(new_floor, self.lower_floor, self.top_floor)
 
     @property
-    def movement_permitted(self, raise_exception: bool = False) -> bool:
-        """Determines if the elevator can move based on its passenger capacity."""
-        overweight = len(self.passengers) <= self.capacity
-        if raise_exception:
+    def queue(self) -> CallQueue:
+        """Returns the floors the elevator intends to visit."""
+        return self._queue
+
+    @queue.setter
+    def queue(self, floors) -> None:
+        """Replaces the floors the elevator intends to visit, they all become car calls."""
+        self._queue = self._queue_factory(floors)
+        self.car_calls = CallQueue(floors)
+        self.up_calls.clear()
+        self.down_calls.clear()
+
+    @property
+    def queue_factory(self) -> Callable[[Iterable[int]], CallQueue]:
+        """Returns what makes the queue of the elevator from its floors."""
+        return self._queue_factory
+
+    @queue_factory.setter
+    def queue_factory(self, factory: Callable[[Iterable[int]], CallQueue]) -> None:
+        """Rebuilds the queue with `factory`, keeping its floors and calls."""
+        self._queue_factory = factory
+        self._queue = factory(self._queue)
+
+    @property
+    def overloaded(self) -> bool:
+        """Checks whether the elevator carries more passengers or more weight than it may."""
+        return len(self.passengers) > self.capacity or (self.max_load is not None and self.load > self.max_load)
+
+    @property
+    def is_full(self) -> bool:
+        """Checks whether another passenger of the usual weight would overload the elevator."""
+        return (len(self.passengers) >= self.capacity
+                or (self.max_load is not None and self.load + DEFAULT_PASSENGER_WEIGHT > self.max_load))
+
+    @property
+    def movement_permitted(self) -> bool:
+        """Determines if the elevator can move based on its passenger capacity and load."""
+        return not self.overloaded
+
+    def check_load(self) -> None:
+        """Raises ElevatorOverloadedError when the elevator is overloaded."""
+        if self.overloaded:
             raise ElevatorOverloadedError(self.capacity, len(self.passengers))
-        return overweight
 
-    def eject_random_passenger(self) -> None:
-        """Ejects a random passenger from the elevator until the elevator is within capacity."""
-        if self.movement_permitted:
+    def serves(self, floor: int) -> bool:
+        """Checks whether the elevator stops at `floor`."""
+        return (self.lower_floor <= floor <= self.top_floor
+                and (self.served_floors is None or floor in self.served_floors))
+
+    def has_room_for(self, passenger) -> bool:
+        """Checks whether the passenger can get in without overloading the elevator."""
+        return (len(self.passengers) < self.capacity
+                and (self.max_load is None or self.load + passenger.weight <= self.max_load))
+
+    def admits(self, passenger) -> bool:
+        """Checks whether the passenger may get in, which is always the case without admission control."""
+        return not self.admission or self.has_room_for(passenger)
+
+    def eject_random_passenger(self, rng: Optional[random.Random] = None) -> None:
+        """Ejects random passengers from the elevator until the elevator is within its capacity and load."""
+        if not self.overloaded:
             return
-        self.getting_off()
-        return self.eject_random_passenger()
+        rng = rng or random
+        riders = list(self.passengers)
+        while self.overloaded:
+            # The same draw as choosing among the remaining riders in boarding order.
+            self.push_out(riders.pop(rng.randrange(len(riders))))
 
     def add_floor_to_queue(self, *args: int) -> None:
         """Adds one or more floors to the elevator's queue."""
         self.queue.update(args)
+        self.car_calls.update(args)
+
+    def add_hall_call(self, call: HallCall) -> None:
+        """Registers a call from a landing with the scheduler of the car."""
+        self.scheduler.register_hall_call(self, call)
 
     def remove_floor_from_queue(self, floor: int) -> None:
-        """Removes a floor from the elevator's queue if present."""
-        if floor in self.queue:
-            self.queue.remove(floor)
+        """Removes a floor and all its calls from the elevator's queue if present."""
+        self.queue.discard(floor)
+        self.car_calls.discard(floor)
+        self.up_calls.discard(floor)
+        self.down_calls.discard(floor)
 
     def open_doors(self):
         """Opens the elevator doors."""
         self.doors_open = True
-        print("The door is open.")
+        if DoorsOpened.level >= self.sink.level:
+            self.sink.emit(DoorsOpened(self))
 
     def close_doors(self):
         """Closes the elevator doors."""
         self.doors_open = False
-        print("The door is closed.")
+        if DoorsClosed.level >= self.sink.level:
+            self.sink.emit(DoorsClosed(self))
 
-    def passengers_getting_off(self, passenger_list: set):
+    def passengers_getting_off(self, passenger_list: list):
         """Handles the logic when passengers are getting off the elevator."""
         for passenger in passenger_list:
             self.getting_off(passenger)
 
-    def getting_off(self, passenger=None):
-        """Handles the logic when a passenger is getting off the elevator."""
-        if passenger:
-            self.passengers.remove(passenger)
-            print(f"{passenger} leaves the elevator with his head held high with pride")
-        else:
-            passenger = self.passengers.pop()
-            print(f"In an unequal fight, passenger {passenger} leaves the elevator.")
+    def getting_off(self, passenger=None, rng: Optional[random.Random] = None):
+        """
+        Handles the logic when a passenger is getting off the elevator.
+        Without a passenger, one chosen with `rng` is pushed out. A passenger getting off short of the target
+        floor to change cars is not delivered yet and counts no trip.
+        """
+        if not passenger:
+            self.push_out((rng or random).choice(list(self.passengers)))
+            return
+        self._remove_rider(passenger)
+        floor = self.current_floor
+        if floor == passenger.target_floor:
+            self.trips += 1
+            if Alighted.level >= self.sink.level:
+                self.sink.emit(Alighted(self, passenger, floor))
+        elif Transferred.level >= self.sink.level:
+            self.sink.emit(Transferred(self, passenger, floor))
+        passenger.got_off_the_elevator(floor)
+
+    def push_out(self, passenger) -> None:
+        """Pushes a passenger out of the overloaded elevator onto the current floor."""
+        self._remove_rider(passenger)
+        if Ejected.level >= self.sink.level:
+            self.sink.emit(Ejected(self, passenger, self.current_floor))
         passenger.got_off_the_elevator(self.current_floor)
 
+    def refuse(self, passenger) -> None:
+        """Turns away a passenger who would overload the elevator."""
+        if Refused.level >= self.sink.level:
+            self.sink.emit(Refused(self, passenger, self.current_floor))
+
     def passengers_entering(self, passenger):
         """Handles a passenger entering the elevator."""
-        self.passengers.add(passenger)
-        print(f"{passenger} stepped into the elevator as if it were his home.")
+        self.passengers[passenger] = None
+        self.load += passenger.weight
+        floor = passenger.leg_target
+        riders = self.riders_by_floor.get(floor)
+        if riders is None:
+            riders = self.riders_by_floor[floor] = {}
+        riders[passenger] = None
+        if Boarded.level >= self.sink.level:
+            self.sink.emit(Boarded(self, passenger))
+
+    def _remove_rider(self, passenger) -> None:
+        """Removes the passenger from the riders of the elevator."""
+        del self.passengers[passenger]
+        self.load -= passenger.weight
+        self._remove_from_index(passenger)
+
+    def _remove_from_index(self, passenger) -> None:
+        """Removes the passenger from the index of riders by the floor they ride to."""
+        floor = passenger.leg_target
+        riders = self.riders_by_floor.get(floor)
+        if riders:
+            riders.pop(passenger, None)
+            if not riders:
+                del self.riders_by_floor[floor]
 
     def close_doors_if_open(self):
         """Checks the state of the doors and closes them if they are open."""
@@ -124,63 +281,29 @@ class Elevator(ElevatorInterface):
 
     def stop_at_current_floor_if_needed(self):
         """Checks if the elevator needs to stop at the current floor."""
-        if self.current_floor in self.queue:
+        if self.scheduler.should_stop(self):
             self.open_doors()
 
     def disembark_passengers_if_needed(self):
-        """Checks if any passenger needs to get off at the current floor."""
-        who_go_out = set()
-        for passenger in self.passengers:
-            if passenger.target_floor == self.current_floor:
-                who_go_out.add(passenger)
+        """Lets off the passengers whose target is the current floor, found in the index without a scan."""
+        who_go_out = self.riders_by_floor.pop(self.current_floor, None)
         if who_go_out:
-            self.passengers_getting_off(who_go_out)
+            self.passengers_getting_off(list(who_go_out))
 
     def choose_direction(self):
-        """Determines the direction the elevator should move in based on the queue and current floor."""
-
-        def determine_initial_direction(target_floor, current_floor):
-            """Helper function to determine the direction towards the closest floor."""
-            if target_floor > current_floor:
-                return UP_NAME
-            elif target_floor == current_floor:
-                return None
-            return DOWN_NAME
-
-        sorted_queue = sorted(self.queue)
-        closest_floor = find_closest(sorted_queue, self.current_floor)
-        has_calls_above = has_larger(sorted_queue, self.current_floor)
-        has_calls_below = has_smaller(sorted_queue, self.current_floor)
-
-        # If there are no floors in the queue, the elevator remains idle.
-        if not closest_floor:
-            self.direction = None
-            return
-
-        # If the elevator is currently idle, set the direction towards the closest floor.
-        if not self.direction:
-            self.direction = determine_initial_direction(closest_floor, self.current_floor)
-            return
+        """Determines the direction the elevator should move in, as decided by its scheduler."""
+        self.scheduler.choose_direction(self)
 
-        # If the elevator is currently going up, but there are no more calls above and there are calls below.
-        if self.direction == UP_NAME and not has_calls_above and has_calls_below:
-            self.direction = DOWN_NAME
-            return
-
-        # If the elevator is currently going down, but there are no more calls below and there are calls above.
-        if self.direction == DOWN_NAME and not has_calls_below and has_calls_above:
-            self.direction = UP_NAME
-
-    def move(self) -> None:
+    def move(self, rng: Optional[random.Random] = None) -> None:
         """Moves the elevator based on the current queue and passenger destinations."""
         if self.queue:
-            self.eject_random_passenger()
+            self.eject_random_passenger(rng)
             self.choose_direction()
             self.close_doors_if_open()
             self.directions[self.direction]()
             self.stop_at_current_floor_if_needed()
             self.disembark_passengers_if_needed()
-            self.remove_floor_from_queue(self.current_floor)
+            self.scheduler.clear_stop(self)
         else:
             self.rest()
 
@@ -192,12 +315,20 @@ class Elevator(ElevatorInterface):
     def up_one_floor(self):
         """Moves the elevator up by one floor."""
         self.current_floor += 1
-        print(f"The elevator arrived on the {self.current_floor} floor.")
+        if Arrived.level >= self.sink.level:
+            self.sink.emit(Arrived(self, self.current_floor))
 
     def down_one_floor(self):
         """Moves the elevator down by one floor."""
         self.current_floor -= 1
-        print(f"The elevator arrived on the {self.current_floor} floor.")
+        if Arrived.level >= self.sink.level:
+            self.sink.emit(Arrived(self, self.current_floor))
+
+    def travel_to(self, floor: int) -> None:
+        """Moves the elevator straight to `floor`, passing the floors in between without a stop."""
+        self.current_floor = floor
+        if Arrived.level >= self.sink.level:
+            self.sink.emit(Arrived(self, floor))
 
     def __str__(self) -> str:
         """Returns a string representation of the elevator's current status."""
@@ -205,7 +336,7 @@ class Elevator(ElevatorInterface):
         Floor: {self.current_floor}
         Passengers: {list(self.passengers)}
         Directions: {self.direction}
-        Queue: {sorted(self.queue)}
+        Queue: {list(self.queue)}
         State: {self.state}
         Doors open: {self.doors_open}
         """
@@ -217,67 +348,132 @@ class Passenger(PassengerInterface):
     Represents a passenger in the elevator system.
 
     Attributes:
-        name (str): Name of the passenger.
+        passenger_id (int): Compact integer identifier of the passenger.
+        name (str): Name of the passenger, generated by `_naming` the first time it is needed.
         current_floor (int): The current floor where the passenger is.
         target_floor (int): The target floor the passenger wants to go to.
+        weight (float): The weight of the passenger in kg, counted against the load limit of a car.
         _is_resting (bool): Represents if the passenger is resting and not intending to move.
         _awaits (bool): Represents if the passenger is waiting for the elevator.
         _in_elevator (bool): Represents if the passenger is currently inside the elevator.
-        _elevator (Optional[Elevator]): Reference to the elevator object.
+        _elevator (Optional[Elevator]): Reference to the elevator object, the car assigned to the last call
+            when the passenger uses a bank.
+        _bank (Optional[ElevatorBank]): Reference to the bank dispatching the passenger's calls.
     """
+    __slots__ = ('passenger_id', '_name', '_naming', 'current_floor', 'target_floor', 'weight', '_is_resting',
+                 '_awaits', '_in_elevator', '_elevator', '_bank')
 
-    def __init__(self, name: Optional[str] = None, current_floor: int = 1, target_floor: int = 9):
+    def __init__(self, name: Optional[str] = None, current_floor: int = 1, target_floor: int = 9,
+                 passenger_id: Optional[int] = None, naming=None, weight: float = DEFAULT_PASSENGER_WEIGHT):
         """Initializes a new passenger."""
-        self.name = name if name else generate_full_name()
+        self.passenger_id = next(_passenger_ids) if passenger_id is None else passenger_id
+        self._name = name
+        self._naming = naming or DEFAULT_NAMING
         self.current_floor = current_floor
         self.target_floor = target_floor
+        self.weight = weight
         self._is_resting = True
         self._awaits = False
         self._in_elevator = False
         self._elevator = None
+        self._bank = None
+
+    @property
+    def name(self) -> str:
+        """Returns the name of the passenger, generating it on first access."""
+        if not self._name:
+            self._name = self._naming(self.passenger_id)
+        return self._name
+
+    @name.setter
+    def name(self, name: str) -> None:
+        """Renames the passenger."""
+        self._name = name
+
+    @property
+    def leg_target(self) -> int:
+        """
+        Returns the floor the passenger rides to in the next car: the target floor, or the floor where they
+        change cars on the way when no car of their building serves both floors.
+        """
+        bank = self._bank
+        if bank is None or bank.building is None:
+            return self.target_floor
+        return bank.building.next_stop(self.current_floor, self.target_floor)
+
+    @property
+    def travel_direction(self) -> str:
+        """Returns the direction of the passenger's ride, the button pressed on the landing."""
+        return UP_NAME if self.leg_target > self.current_floor else DOWN_NAME
 
     def set_elevator(self, elevator: Elevator) -> None:
         """Set the elevator for the passenger."""
         self._elevator = elevator
 
-    def call_elevator(self) -> None:
-        """Call the elevator to the current floor of the passenger."""
-        self._elevator.add_floor_to_queue(self.current_floor)
+    def set_bank(self, bank: 'ElevatorBank') -> None:
+        """Set the elevator bank dispatching the passenger's calls."""
+        self._bank = bank
+
+    def call_elevator(self, refused_by: Optional['Elevator'] = None) -> None:
+        """
+        Call the elevator to the current floor of the passenger, telling the direction and the destination.
+        A passenger turned away by the car `refused_by` calls another car of the bank when there is one.
+        """
+        if self._bank:
+            self._elevator = self._bank.hall_call(self.current_floor, self, refused_by)
+        else:
+            self._elevator.add_hall_call(HallCall(self.current_floor, self.travel_direction, self.leg_target))
         self._awaits = True
-        print(f"{self} called the elevator while on the {self.current_floor} floor.")
+        sink = self._elevator.sink
+        if Called.level >= sink.level:
+            sink.emit(Called(self._elevator, self, self.current_floor))
 
     def enter_the_elevator(self) -> None:
-        """Logic for the passenger to enter the elevator."""
-        if self._elevator.doors_open:
-            self._elevator.passengers_entering(self)
-            self._in_elevator = True
+        """Logic for the passenger to enter the elevator. Turned away by a full car, the passenger calls again."""
+        elevator = self._elevator
+        if elevator.doors_open:
+            if elevator.admits(self):
+                elevator.passengers_entering(self)
+                self._in_elevator = True
+            else:
+                elevator.refuse(self)
+                self.call_elevator(refused_by=elevator)
 
     def select_floor(self) -> None:
         """Logic for the passenger to select a floor inside the elevator."""
         if self._in_elevator:
-            if self.target_floor not in range(self._elevator.lower_floor, self._elevator.top_floor + 1):
-                raise InvalidFloorError(self.target_floor, self._elevator.lower_floor, self._elevator.top_floor)
-            self._elevator.add_floor_to_queue(self.target_floor)
-            print(f"{self} nervously presses the {self.target_floor}th floor button.")
-
-    def set_a_new_target(self) -> None:
-        """Set a new random target floor for the passenger."""
-        possible_floors = [floor for floor in range(DEFAULT_LOWER_FLOOR, DEFAULT_TOP_FLOOR + 1) if
-                           floor != self.current_floor]
-        new_floor = choice(possible_floors)
-        self.target_floor = new_floor
+            elevator = self._elevator
+            floor = self.leg_target
+            if not elevator.lower_floor <= floor <= elevator.top_floor:
+                raise InvalidFloorError(floor, elevator.lower_floor, elevator.top_floor)
+            if elevator.served_floors is not None and floor not in elevator.served_floors:
+                raise FloorNotServedError(floor)
+            elevator.add_floor_to_queue(floor)
+            sink = elevator.sink
+            if FloorSelected.level >= sink.level:
+                sink.emit(FloorSelected(elevator, self, floor))
+
+    def set_a_new_target(self, rng: Optional[random.Random] = None) -> None:
+        """Set a new random target floor for the passenger, drawn from `rng` or the global generator."""
+        lower_floor, top_floor = DEFAULT_LOWER_FLOOR, DEFAULT_TOP_FLOOR
+        building = self._bank or self._elevator
+        if building:
+            lower_floor, top_floor = building.lower_floor, building.top_floor
+        self.target_floor = random_floor_except(rng or random, lower_floor, top_floor, self.current_floor)
 
     def got_off_the_elevator(self, new_floor: int) -> None:
-        """Logic for the passenger to get off the elevator."""
+        """Logic for the passenger to get off the elevator. Short of the target, a passenger changes cars."""
         self.current_floor = new_floor
-        self._is_resting = True
-        self._awaits = False
         self._in_elevator = False
+        self._awaits = False
+        bank = self._bank
+        self._is_resting = bank is None or bank.building is None or new_floor == self.target_floor
 
-    def move(self) -> None:
+    def move(self, rng: Optional[random.Random] = None) -> None:
         """
         Simulates the passenger's movement logic.
         Depending on the state, the passenger might move, call the elevator, or enter the elevator.
+        Random decisions are drawn from `rng`, or from the global generator when it is not given.
         """
         # If the passenger is already in the elevator, no further actions are needed.
         if self._in_elevator:
@@ -285,11 +481,25 @@ class Passenger(PassengerInterface):
 
         # If the passenger is resting, there's a chance they might decide to move.
         if self._is_resting:
-            # Creates a 1 in 51 chance that a passenger will decide to move.
+            # Creates a 1 in 51 chance (TRIP_PROBABILITY) that a passenger will decide to move.
             # Which is the statistical chance of an elevator call per minute on a typical workday.
-            if randint(0, 50) == 0:
+            if (rng or random).randint(0, 50) == 0:
                 self._is_resting = False
-                self.set_a_new_target()
+                self.set_a_new_target(rng)
+            return
+
+        # A passenger served by a bank takes a car standing open on their floor for their direction,
+        # or lets the dispatcher pick one.
+        # Once the call is made, the bank lets the passenger in when the car opens on their floor.
+        if self._bank:
+            if not self._awaits:
+                car = self._bank.car_with_open_doors_at(self.current_floor, self.travel_direction, self)
+                if car:
+                    self.set_elevator(car)
+                    self.enter_the_elevator()
+                    self.select_floor()
+                else:
+                    self.call_elevator()
             return
 
         # If the passenger is on the same floor as the elevator, they can enter and select a floor.
@@ -306,25 +516,20 @@ class Passenger(PassengerInterface):
         return self.name
 
 
-def generate_random_passengers(count: int) -> list:
-    """Creates the specified number of random passengers"""
+def generate_random_passengers(count: int,
+                               lower_floor: int = DEFAULT_LOWER_FLOOR,
+                               top_floor: int = DEFAULT_TOP_FLOOR,
+                               rng: Optional[random.Random] = None,
+                               naming=None) -> list:
+    """Creates the specified number of random passengers with ids from 0, floors drawn from `rng` and
+    names generated lazily by `naming`"""
+    rng = rng or random
     passengers = []
     for i in range(count):
         passengers.append(Passenger(
-            current_floor=randint(DEFAULT_LOWER_FLOOR, DEFAULT_TOP_FLOOR),
-            target_floor=randint(DEFAULT_LOWER_FLOOR, DEFAULT_TOP_FLOOR)
+            passenger_id=i,
+            naming=naming,
+            current_floor=rng.randint(lower_floor, top_floor),
+            target_floor=rng.randint(lower_floor, top_floor)
         ))
     return passengers
-
-
-def run_simulation():
-    """Runs a simulation of elevator operation and passenger movements."""
-    elevator = Elevator()
-    passengers = generate_random_passengers(20)
-    set_elevator_for_passengers(passengers, elevator)
-    for _ in range(100):
-        elevator.move()
-        for passenger in passengers:
-            passenger.move()
-        print(elevator)
-        sleep(1)  # TODO: Remove the string for instant execution
@@ -1,6 +1,12 @@
+import io
+from random import Random
+
+import pytest
+
 from constants import UP_NAME, DOWN_NAME
 from elevator import Elevator, Passenger
-from exceptions import InvalidFloorError
+from events import BufferedTextSink, EventLevel, NullSink
+from exceptions import ElevatorOverloadedError, InvalidFloorError
 from utils import set_elevator_for_passengers
 
 
@@ -159,6 +165,82 @@ class TestElevator:
         assert not self.elevator.doors_open
         assert len(self.elevator.passengers) == 4
 
+    def test_seeded_ejection(self):
+        """The passengers pushed out of an overloaded elevator depend only on the random generator."""
+        def ejected(seed):
+            elevator = Elevator(capacity=2)
+            passengers = [Passenger(name=str(i), target_floor=9) for i in range(6)]
+            set_elevator_for_passengers(passengers, elevator)
+            elevator.open_doors()
+            for passenger in passengers:
+                passenger.enter_the_elevator()
+            elevator.eject_random_passenger(Random(seed))
+            return [passenger.name for passenger in passengers if passenger not in elevator.passengers]
+
+        assert len(ejected(1)) == 4
+        assert ejected(1) == ejected(1)
+        assert {tuple(ejected(seed)) for seed in range(10)} != {tuple(ejected(1))}
+
+    def test_bulk_ejection(self):
+        """A crowd far over the capacity is pushed out in one go, without recursion."""
+        elevator = Elevator(capacity=3, sink=NullSink())
+        passengers = [Passenger(target_floor=9) for _ in range(5000)]
+        set_elevator_for_passengers(passengers, elevator)
+        elevator.open_doors()
+        for passenger in passengers:
+            passenger.enter_the_elevator()
+        assert not elevator.movement_permitted
+        with pytest.raises(ElevatorOverloadedError):
+            elevator.check_load()
+
+        elevator.eject_random_passenger(Random(0))
+        assert len(elevator.passengers) == 3
+        assert elevator.movement_permitted
+        assert sum(passenger._in_elevator for passenger in passengers) == 3
+
+    def test_admission(self):
+        """A full car turns passengers away at the door, and they call it again."""
+        stream = io.StringIO()
+        elevator = Elevator(capacity=2, admission=True, sink=BufferedTextSink(stream, level=EventLevel.INFO))
+        passengers = [Passenger(name=str(i), target_floor=5) for i in range(3)]
+        set_elevator_for_passengers(passengers, elevator)
+        elevator.open_doors()
+        for passenger in passengers:
+            passenger.enter_the_elevator()
+            passenger.select_floor()
+        assert list(elevator.passengers) == passengers[:2]
+        assert passengers[2]._awaits and not passengers[2]._in_elevator
+        assert 1 in elevator.queue
+        elevator.sink.flush()
+        assert "2 looks at the crowded elevator" in stream.getvalue()
+
+        # The full car leaves the callers it turned away for later instead of reopening for them.
+        elevator.move()
+        assert elevator.current_floor == 2
+
+    def test_load_limit(self):
+        """The weight of the riders counts against the load limit."""
+        light, heavy = Passenger(target_floor=5, weight=60), Passenger(target_floor=5, weight=120)
+        elevator = Elevator(capacity=4, max_load=150, admission=True, sink=NullSink())
+        set_elevator_for_passengers([light, heavy], elevator)
+        elevator.open_doors()
+        light.enter_the_elevator()
+        heavy.enter_the_elevator()
+        assert list(elevator.passengers) == [light]
+        assert elevator.load == 60
+        # There is still room for someone of the usual weight.
+        assert not elevator.is_full
+
+        # Without admission control the overload is pushed out before departure.
+        elevator = Elevator(capacity=4, max_load=150, sink=NullSink())
+        set_elevator_for_passengers([light, heavy], elevator)
+        elevator.open_doors()
+        light.enter_the_elevator()
+        heavy.enter_the_elevator()
+        assert elevator.load == 180 and elevator.overloaded
+        elevator.eject_random_passenger(Random(1))
+        assert len(elevator.passengers) == 1 and elevator.load <= 150
+
     def test_abandon_ship(self):
         """Test the scenario where all passengers exit the elevator at their respective floors."""
         passengers = [
@@ -203,6 +285,32 @@ class TestElevator:
                 assert len(self.elevator.passengers) == 1
         assert not self.elevator.passengers
 
+    def test_riders_are_indexed_by_target_floor(self):
+        """The elevator keeps its riders grouped by target floor and unloads a floor without a scan."""
+        passengers = [
+            Passenger(target_floor=3),
+            Passenger(target_floor=3),
+            Passenger(target_floor=5),
+        ]
+        set_elevator_for_passengers(passengers, self.elevator)
+        self.elevator.capacity = 3
+        self.elevator.open_doors()
+        for passenger in passengers:
+            passenger.enter_the_elevator()
+            passenger.select_floor()
+        assert set(self.elevator.riders_by_floor) == {3, 5}
+        assert list(self.elevator.riders_by_floor[3]) == passengers[:2]
+
+        self.elevator.move()
+        self.elevator.move()
+        assert 3 not in self.elevator.riders_by_floor
+        assert list(self.elevator.passengers) == [passengers[2]]
+
+        self.elevator.capacity = 0
+        self.elevator.move()
+        assert not self.elevator.riders_by_floor
+        assert not self.elevator.passengers
+
     def test_elevator_call_all_at_once(self):
         """Test the scenario where the elevator is called by all passengers at once."""
         passengers = [
@@ -0,0 +1,50 @@
+import heapq
+from itertools import count
+from math import log
+
+
+class EventQueue:
+    """
+    Time-ordered queue of scheduled callbacks backed by a binary heap.
+
+    Callbacks scheduled for the same time run in the order they were scheduled.
+    """
+
+    def __init__(self) -> None:
+        """Initializes an empty queue."""
+        self._heap = []
+        self._sequence = count()
+
+    def schedule(self, time: float, callback, *args) -> None:
+        """Schedules `callback(*args)` to run at `time`."""
+        heapq.heappush(self._heap, (time, next(self._sequence), callback, args))
+
+    def peek_time(self) -> float:
+        """Returns the time of the earliest scheduled callback."""
+        return self._heap[0][0]
+
+    def pop(self) -> tuple:
+        """Removes the earliest scheduled callback and returns `(time, callback, args)`."""
+        time, _, callback, args = heapq.heappop(self._heap)
+        return time, callback, args
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __getstate__(self) -> dict:
+        # The sequence counter is saved as the next number it hands out.
+        return {'_heap': self._heap, '_sequence': next(self._sequence)}
+
+    def __setstate__(self, state: dict) -> None:
+        self._heap = state['_heap']
+        self._sequence = count(state['_sequence'])
+
+
+def geometric_delay(probability: float, random_value: float) -> int:
+    """
+    Converts a uniform `random_value` from [0, 1) into the number of ticks until the first success
+    of a per-tick Bernoulli trial with the given `probability`.
+    """
+    if probability >= 1:
+        return 1
+    return int(log(1.0 - random_value) / log(1.0 - probability)) + 1
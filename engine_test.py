@@ -0,0 +1,66 @@
+from random import Random
+
+from constants import EVENT_ENGINE, TRIP_PROBABILITY
+from engine import EventQueue, geometric_delay
+from simulation import EventDrivenSimulation, SimulationConfig, run_simulation
+
+
+class TestEventQueue:
+    """Test suite for the event queue."""
+
+    def test_events_are_ordered_by_time_then_by_schedule_order(self):
+        """Earlier events come first, simultaneous events keep their scheduling order."""
+        queue = EventQueue()
+        calls = []
+        queue.schedule(5, calls.append, 'late')
+        queue.schedule(1, calls.append, 'first')
+        queue.schedule(1, calls.append, 'second')
+        assert queue.peek_time() == 1
+
+        while queue:
+            _, callback, args = queue.pop()
+            callback(*args)
+        assert calls == ['first', 'second', 'late']
+
+    def test_geometric_delay_matches_per_tick_chance(self):
+        """The mean delay equals the expected waiting time of the 1 in 51 dice roll."""
+        rng = Random(7)
+        delays = [geometric_delay(TRIP_PROBABILITY, rng.random()) for _ in range(20000)]
+        assert min(delays) >= 1
+        assert 48 < sum(delays) / len(delays) < 54
+        assert geometric_delay(1, 0.5) == 1
+
+
+class TestEventDrivenSimulation:
+    """Test suite for the discrete-event simulation."""
+
+    def test_passengers_travel(self):
+        """Passengers start trips, ride the elevator and stay within the building."""
+        simulation = EventDrivenSimulation(SimulationConfig(ticks=2000, passenger_count=20, engine=EVENT_ENGINE))
+        start_floors = [passenger.current_floor for passenger in simulation.passengers]
+        result = simulation.run()
+        assert result.ticks == 2000
+        assert simulation.clock.now == 2000
+        assert start_floors != [passenger.current_floor for passenger in simulation.passengers]
+        for passenger in simulation.passengers:
+            assert 1 <= passenger.current_floor <= 10
+
+    def test_waiting_passengers_are_queued(self):
+        """Every waiting passenger has a pending call on their floor."""
+        simulation = EventDrivenSimulation(SimulationConfig(ticks=500, passenger_count=50))
+        simulation.run()
+        for (car, floor), waiting in simulation.bank.waiting.items():
+            if waiting:
+                assert floor in car.queue
+
+    def test_idle_elevator_is_not_scheduled(self):
+        """An elevator without work does not generate events."""
+        simulation = EventDrivenSimulation(SimulationConfig(ticks=10, passenger_count=0))
+        assert not simulation.events
+        simulation.run()
+        assert simulation.clock.now == 10
+
+    def test_run_simulation_selects_engine(self):
+        """The module-level runner honours the configured engine."""
+        result = run_simulation(SimulationConfig(ticks=100, engine=EVENT_ENGINE))
+        assert result.ticks == 100
@@ -0,0 +1,215 @@
+import bisect
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from typing import Iterable, Optional
+
+from call_queue import CallQueue
+from constants import UP_NAME, DOWN_NAME
+from elevator import Elevator
+from kinematics import Kinematics
+
+# Number of travel tables kept, one per distinct car configuration.
+TABLE_CACHE_SIZE = 64
+
+
+@dataclass(frozen=True)
+class TravelTable:
+    """
+    Times a car takes to cover every distance of its shaft and to serve a stop.
+
+    Attributes:
+        flights (tuple): Time of a run from standstill to standstill, indexed by its length in floors.
+        stop (float): Time of a stop with one passenger getting in or out.
+    """
+    flights: tuple
+    stop: float
+
+    def flight(self, start: int, end: int) -> float:
+        """Returns the time of a run from `start` to `end` without stopping."""
+        return self.flights[abs(end - start)]
+
+
+@lru_cache(maxsize=TABLE_CACHE_SIZE)
+def travel_table(floors: int, kinematics: Optional[Kinematics] = None) -> TravelTable:
+    """
+    Returns the travel table of a car serving `floors` floors, in seconds with `kinematics` and otherwise
+    in ticks of the tick model, where a car moves a floor per tick and boards on the tick it arrives.
+
+    Cars of the same configuration share the table, so it is computed once per shaft height and timing model.
+    """
+    if kinematics is None:
+        return TravelTable(tuple(range(floors)), 0)
+    return TravelTable(tuple(kinematics.flight_time(distance) for distance in range(floors)),
+                       kinematics.stop_time(1))
+
+
+class RouteQueue(CallQueue):
+    """
+    A call queue that keeps the cost of the route through its floors up to date as floors come and go.
+
+    Every queued floor holds the time of the run from the queued floor below it in a Fenwick tree over the
+    floors of the shaft, so adding or removing a floor updates two runs in O(log floors) and the time of any
+    stretch of the route, with its stops, is two prefix sums.
+
+    Attributes:
+        table (TravelTable): Travel times of the car owning the queue.
+        lower_floor (int): Lowest floor of the shaft.
+        sweep_time (float): Time of a sweep from the lowest to the highest queued floor stopping at every one.
+    """
+    __slots__ = ('table', 'lower_floor', 'sweep_time', '_runs')
+
+    def __init__(self, floors: Iterable[int] = (), *, table: TravelTable, lower_floor: int) -> None:
+        """Initializes the queue with the given floors and the travel table of its car."""
+        self.table = table
+        self.lower_floor = lower_floor
+        self.sweep_time = 0
+        self._runs = [0] * (len(table.flights) + 1)
+        super().__init__()
+        self.update(floors)
+
+    def add(self, floor: int) -> None:
+        if floor in self._members:
+            return
+        super().add(floor)
+        below, above = self._neighbours(floor)
+        flights = self.table.flights
+        run = flights[floor - below] if below is not None else 0
+        self._add_run(floor, run)
+        if above is not None:
+            bypassed = flights[above - below] if below is not None else 0
+            self._add_run(above, flights[above - floor] - bypassed)
+        self.sweep_time += self.table.stop
+
+    def discard(self, floor: int) -> None:
+        if floor not in self._members:
+            return
+        below, above = self._neighbours(floor)
+        super().discard(floor)
+        flights = self.table.flights
+        self._add_run(floor, -(flights[floor - below] if below is not None else 0))
+        if above is not None:
+            bypassed = flights[above - below] if below is not None else 0
+            self._add_run(above, bypassed - flights[above - floor])
+        self.sweep_time -= self.table.stop
+
+    def clear(self) -> None:
+        super().clear()
+        self._runs = [0] * len(self._runs)
+        self.sweep_time = 0
+
+    def leg(self, start: int, end: int, low: Optional[int] = None, high: Optional[int] = None) -> float:
+        """
+        Returns the time from `start` to `end` stopping at the queued floors strictly between `low` and `high`,
+        which default to the ends of the leg and must lie within them.
+        """
+        lower, upper = (start, end) if start <= end else (end, start)
+        floors = self._floors
+        first = bisect.bisect_right(floors, lower if low is None else low)
+        last = bisect.bisect_left(floors, upper if high is None else high) - 1
+        flights = self.table.flights
+        if first > last:
+            return flights[upper - lower]
+        lowest, highest = floors[first], floors[last]
+        return (flights[lowest - lower] + self._prefix(highest) - self._prefix(lowest) + flights[upper - highest]
+                + (last - first + 1) * self.table.stop)
+
+    def _neighbours(self, floor: int) -> tuple:
+        """Returns the queued floors just below and just above the queued `floor`, None where there is none."""
+        index = bisect.bisect_left(self._floors, floor)
+        below = self._floors[index - 1] if index else None
+        above = self._floors[index + 1] if index + 1 < len(self._floors) else None
+        return below, above
+
+    def _add_run(self, floor: int, delta: float) -> None:
+        """Adds `delta` to the run ending at `floor`, in the tree and in the sweep time."""
+        self.sweep_time += delta
+        index = floor - self.lower_floor + 1
+        while index < len(self._runs):
+            self._runs[index] += delta
+            index += index & -index
+
+    def _prefix(self, floor: int) -> float:
+        """Returns the total of the runs ending at or below `floor`."""
+        total = 0
+        index = floor - self.lower_floor + 1
+        while index:
+            total += self._runs[index]
+            index -= index & -index
+        return total
+
+    def __repr__(self) -> str:
+        return f"RouteQueue({self._floors})"
+
+
+class EtaService:
+    """
+    Estimates when the cars of a bank can reach a floor, from cached travel tables and the route costs their
+    queues keep as stops are added and removed.
+
+    A car is tracked on its first estimate: its queue factory becomes one of `RouteQueue`, which rebuilds the
+    queue with the same floors, and the elevator and its scheduler go on changing it as before. A car keeps
+    travelling in its direction while it has calls ahead and stops at every queued floor on the way, so a
+    floor behind a moving car is reached after the car has served its farthest call and the calls on the way
+    back.
+
+    Attributes:
+        kinematics (Kinematics or None): Timing model of the cars, None for the tick model.
+    """
+
+    def __init__(self, kinematics: Optional[Kinematics] = None) -> None:
+        """Initializes the service for cars timed by `kinematics`."""
+        self.kinematics = kinematics
+
+    def queue_factory(self, lower_floor: int, top_floor: int) -> partial:
+        """Returns the factory of the route queues of a car serving the floors from `lower_floor` to `top_floor`."""
+        table = travel_table(top_floor - lower_floor + 1, self.kinematics)
+        return partial(RouteQueue, table=table, lower_floor=lower_floor)
+
+    def track(self, car: Elevator) -> RouteQueue:
+        """Gives `car` a queue keeping its route cost, unless it has one already, and returns it."""
+        if car.queue.__class__ is not RouteQueue:
+            car.queue_factory = self.queue_factory(car.lower_floor, car.top_floor)
+        return car.queue
+
+    def estimate(self, car: Elevator, floor: int) -> float:
+        """Returns the time `car` needs to reach `floor`, serving the calls it meets on the way."""
+        return self._estimate(self.track(car), car.current_floor, car.direction, floor)
+
+    def remaining_time(self, car: Elevator) -> float:
+        """
+        Returns the time `car` needs to serve every floor of its queue. An idle car runs to the closer end of
+        its queue and sweeps it from there.
+        """
+        queue = self.track(car)
+        if not queue:
+            return 0
+        current, direction = car.current_floor, car.direction
+        if direction is None:
+            end = queue.lowest if current - queue.lowest <= queue.highest - current else queue.highest
+            return queue.table.flight(current, end) + queue.sweep_time
+        if direction == UP_NAME:
+            last = queue.lowest if queue.lowest < current else queue.highest
+        else:
+            last = queue.highest if queue.highest > current else queue.lowest
+        return self._estimate(queue, current, direction, last) + queue.table.stop
+
+    def _estimate(self, queue: RouteQueue, current: int, direction: Optional[str], floor: int) -> float:
+        """Returns the time a car on `current` heading in `direction` needs to reach `floor`."""
+        if direction == UP_NAME and queue:
+            if floor >= current:
+                return queue.leg(current, floor)
+            turn = max(queue.highest, current)
+            return (queue.leg(current, turn) + self._turn_stop(queue, current, turn)
+                    + queue.leg(turn, floor, floor, current))
+        if direction == DOWN_NAME and queue:
+            if floor <= current:
+                return queue.leg(current, floor)
+            turn = min(queue.lowest, current)
+            return (queue.leg(current, turn) + self._turn_stop(queue, current, turn)
+                    + queue.leg(turn, floor, current, floor))
+        return queue.table.flight(current, floor)
+
+    @staticmethod
+    def _turn_stop(queue: RouteQueue, current: int, turn: int) -> float:
+        """Returns the time of the stop where the car turns around, if it stops there on the way."""
+        return queue.table.stop if turn != current and turn in queue else 0
@@ -0,0 +1,113 @@
+import random
+
+from constants import UP_NAME, DOWN_NAME
+from dispatcher import ElevatorBank, TravelTimePolicy, create_bank
+from elevator import Elevator
+from eta import EtaService, RouteQueue, travel_table
+from events import NullSink
+from kinematics import Kinematics
+
+
+def sweep_estimate(table, floors, current, direction, floor):
+    """Walks the car from stop to stop along its sweep, the reference for the estimates."""
+    # A call on the floor of the car is served before it leaves.
+    queue, time, position = set(floors) - {current}, 0, current
+    if direction is None or not floors:
+        return table.flight(current, floor)
+    step = 1 if direction == UP_NAME else -1
+    for _ in range(2):
+        stops = [stop for stop in sorted(queue, reverse=step < 0) if (stop - position) * step > 0]
+        for stop in stops:
+            if (floor - position) * step >= 0 and (stop - floor) * step >= 0:
+                break
+            time += table.flight(position, stop) + table.stop
+            position = stop
+            queue.discard(stop)
+        if (floor - position) * step >= 0:
+            return time + table.flight(position, floor)
+        step = -step
+    return time + table.flight(position, floor)
+
+
+class TestEtaService:
+    """Test suite for the travel tables and the route costs of the cars."""
+
+    def test_travel_tables_are_shared(self):
+        """Cars of the same configuration get the same table, the tick model counts floors."""
+        assert travel_table(30, Kinematics()) is travel_table(30, Kinematics())
+        assert travel_table(30, Kinematics(max_speed=4.0)) is not travel_table(30, Kinematics())
+        ticks = travel_table(10)
+        assert ticks.flight(9, 2) == 7 and ticks.stop == 0
+
+    def test_route_cost_follows_the_queue(self):
+        """The sweep time is kept up to date as floors are added and removed in any order."""
+        table = travel_table(40, Kinematics())
+        queue = RouteQueue(table=table, lower_floor=-3)
+        rng = random.Random(7)
+        for _ in range(500):
+            floor = rng.randint(-3, 36)
+            if floor in queue:
+                queue.discard(floor)
+            else:
+                queue.add(floor)
+            floors = list(queue)
+            expected = sum(table.flight(a, b) for a, b in zip(floors, floors[1:])) + len(floors) * table.stop
+            assert abs(queue.sweep_time - expected) < 1e-9
+        queue.clear()
+        assert queue.sweep_time == 0 and queue.leg(-3, 36) == table.flight(-3, 36)
+
+    def test_estimates_match_a_walk_of_the_sweep(self):
+        """The estimate equals the time of riding the sweep and stopping at every queued floor on the way."""
+        service = EtaService(Kinematics())
+        car = Elevator(lower_floor=1, top_floor=30, sink=NullSink())
+        rng = random.Random(3)
+        for _ in range(300):
+            car.current_floor = rng.randint(1, 30)
+            car.direction = rng.choice((UP_NAME, DOWN_NAME, None))
+            car.queue = rng.sample(range(1, 31), rng.randint(0, 6))
+            table = service.track(car).table
+            for floor in range(1, 31):
+                expected = sweep_estimate(table, car.queue, car.current_floor, car.direction, floor)
+                assert abs(service.estimate(car, floor) - expected) < 1e-9
+
+    def test_tracked_queue_stays_in_use(self):
+        """Tracking keeps the floors and calls of the car, and the car goes on updating the tracked queue."""
+        service = EtaService()
+        car = Elevator(top_floor=20, sink=NullSink())
+        car.add_floor_to_queue(12)
+        queue = service.track(car)
+        assert isinstance(queue, RouteQueue) and list(queue) == [12] and 12 in car.car_calls
+        car.add_floor_to_queue(5)
+        assert car.queue is queue and queue.sweep_time == 7
+        assert service.remaining_time(car) == 4 + 7
+        car.direction = UP_NAME
+        assert service.remaining_time(car) == 11
+        # Replacing the floors keeps the route queue, and a car can be built with one.
+        car.queue = [3, 9]
+        assert isinstance(car.queue, RouteQueue) and car.queue.sweep_time == 6
+        built = Elevator(top_floor=20, sink=NullSink(), queue_factory=service.queue_factory(1, 20))
+        built.add_floor_to_queue(2, 6)
+        assert service.track(built) is built.queue and built.queue.sweep_time == 4
+
+    def test_travel_time_policy_prefers_the_express_car(self):
+        """A car with stops on the way loses to a farther car running express."""
+        bank = create_bank(2, 'travel-time', top_floor=30, sink=NullSink(), kinematics=Kinematics())
+        busy, express = bank.elevators
+        busy.direction = UP_NAME
+        busy.add_floor_to_queue(3, 5, 7, 9)
+        express.current_floor = 18
+        assert isinstance(bank.policy, TravelTimePolicy)
+        assert bank.hall_call(11) is express
+        ticks = ElevatorBank([Elevator(top_floor=30, sink=NullSink()) for _ in range(2)], TravelTimePolicy())
+        ticks.elevators[1].current_floor = 18
+        assert ticks.hall_call(11) is ticks.elevators[1]
+
+    def test_travel_time_ties_go_to_the_car_with_less_work(self):
+        """Of two cars reaching the floor at the same time, the one that frees up sooner gets the call."""
+        bank = create_bank(2, 'travel-time', top_floor=30, sink=NullSink())
+        far, near = bank.elevators
+        for car, stop in ((far, 28), (near, 12)):
+            car.current_floor = 5
+            car.direction = UP_NAME
+            car.add_floor_to_queue(stop)
+        assert bank.hall_call(9) is near
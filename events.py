@@ -0,0 +1,231 @@
+import sys
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, ClassVar, Optional, TextIO
+
+DEFAULT_BUFFER_SIZE = 256
+
+
+class EventLevel(IntEnum):
+    """Severity of a simulation event. A sink receives only events at or above its level."""
+    DEBUG = 10
+    INFO = 20
+    WARNING = 30
+    OFF = 100
+
+
+@dataclass(frozen=True, slots=True)
+class DoorsOpened:
+    """The elevator doors were opened."""
+    level: ClassVar[EventLevel] = EventLevel.DEBUG
+    elevator: Any
+
+    def message(self) -> str:
+        return "The door is open."
+
+
+@dataclass(frozen=True, slots=True)
+class DoorsClosed:
+    """The elevator doors were closed."""
+    level: ClassVar[EventLevel] = EventLevel.DEBUG
+    elevator: Any
+
+    def message(self) -> str:
+        return "The door is closed."
+
+
+@dataclass(frozen=True, slots=True)
+class Arrived:
+    """The elevator reached a floor."""
+    level: ClassVar[EventLevel] = EventLevel.INFO
+    elevator: Any
+    floor: int
+
+    def message(self) -> str:
+        return f"The elevator arrived on the {self.floor} floor."
+
+
+@dataclass(frozen=True, slots=True)
+class Boarded:
+    """A passenger stepped into the elevator."""
+    level: ClassVar[EventLevel] = EventLevel.INFO
+    elevator: Any
+    passenger: Any
+
+    def message(self) -> str:
+        return f"{self.passenger} stepped into the elevator as if it were his home."
+
+
+@dataclass(frozen=True, slots=True)
+class Alighted:
+    """A passenger left the elevator on the target floor."""
+    level: ClassVar[EventLevel] = EventLevel.INFO
+    elevator: Any
+    passenger: Any
+    floor: int
+
+    def message(self) -> str:
+        return f"{self.passenger} leaves the elevator with his head held high with pride"
+
+
+@dataclass(frozen=True, slots=True)
+class Transferred:
+    """A passenger left the elevator on the floor where they change cars on the way to the target floor."""
+    level: ClassVar[EventLevel] = EventLevel.INFO
+    elevator: Any
+    passenger: Any
+    floor: int
+
+    def message(self) -> str:
+        return f"{self.passenger} steps out on the {self.floor} floor to change elevators."
+
+
+@dataclass(frozen=True, slots=True)
+class Ejected:
+    """A passenger was pushed out of an overloaded elevator."""
+    level: ClassVar[EventLevel] = EventLevel.WARNING
+    elevator: Any
+    passenger: Any
+    floor: int
+
+    def message(self) -> str:
+        return f"In an unequal fight, passenger {self.passenger} leaves the elevator."
+
+
+@dataclass(frozen=True, slots=True)
+class Refused:
+    """A passenger was turned away at the door of a full elevator."""
+    level: ClassVar[EventLevel] = EventLevel.INFO
+    elevator: Any
+    passenger: Any
+    floor: int
+
+    def message(self) -> str:
+        return f"{self.passenger} looks at the crowded elevator and waits for the next one."
+
+
+@dataclass(frozen=True, slots=True)
+class Called:
+    """A passenger called the elevator to a floor."""
+    level: ClassVar[EventLevel] = EventLevel.INFO
+    elevator: Any
+    passenger: Any
+    floor: int
+
+    def message(self) -> str:
+        return f"{self.passenger} called the elevator while on the {self.floor} floor."
+
+
+@dataclass(frozen=True, slots=True)
+class FloorSelected:
+    """A passenger inside the elevator pressed a floor button."""
+    level: ClassVar[EventLevel] = EventLevel.INFO
+    elevator: Any
+    passenger: Any
+    floor: int
+
+    def message(self) -> str:
+        return f"{self.passenger} nervously presses the {self.floor}th floor button."
+
+
+class EventSink:
+    """
+    Receives simulation events.
+
+    Emitters compare the event level with `level` before building an event, so a sink
+    never pays for events it would discard.
+
+    Attributes:
+        level (EventLevel): The lowest level of events the sink accepts.
+    """
+    level = EventLevel.DEBUG
+
+    def emit(self, event) -> None:
+        """Handles a single event."""
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        """Writes out any buffered events."""
+
+
+class NullSink(EventSink):
+    """Discards every event. Emitters skip building events altogether."""
+    level = EventLevel.OFF
+
+    def emit(self, event) -> None:
+        pass
+
+
+class BufferedTextSink(EventSink):
+    """
+    Renders events as the human-readable messages and writes them to a text stream.
+
+    Events are kept as records and formatted only when the buffer is flushed.
+
+    Attributes:
+        stream (TextIO or None): Destination stream, standard output when None.
+        buffer_size (int): Number of events kept before the buffer is flushed automatically.
+        level (EventLevel): The lowest level of events the sink accepts.
+    """
+
+    def __init__(self,
+                 stream: Optional[TextIO] = None,
+                 buffer_size: int = DEFAULT_BUFFER_SIZE,
+                 level: EventLevel = EventLevel.DEBUG) -> None:
+        """Initializes an empty buffer."""
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self.level = level
+        self._buffer = []
+
+    def emit(self, event) -> None:
+        """Buffers the event and flushes the buffer once it is full."""
+        self._buffer.append(event)
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Formats the buffered events and writes them to the stream."""
+        if not self._buffer:
+            return
+        stream = self.stream or sys.stdout
+        stream.write(''.join(f"{event.message()}\n" for event in self._buffer))
+        self._buffer.clear()
+
+
+class LevelFilter(EventSink):
+    """Passes to the wrapped sink only events at or above the given level."""
+
+    def __init__(self, sink: EventSink, level: EventLevel) -> None:
+        """Wraps `sink`, raising its threshold to `level`."""
+        self.sink = sink
+        self.level = max(level, sink.level)
+
+    def emit(self, event) -> None:
+        self.sink.emit(event)
+
+    def flush(self) -> None:
+        self.sink.flush()
+
+
+class FanOutSink(EventSink):
+    """Passes the events to several sinks, each receiving only the events at or above its own level."""
+
+    def __init__(self, *sinks: EventSink) -> None:
+        """Wraps `sinks`, accepting every event one of them accepts."""
+        self.sinks = sinks
+        self.level = min((sink.level for sink in sinks), default=EventLevel.OFF)
+
+    def emit(self, event) -> None:
+        for sink in self.sinks:
+            if event.level >= sink.level:
+                sink.emit(event)
+
+    def flush(self) -> None:
+        for sink in self.sinks:
+            sink.flush()
+
+
+def console_sink() -> EventSink:
+    """Returns an unbuffered sink printing every event to standard output, as the simulator always did."""
+    return BufferedTextSink(buffer_size=1)
@@ -0,0 +1,77 @@
+import io
+
+from elevator import Elevator, Passenger
+from events import Alighted, Arrived, BufferedTextSink, EventLevel, EventSink, LevelFilter, NullSink
+from utils import set_elevator_for_passengers
+
+
+class RecordingSink(EventSink):
+    """Keeps every received event in a list."""
+
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event):
+        self.events.append(event)
+
+
+class TestEventSinks:
+    """Test suite for the event sinks."""
+
+    def test_text_sink_reproduces_messages(self):
+        """The text sink renders the classic simulator messages."""
+        stream = io.StringIO()
+        elevator = Elevator(sink=BufferedTextSink(stream))
+        passenger = Passenger(name="John", current_floor=1, target_floor=2)
+        set_elevator_for_passengers([passenger], elevator)
+        elevator.open_doors()
+        passenger.enter_the_elevator()
+        passenger.select_floor()
+        elevator.move()
+        elevator.sink.flush()
+        assert stream.getvalue().splitlines() == [
+            "The door is open.",
+            "John stepped into the elevator as if it were his home.",
+            "John nervously presses the 2th floor button.",
+            "The door is closed.",
+            "The elevator arrived on the 2 floor.",
+            "The door is open.",
+            "John leaves the elevator with his head held high with pride",
+        ]
+
+    def test_text_sink_buffers_until_full(self):
+        """Nothing is written before the buffer fills up or is flushed."""
+        stream = io.StringIO()
+        sink = BufferedTextSink(stream, buffer_size=3)
+        elevator = Elevator(sink=sink)
+        elevator.open_doors()
+        elevator.close_doors()
+        assert stream.getvalue() == ""
+
+        elevator.open_doors()
+        assert len(stream.getvalue().splitlines()) == 3
+
+    def test_null_sink_receives_nothing(self):
+        """Events below the sink level are never built."""
+        sink = NullSink()
+        sink.emit = None
+        elevator = Elevator(sink=sink)
+        elevator.add_floor_to_queue(3)
+        for _ in range(3):
+            elevator.move()
+        assert elevator.current_floor == 3
+
+    def test_level_filter(self):
+        """The level filter drops events below its threshold."""
+        recorder = RecordingSink()
+        elevator = Elevator(sink=LevelFilter(recorder, EventLevel.INFO))
+        passenger = Passenger(current_floor=1, target_floor=2)
+        set_elevator_for_passengers([passenger], elevator)
+        elevator.open_doors()
+        passenger.enter_the_elevator()
+        passenger.select_floor()
+        elevator.move()
+        kinds = [type(event) for event in recorder.events]
+        assert Arrived in kinds
+        assert Alighted in kinds
+        assert all(event.level >= EventLevel.INFO for event in recorder.events)
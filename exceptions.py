@@ -14,3 +14,32 @@ class ElevatorOverloadedError(Exception):
         message = (f"The elevator was overloaded. Expected capacity {capacity}, "
                    f"actual number of passengers {passenger_count}.")
         super().__init__(message)
+
+
+class InvalidTraceError(Exception):
+    def __init__(self, path, reason):
+        self.path = path
+        self.reason = reason
+        message = f"Cannot read the trace {path}: {reason}."
+        super().__init__(message)
+
+
+class InvalidSnapshotError(Exception):
+    def __init__(self, reason):
+        self.reason = reason
+        message = f"Cannot restore the snapshot: {reason}."
+        super().__init__(message)
+
+
+class ControllerFailedError(Exception):
+    def __init__(self, cause):
+        self.cause = cause
+        message = f"The controller stopped serving calls after a failure: {cause!r}."
+        super().__init__(message)
+
+
+class FloorNotServedError(Exception):
+    def __init__(self, chosen_floor):
+        self.chosen_floor = chosen_floor
+        message = f"The car does not stop at the chosen floor {chosen_floor}."
+        super().__init__(message)
@@ -20,6 +20,7 @@ class ElevatorInterface(ABC):
         passengers (set): A set of passengers currently in the elevator.
         directions (dict): Dictionary mapping directions to methods.
     """
+    __slots__ = ()
 
     @abstractmethod
     def add_floor_to_queue(self, floor: int) -> None:
@@ -47,6 +48,8 @@ class ElevatorInterface(ABC):
 
 
 class PassengerInterface(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def __init__(self, current_floor: int, target_floor: int):
         """
@@ -0,0 +1,86 @@
+from constants import KINEMATIC_ENGINE
+from elevator import Passenger
+from events import Alighted, Boarded, EventLevel, EventSink
+from kinematics import Kinematics
+from simulation import KinematicSimulation, SimulationConfig, run_simulation
+
+
+class TimedSink(EventSink):
+    """Records the simulation time of every received event."""
+
+    level = EventLevel.DEBUG
+
+    def __init__(self):
+        self.simulation = None
+        self.events = []
+
+    def emit(self, event):
+        self.events.append((self.simulation.clock.now, event))
+
+
+class TestKinematics:
+    """Test suite for the kinematic timing model and the engine driven by it."""
+
+    def test_travel_time_profiles(self):
+        """Long runs cruise at the rated speed, short ones follow the acceleration-limited profiles."""
+        kinematics = Kinematics(max_speed=2.0, acceleration=1.0, jerk=1.0, floor_height=4.0)
+        # Cruising: distance / speed plus the time lost accelerating and braking.
+        assert abs(kinematics.travel_time(100) - (50 + 2 + 1)) < 1e-9
+        # Too short for the rated acceleration: four phases of pure jerk.
+        assert abs(kinematics.travel_time(0.25) - 2.0) < 1e-9
+        assert kinematics.travel_time(0) == 0
+        assert kinematics.flight_time(-3) == kinematics.travel_time(12)
+
+    def test_travel_time_is_continuous_and_increasing(self):
+        """The travel time grows smoothly across the boundaries between the profiles."""
+        kinematics = Kinematics()
+        times = [kinematics.travel_time(step / 100) for step in range(50, 10000)]
+        assert all(later > earlier for earlier, later in zip(times, times[1:]))
+        assert max(later - earlier for earlier, later in zip(times, times[1:])) < 0.05
+
+    def test_round_trip_time(self):
+        """A fuller car makes more stops, so the round trip takes longer and carries more passengers."""
+        kinematics = Kinematics()
+        assert kinematics.round_trip_time(12, 4) < kinematics.round_trip_time(12, 10)
+        assert kinematics.handling_capacity(12, 4) < kinematics.handling_capacity(12, 10)
+        assert kinematics.handling_capacity(12, 10, cars=3) == 3 * kinematics.handling_capacity(12, 10)
+
+    def test_trip_timing(self):
+        """A trip takes the runs, the door times and the boarding time of the passenger."""
+        kinematics = Kinematics()
+        sink = TimedSink()
+        simulation = KinematicSimulation(SimulationConfig(passenger_count=0, ticks=1, kinematics=kinematics), sink)
+        sink.simulation = simulation
+        passenger = Passenger(current_floor=4, target_floor=1)
+        passenger.set_bank(simulation.bank)
+        passenger._is_resting = False
+        passenger.call_elevator()
+        simulation.wake_car(passenger._elevator)
+        simulation.run()
+
+        boarded = next(time for time, event in sink.events if isinstance(event, Boarded))
+        alighted = next(time for time, event in sink.events if isinstance(event, Alighted))
+        assert abs(boarded - (kinematics.flight_time(3) + kinematics.door_open_time)) < 1e-9
+        assert abs(alighted - boarded - (kinematics.boarding_time + kinematics.door_close_time
+                                         + kinematics.flight_time(3) + kinematics.door_open_time)) < 1e-9
+        assert passenger.current_floor == 1
+
+    def test_express_runs(self):
+        """A car passes the floors between two stops in a single event."""
+        sink = TimedSink()
+        simulation = KinematicSimulation(SimulationConfig(passenger_count=0, ticks=1, top_floor=30), sink)
+        sink.simulation = simulation
+        car = simulation.elevator
+        car.add_floor_to_queue(25)
+        simulation.wake_car(car)
+        simulation.run()
+        assert [event.floor for _, event in sink.events if hasattr(event, 'floor')] == [25]
+        assert car.current_floor == 25 and not car.queue
+
+    def test_kinematic_engine_runs(self):
+        """The kinematic engine is selected by name and runs for `ticks` trip periods."""
+        config = SimulationConfig(ticks=100, passenger_count=200, cars=2, top_floor=15, seed=3,
+                                  engine=KINEMATIC_ENGINE)
+        result = run_simulation(config)
+        assert result.ticks == 100
+        assert result.trips > 200
@@ -0,0 +1,171 @@
+import sys
+from collections import deque
+from time import perf_counter
+from typing import Optional, TextIO
+
+from constants import UP_NAME, DOWN_NAME
+from events import Boarded, Called, EventLevel, EventSink
+
+DEFAULT_FRAME_RATE = 10.0
+# Number of recent boardings the wait times of the status line are taken over.
+DEFAULT_WAIT_WINDOW = 100
+# Unchanged characters between two changes below which one write is cheaper than moving the cursor.
+CURSOR_MOVE_COST = 8
+
+CLEAR_SCREEN = '\x1b[2J\x1b[H'
+HIDE_CURSOR = '\x1b[?25l'
+SHOW_CURSOR = '\x1b[?25h'
+ARROWS = {UP_NAME: '^', DOWN_NAME: 'v'}
+
+
+def move_cursor(row: int, column: int) -> str:
+    """Returns the escape sequence moving the cursor to `row` and `column`, counted from zero."""
+    return f'\x1b[{row + 1};{column + 1}H'
+
+
+class Screen:
+    """
+    The last frame written to a terminal, turning the next frame into the writes of its changed cells.
+
+    Attributes:
+        lines (list): The lines on the screen, None before the first frame.
+    """
+
+    def __init__(self) -> None:
+        """Initializes a screen with nothing drawn on it."""
+        self.lines = None
+
+    def diff(self, lines: list) -> str:
+        """
+        Returns the output turning the screen into `lines`: the whole frame the first time, then a cursor
+        move and the new characters for every run of changed cells.
+        """
+        previous = self.lines
+        self.lines = lines
+        if previous is None:
+            return CLEAR_SCREEN + '\n'.join(lines)
+        output = []
+        for row, line in enumerate(lines):
+            old = previous[row] if row < len(previous) else ''
+            if line == old:
+                continue
+            # Cells beyond the end of the new line are blanked.
+            line = line.ljust(len(old))
+            old = old.ljust(len(line))
+            start = None
+            unchanged = 0
+            for column, (new, was) in enumerate(zip(line, old)):
+                if new != was:
+                    if start is None:
+                        start = column
+                    unchanged = 0
+                elif start is not None:
+                    unchanged += 1
+                    if unchanged >= CURSOR_MOVE_COST:
+                        end = column - unchanged + 1
+                        output.append(move_cursor(row, start) + line[start:end])
+                        start = None
+            if start is not None:
+                end = len(line) - unchanged
+                output.append(move_cursor(row, start) + line[start:end])
+        for row in range(len(lines), len(previous)):
+            output.append(move_cursor(row, 0) + '\x1b[2K')
+        return ''.join(output)
+
+
+class LiveView(EventSink):
+    """
+    Live terminal view of a running simulation: a shaft diagram of the cars over the floors and a status
+    line with the wait times of the recent boardings.
+
+    Every floor is a row, from the top floor down, showing the passengers waiting on the landing and a
+    column per car. A car shows its riders and its direction, in brackets with the doors closed and in
+    angle brackets with the doors open; the stops of a car are marked with a star in its shaft, and the
+    floors a car does not serve are blank. Frames are drawn at most `frame_rate` times per second of wall
+    clock time, however fast the simulation runs, and only the cells that changed are written.
+
+    Attributes:
+        simulation (Simulation): The simulation shown.
+        stream (TextIO): The terminal written to.
+        frame_rate (float): Maximum number of frames per second.
+        screen (Screen): The last frame drawn.
+        waits (deque): Seconds the passengers of the recent boardings waited for a car.
+        called (dict): Time of the first call of the passengers waiting for a car.
+        frames (int): Number of frames drawn.
+    """
+    level = EventLevel.INFO
+
+    def __init__(self, simulation, stream: Optional[TextIO] = None, frame_rate: float = DEFAULT_FRAME_RATE,
+                 window: int = DEFAULT_WAIT_WINDOW) -> None:
+        """Initializes the view of `simulation`, drawing on `stream`, the standard output by default."""
+        self.simulation = simulation
+        self.stream = stream or sys.stdout
+        self.frame_rate = frame_rate
+        self.screen = Screen()
+        self.waits = deque(maxlen=window)
+        self.called = {}
+        self.frames = 0
+        self._next_frame = 0.0
+
+    def emit(self, event) -> None:
+        if isinstance(event, Called):
+            self.called.setdefault(event.passenger, self.simulation.clock.now)
+        elif isinstance(event, Boarded):
+            now = self.simulation.clock.now
+            called = self.called.pop(event.passenger, now)
+            self.waits.append((now - called) * self.simulation.clock_unit)
+
+    def refresh(self, force: bool = False) -> bool:
+        """Draws a frame unless the last one is too recent, or `force`. Returns whether a frame was drawn."""
+        now = perf_counter()
+        if not force and now < self._next_frame:
+            return False
+        self._next_frame = now + 1 / self.frame_rate
+        cursor = HIDE_CURSOR if self.screen.lines is None else ''
+        self.stream.write(cursor + self.screen.diff(self.render()))
+        self.stream.flush()
+        self.frames += 1
+        return True
+
+    def close(self) -> None:
+        """Draws the final frame and leaves the cursor below it, the next frame starts on a clear screen."""
+        self.refresh(force=True)
+        self.stream.write(move_cursor(len(self.screen.lines), 0) + SHOW_CURSOR)
+        self.stream.flush()
+        self.screen = Screen()
+
+    def render(self) -> list:
+        """Returns the lines of the current frame."""
+        simulation = self.simulation
+        bank = simulation.bank
+        waiting = {}
+        for (_, floor), passengers in bank.waiting.items():
+            waiting[floor] = waiting.get(floor, 0) + len(passengers)
+        lines = [self.status(sum(waiting.values()))]
+        for floor in range(bank.top_floor, bank.lower_floor - 1, -1):
+            landing = waiting.get(floor)
+            cells = ''.join(self.cell(car, floor) for car in bank.elevators)
+            lines.append(f"{floor:>4} {landing or '':>3} {cells}")
+        return lines
+
+    def status(self, waiting: int) -> str:
+        """Returns the status line: time, trips, waiting passengers and the recent wait times."""
+        simulation = self.simulation
+        trips = sum(car.trips for car in simulation.bank.elevators)
+        line = f"t={simulation.clock.now * simulation.clock_unit:.0f}s trips={trips} waiting={waiting}"
+        if self.waits:
+            waits = sorted(self.waits)
+            mean = sum(waits) / len(waits)
+            p95 = waits[min(len(waits) - 1, int(0.95 * len(waits)))]
+            line += f" wait mean={mean:.0f}s p95={p95:.0f}s max={waits[-1]:.0f}s (last {len(waits)})"
+        return line
+
+    @staticmethod
+    def cell(car, floor: int) -> str:
+        """Returns the five characters of `car` on the row of `floor`."""
+        if car.current_floor == floor:
+            riders = f"{min(len(car.passengers), 99):>2}{ARROWS.get(car.direction, ' ')}"
+            return f"<{riders}>" if car.doors_open else f"[{riders}]"
+        if not car.serves(floor):
+            return '     '
+        return '  *  ' if floor in car.queue else '  |  '
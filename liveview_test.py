@@ -0,0 +1,48 @@
+import io
+
+from liveview import CLEAR_SCREEN, LiveView, Screen, move_cursor
+from simulation import SIMULATIONS, SimulationConfig
+
+
+class TestLiveView:
+    """Test suite for the live terminal view."""
+
+    def test_screen_writes_only_the_changed_cells(self):
+        """The first frame is drawn whole, later frames write the runs of changed cells and blank the rest."""
+        screen = Screen()
+        assert screen.diff(['abc', 'def']) == CLEAR_SCREEN + 'abc\ndef'
+        assert screen.diff(['abc', 'dXf']) == move_cursor(1, 1) + 'X'
+        assert screen.diff(['abc', 'dXf']) == ''
+        assert screen.diff(['Zbc', 'd']) == move_cursor(0, 0) + 'Z' + move_cursor(1, 1) + '  '
+        # Changes close together are written at once, far apart ones with a cursor move each.
+        screen.diff(['.' * 30])
+        assert screen.diff(['x.x' + '.' * 24 + 'x..']) == move_cursor(0, 0) + 'x.x' + move_cursor(0, 27) + 'x'
+
+    def test_shaft_diagram(self):
+        """Every floor shows its waiting passengers, the cars, their stops and their doors."""
+        config = SimulationConfig(cars=2, top_floor=4, passenger_count=0, naming='id', live=True)
+        simulation = SIMULATIONS['tick'](config)
+        first, second = simulation.bank.elevators
+        second.current_floor = 3
+        second.doors_open = True
+        first.add_floor_to_queue(4)
+        simulation.bank.waiting[(first, 2)] = ['someone', 'else']
+        view = LiveView(simulation, io.StringIO())
+        assert view.render() == ['t=0s trips=0 waiting=2',
+                                 '   4       *    |  ',
+                                 '   3       |  < 0 >',
+                                 '   2   2   |    |  ',
+                                 '   1     [ 0 ]  |  ']
+
+    def test_frames_are_throttled(self):
+        """However many ticks run, frames are drawn at the frame rate, and the run ends with a last frame."""
+        stream = io.StringIO()
+        config = SimulationConfig(ticks=2000, cars=3, top_floor=12, passenger_count=50, naming='id', seed=1,
+                                  engine='event', live=True, frame_rate=0.001)
+        simulation = SIMULATIONS['event'](config)
+        simulation.view.stream = stream
+        result = simulation.run()
+        output = stream.getvalue()
+        assert simulation.view.frames == 2 and output.count(CLEAR_SCREEN) == 1
+        assert f"trips={result.trips} " in output
+        assert len(simulation.view.waits) == 100
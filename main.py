@@ -1,4 +1,150 @@
-from elevator import run_simulation
+import argparse
+
+from dispatcher import POLICIES
+from events import EventLevel
+from kinematics import Kinematics
+from naming import NAMINGS
+from parking import PARKING_POLICIES
+from scheduling import SCHEDULERS
+from simulation import SIMULATIONS, SimulationConfig
+from snapshot import load_snapshot, save_snapshot
+from traffic import TRAFFIC_PROFILES
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """Creates the parser of the command line arguments."""
+    defaults = SimulationConfig()
+    parser = argparse.ArgumentParser(description="Runs the elevator simulation.")
+    parser.add_argument('--ticks', type=int, default=defaults.ticks, help="number of ticks to simulate")
+    parser.add_argument('--passengers', type=int, default=defaults.passenger_count, help="number of passengers")
+    parser.add_argument('--capacity', type=int, default=defaults.capacity, help="elevator capacity")
+    parser.add_argument('--max-load', type=float, help="maximum weight of the passengers of a car in kg")
+    parser.add_argument('--admission', action='store_true',
+                        help="turn passengers away at the door of a full car instead of pushing the overload out")
+    parser.add_argument('--lower-floor', type=int, default=defaults.lower_floor, help="lowest floor")
+    parser.add_argument('--top-floor', type=int, default=defaults.top_floor, help="highest floor")
+    parser.add_argument('--cars', type=int, default=defaults.cars, help="number of cars in the elevator bank")
+    parser.add_argument('--zones', type=int, default=defaults.zones,
+                        help="number of low- to high-rise zones, each served by its own cars")
+    parser.add_argument('--sky-lobbies', type=int, nargs='+', default=list(defaults.sky_lobbies), metavar='FLOOR',
+                        help="floors splitting the building into sections reached by shuttles")
+    parser.add_argument('--shuttles', type=int, default=defaults.shuttles,
+                        help="number of cars linking the lobby with the sky lobbies")
+    parser.add_argument('--parking', choices=list(PARKING_POLICIES), default=defaults.parking,
+                        help="where the idle cars wait for their next call")
+    parser.add_argument('--dispatch', choices=list(POLICIES), default=defaults.dispatch,
+                        help="policy assigning hall calls to cars")
+    parser.add_argument('--scheduler', choices=list(SCHEDULERS), default=defaults.scheduler,
+                        help="scheduler deciding where each car goes and stops")
+    parser.add_argument('--realtime', action='store_true', help="pace every tick against the wall clock")
+    parser.add_argument('--tick-duration', type=float, default=defaults.tick_duration,
+                        help="wall-clock seconds per tick in real-time mode")
+    parser.add_argument('--show-state', action='store_true', help="print the elevator state after every tick")
+    parser.add_argument('--live', action='store_true',
+                        help="draw the cars and the recent wait times in the terminal as the run goes")
+    parser.add_argument('--frame-rate', type=float, default=defaults.frame_rate,
+                        help="maximum frames per second of the live view")
+    parser.add_argument('--log-level', choices=[level.name.lower() for level in EventLevel],
+                        default=defaults.log_level.name.lower(), help="lowest level of printed events")
+    parser.add_argument('--naming', choices=list(NAMINGS), default=defaults.naming,
+                        help="how passenger names are generated")
+    parser.add_argument('--columnar', action='store_true', help="store the passengers in columnar arrays")
+    parser.add_argument('--seed', type=int, default=defaults.seed, help="seed making the run reproducible")
+    parser.add_argument('--engine', choices=list(SIMULATIONS), default=defaults.engine,
+                        help="tick-by-tick polling, discrete-event scheduling or continuous-time car kinematics")
+    parser.add_argument('--metrics', action='store_true',
+                        help="report wait and journey time percentiles and car usage after the run")
+    parser.add_argument('--profile', action='store_true', help="report the time spent in every phase of the run")
+    parser.add_argument('--trace', metavar='PATH', help="write every event to a binary trace file")
+    parser.add_argument('--traffic', metavar='PROFILE',
+                        help=f"arrivals replacing the resident passengers: {', '.join(TRAFFIC_PROFILES)} "
+                             f"or a CSV file of recorded arrivals")
+    parser.add_argument('--traffic-rate', type=float, default=defaults.traffic_rate,
+                        help="arrivals per minute of a traffic profile")
+    kinematics = parser.add_argument_group("kinematic engine")
+    kinematics.add_argument('--max-speed', type=float, default=defaults.kinematics.max_speed,
+                            help="rated car speed in m/s")
+    kinematics.add_argument('--acceleration', type=float, default=defaults.kinematics.acceleration,
+                            help="rated acceleration in m/s²")
+    kinematics.add_argument('--jerk', type=float, default=defaults.kinematics.jerk, help="jerk in m/s³")
+    kinematics.add_argument('--floor-height', type=float, default=defaults.kinematics.floor_height,
+                            help="distance between floors in m")
+    kinematics.add_argument('--door-open-time', type=float, default=defaults.kinematics.door_open_time,
+                            help="seconds the doors take to open")
+    kinematics.add_argument('--door-close-time', type=float, default=defaults.kinematics.door_close_time,
+                            help="seconds the doors take to close")
+    kinematics.add_argument('--boarding-time', type=float, default=defaults.kinematics.boarding_time,
+                            help="seconds a passenger takes to get in or out")
+    snapshots = parser.add_argument_group("snapshots")
+    snapshots.add_argument('--save-snapshot', metavar='PATH', help="save the state of the simulation after the run")
+    snapshots.add_argument('--resume', metavar='PATH',
+                           help="continue the simulation saved in a snapshot for --ticks more ticks, with a new "
+                                "--seed when given; the other options are those of the saved run")
+    return parser
+
+
+def config_from_args(args: argparse.Namespace) -> SimulationConfig:
+    """Builds the simulation config from the parsed command line arguments."""
+    return SimulationConfig(
+        ticks=args.ticks,
+        passenger_count=args.passengers,
+        capacity=args.capacity,
+        max_load=args.max_load,
+        admission=args.admission,
+        lower_floor=args.lower_floor,
+        top_floor=args.top_floor,
+        cars=args.cars,
+        zones=args.zones,
+        sky_lobbies=tuple(args.sky_lobbies),
+        shuttles=args.shuttles,
+        parking=args.parking,
+        dispatch=args.dispatch,
+        scheduler=args.scheduler,
+        realtime=args.realtime,
+        tick_duration=args.tick_duration,
+        show_state=args.show_state,
+        live=args.live,
+        frame_rate=args.frame_rate,
+        log_level=EventLevel[args.log_level.upper()],
+        naming=args.naming,
+        columnar=args.columnar,
+        seed=args.seed,
+        engine=args.engine,
+        metrics=args.metrics,
+        trace=args.trace,
+        profile=args.profile,
+        traffic=args.traffic,
+        traffic_rate=args.traffic_rate,
+        kinematics=Kinematics(
+            max_speed=args.max_speed,
+            acceleration=args.acceleration,
+            jerk=args.jerk,
+            floor_height=args.floor_height,
+            door_open_time=args.door_open_time,
+            door_close_time=args.door_close_time,
+            boarding_time=args.boarding_time,
+        ),
+    )
+
+
+def main(argv=None) -> None:
+    """Runs the simulation described by the command line and prints its summary."""
+    args = create_parser().parse_args(argv)
+    if args.resume:
+        simulation = load_snapshot(args.resume, seed=args.seed)
+        result = simulation.run(args.ticks)
+    else:
+        simulation = SIMULATIONS[args.engine](config_from_args(args))
+        result = simulation.run()
+    if args.save_snapshot:
+        save_snapshot(simulation, args.save_snapshot)
+    print(f"Simulated {result.ticks} ticks in {result.elapsed:.3f}s ({result.ticks_per_second:.0f} ticks/s), "
+          f"{result.trips} trips completed, {result.waiting} passengers still waiting.")
+    if result.metrics:
+        print(result.metrics)
+    if result.profile:
+        print(result.profile)
+
 
 if __name__ == "__main__":
-    run_simulation()
+    main()
@@ -0,0 +1,266 @@
+from dataclasses import dataclass, field
+from math import floor, log
+from typing import Optional
+
+from events import (Alighted, Arrived, Boarded, Called, DoorsOpened, Ejected, EventLevel, EventSink, Refused,
+                    Transferred)
+
+DEFAULT_PRECISION = 0.01
+# Seconds over which the handling capacity of a bank is traditionally measured.
+HANDLING_CAPACITY_WINDOW = 300
+PERCENTILES = (50, 95, 99)
+
+
+class StreamingHistogram:
+    """
+    Histogram of non-negative values with logarithmic buckets.
+
+    A value lands in the bucket of its logarithm to the base `1 + precision`, so every percentile is
+    known within `precision` of its true value while the memory stays bounded by the spread of the
+    values, not by their number: a thousand buckets cover ten orders of magnitude at 1%.
+
+    Attributes:
+        precision (float): Relative width of a bucket.
+        count (int): Number of recorded values.
+        total (float): Sum of the recorded values.
+        minimum (float or None): The smallest recorded value.
+        maximum (float or None): The largest recorded value.
+    """
+
+    def __init__(self, precision: float = DEFAULT_PRECISION) -> None:
+        """Initializes an empty histogram."""
+        self.precision = precision
+        self._log_base = log(1 + precision)
+        self._zeros = 0
+        self._buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = None
+
+    def record(self, value: float) -> None:
+        """Adds a value to the histogram."""
+        self.count += 1
+        self.total += value
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+        if value <= 0:
+            self._zeros += 1
+            return
+        bucket = floor(log(value) / self._log_base)
+        self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+
+    @property
+    def mean(self) -> Optional[float]:
+        """Returns the mean of the recorded values, None when there is none."""
+        return self.total / self.count if self.count else None
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """Returns the value below which `percent` percent of the recorded values fall."""
+        if not self.count:
+            return None
+        rank = percent / 100 * self.count
+        seen = self._zeros
+        if seen >= rank:
+            return 0.0
+        for bucket in sorted(self._buckets):
+            seen += self._buckets[bucket]
+            if seen >= rank:
+                # The geometric middle of the bucket, kept within the recorded range.
+                value = (1 + self.precision) ** (bucket + 0.5)
+                return min(max(value, self.minimum), self.maximum)
+        return self.maximum
+
+    def __len__(self) -> int:
+        return self.count
+
+
+@dataclass
+class CarMetrics:
+    """
+    Counters of a single car.
+
+    Attributes:
+        stops (int): Number of times the doors opened.
+        floors_travelled (int): Number of floors the car passed.
+        trips (int): Number of passengers delivered to their target floor.
+        ejections (int): Number of passengers pushed out of the overloaded car.
+        refusals (int): Number of times a passenger was turned away at the door of the full car.
+        load_time (float): Integral of the number of riders over time.
+        floor (int): The last floor the car was seen on.
+        load (int): The number of riders since the last change.
+        changed (float): Time of the last change of the number of riders.
+    """
+    capacity: int
+    floor: int
+    stops: int = 0
+    floors_travelled: int = 0
+    trips: int = 0
+    ejections: int = 0
+    refusals: int = 0
+    load_time: float = 0.0
+    load: int = 0
+    changed: float = 0.0
+
+    def load_factor(self, now: float) -> float:
+        """Returns the time-averaged share of the capacity used up to `now`."""
+        if now <= 0 or not self.capacity:
+            return 0.0
+        return (self.load_time + (now - self.changed) * self.load) / (now * self.capacity)
+
+
+@dataclass
+class MetricsReport:
+    """
+    Aggregated metrics of a run, times in the units of the simulation clock.
+
+    Attributes:
+        passengers (int): Number of completed journeys.
+        wait (dict): Mean and percentiles of the time from the call to boarding.
+        journey (dict): Mean and percentiles of the time from the call to alighting.
+        handling_capacity (int): The largest number of passengers delivered in one handling window.
+        ejections (int): Number of passengers pushed out of overloaded cars.
+        cars (list): Per-car stops, floors travelled and load factor.
+        refusals (int): Number of times a passenger was turned away at the door of a full car.
+    """
+    passengers: int
+    wait: dict
+    journey: dict
+    handling_capacity: int
+    ejections: int
+    cars: list = field(default_factory=list)
+    refusals: int = 0
+
+    def __str__(self) -> str:
+        """Renders the report as a few lines of text."""
+        def summary(stats: dict) -> str:
+            return ' '.join(f"{name}={value:.1f}" if value is not None else f"{name}=-"
+                            for name, value in stats.items())
+
+        lines = [f"Journeys: {self.passengers}, handling capacity: {self.handling_capacity} per window, "
+                 f"ejections: {self.ejections}, refusals: {self.refusals}",
+                 f"Wait: {summary(self.wait)}",
+                 f"Journey: {summary(self.journey)}"]
+        for index, car in enumerate(self.cars):
+            lines.append(f"Car {index}: stops={car['stops']} floors={car['floors_travelled']} "
+                         f"load={car['load_factor']:.0%}")
+        return '\n'.join(lines)
+
+
+class MetricsCollector(EventSink):
+    """
+    Sink measuring the journeys of the passengers and the work of the cars from the events they emit.
+
+    The call, boarding and alighting times of a passenger are kept only while the journey lasts and are
+    then folded into streaming histograms, and the handling capacity is tracked as the busiest `window`
+    seen so far, so the memory does not grow with the length of the run. A journey runs from the first
+    call to alighting on the target floor, across the changes of cars on the way, while every boarding
+    records the wait before it.
+
+    Attributes:
+        clock (VirtualClock): The simulation clock timestamping the events.
+        window (float): Length of the window of the handling capacity, in clock units.
+        wait (StreamingHistogram): Times from the call to boarding.
+        journey (StreamingHistogram): Times from the call to alighting.
+        cars (dict): Metrics of every car seen, by car.
+        called (dict): Call time of the passengers waiting for a car.
+        boarded (dict): Start of the journey and boarding time of the passengers riding a car.
+        transferring (dict): Start of the journey of the passengers changing cars.
+    """
+    level = EventLevel.DEBUG
+
+    def __init__(self, clock, window: float = 5, precision: float = DEFAULT_PRECISION) -> None:
+        """Initializes the collector reading the time from `clock`."""
+        self.clock = clock
+        self.window = window
+        self.wait = StreamingHistogram(precision)
+        self.journey = StreamingHistogram(precision)
+        self.cars = {}
+        self.called = {}
+        self.boarded = {}
+        self.transferring = {}
+        self._window_index = 0
+        self._window_count = 0
+        self._peak_count = 0
+
+    def emit(self, event) -> None:
+        now = self.clock.now
+        car = self._car(event.elevator)
+        if isinstance(event, Arrived):
+            car.floors_travelled += abs(event.floor - car.floor)
+            car.floor = event.floor
+        elif isinstance(event, DoorsOpened):
+            car.stops += 1
+        elif isinstance(event, Called):
+            # A passenger turned away by a full car calls again, the wait counts from the first call.
+            self.called.setdefault(event.passenger, now)
+        elif isinstance(event, Boarded):
+            self._load_changed(car, event.elevator, now)
+            # A passenger taking a car that stands open on their floor never called it.
+            called = self.called.pop(event.passenger, now)
+            self.boarded[event.passenger] = (self.transferring.pop(event.passenger, called), now)
+            self.wait.record(now - called)
+        elif isinstance(event, Alighted):
+            self._load_changed(car, event.elevator, now)
+            car.trips += 1
+            called, _ = self.boarded.pop(event.passenger, (now, now))
+            self.journey.record(now - called)
+            self._delivered(now)
+        elif isinstance(event, Transferred):
+            self._load_changed(car, event.elevator, now)
+            started, _ = self.boarded.pop(event.passenger, (now, now))
+            self.transferring[event.passenger] = started
+        elif isinstance(event, Ejected):
+            self._load_changed(car, event.elevator, now)
+            car.ejections += 1
+            self.boarded.pop(event.passenger, None)
+        elif isinstance(event, Refused):
+            car.refusals += 1
+
+    def _car(self, elevator) -> CarMetrics:
+        """Returns the metrics of the car, cars start on their lowest floor."""
+        car = self.cars.get(elevator)
+        if car is None:
+            car = self.cars[elevator] = CarMetrics(capacity=elevator.capacity, floor=elevator.lower_floor)
+        return car
+
+    @staticmethod
+    def _load_changed(car: CarMetrics, elevator, now: float) -> None:
+        """Accumulates the load of the car up to `now` and takes its new number of riders."""
+        car.load_time += (now - car.changed) * car.load
+        car.load = len(elevator.passengers)
+        car.changed = now
+
+    def _delivered(self, now: float) -> None:
+        """Counts a delivered passenger in the handling window of `now`."""
+        index = int(now // self.window)
+        if index != self._window_index:
+            self._window_index = index
+            self._window_count = 0
+        self._window_count += 1
+        self._peak_count = max(self._peak_count, self._window_count)
+
+    def report(self) -> MetricsReport:
+        """Aggregates everything measured so far."""
+        now = self.clock.now
+
+        def stats(histogram: StreamingHistogram) -> dict:
+            values = {'mean': histogram.mean}
+            values.update((f"p{percent}", histogram.percentile(percent)) for percent in PERCENTILES)
+            return values
+
+        return MetricsReport(
+            passengers=self.journey.count,
+            wait=stats(self.wait),
+            journey=stats(self.journey),
+            handling_capacity=self._peak_count,
+            ejections=sum(car.ejections for car in self.cars.values()),
+            refusals=sum(car.refusals for car in self.cars.values()),
+            cars=[{'stops': car.stops,
+                   'floors_travelled': car.floors_travelled,
+                   'trips': car.trips,
+                   'load_factor': car.load_factor(now)}
+                  for car in self.cars.values()],
+        )
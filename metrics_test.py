@@ -0,0 +1,107 @@
+from random import Random
+
+from clock import VirtualClock
+from elevator import Elevator, Passenger
+from events import Alighted, EventLevel, EventSink, FanOutSink, NullSink, Transferred
+from metrics import MetricsCollector, StreamingHistogram
+from simulation import SIMULATIONS, SimulationConfig
+from utils import set_elevator_for_passengers
+
+
+class JourneyLog(EventSink):
+    """Records the floors where the passengers get off, with their target floor at the time."""
+    level = EventLevel.INFO
+
+    def __init__(self) -> None:
+        self.alighted = []
+        self.transferred = []
+
+    def emit(self, event) -> None:
+        if isinstance(event, Alighted):
+            self.alighted.append((event.floor, event.passenger.target_floor))
+        elif isinstance(event, Transferred):
+            self.transferred.append((event.floor, event.passenger.target_floor))
+
+
+class TestMetrics:
+    """Test suite for the streaming histograms and the metrics collector."""
+
+    def test_percentiles_within_precision(self):
+        """Percentiles are within the bucket precision of the exact ones."""
+        rng = Random(4)
+        values = sorted(rng.expovariate(0.1) for _ in range(10000))
+        histogram = StreamingHistogram(precision=0.01)
+        for value in values:
+            histogram.record(value)
+        for percent in (50, 95, 99):
+            exact = values[int(percent / 100 * len(values)) - 1]
+            assert abs(histogram.percentile(percent) - exact) <= 0.011 * exact
+        assert abs(histogram.mean - sum(values) / len(values)) < 1e-6
+
+    def test_memory_is_bounded(self):
+        """The number of buckets depends on the spread of the values, not on their number."""
+        histogram = StreamingHistogram()
+        for index in range(200000):
+            histogram.record(1 + index % 1000)
+        assert len(histogram) == 200000
+        assert len(histogram._buckets) < 700
+        assert histogram.percentile(100) == 1000
+
+    def test_zero_values(self):
+        """Zero waits are counted and rank lowest."""
+        histogram = StreamingHistogram()
+        for value in (0, 0, 0, 5):
+            histogram.record(value)
+        assert histogram.percentile(50) == 0
+        assert abs(histogram.percentile(99) - 5) <= 0.05
+        assert StreamingHistogram().percentile(50) is None
+
+    def test_collector_times_a_journey(self):
+        """Call, boarding and alighting times become the wait and journey time of the passenger."""
+        clock = VirtualClock()
+        metrics = MetricsCollector(clock, window=5)
+        elevator = Elevator(sink=FanOutSink(NullSink(), metrics))
+        passenger = Passenger(current_floor=3, target_floor=5)
+        set_elevator_for_passengers([passenger], elevator)
+        passenger._is_resting = False
+        for _ in range(10):
+            elevator.move()
+            passenger.move()
+            clock.tick()
+        report = metrics.report()
+        assert report.passengers == 1
+        # Called on tick 0, boarded on tick 2 when the car opened on floor 3, out on floor 5 on tick 4.
+        assert report.wait['p50'] == 2
+        assert report.journey['p50'] == 4
+        car = report.cars[0]
+        assert car['stops'] == 2 and car['floors_travelled'] == 4 and car['trips'] == 1
+        # One rider out of four places for 2 ticks out of 10.
+        assert abs(car['load_factor'] - 2 / 40) < 1e-9
+        assert report.handling_capacity == 1
+        assert not metrics.called and not metrics.boarded
+
+    def test_transfers_make_one_journey(self):
+        """A passenger changing cars at the lobby or the sky lobby is delivered once, on the target floor."""
+        for engine in SIMULATIONS:
+            config = SimulationConfig(ticks=500, passenger_count=100, cars=5, top_floor=30, sky_lobbies=(15,),
+                                      shuttles=1, seed=1, engine=engine, metrics=True)
+            log = JourneyLog()
+            simulation = SIMULATIONS[engine](config, log)
+            result = simulation.run()
+            assert log.transferred and all(floor in (1, 15) and floor != target for floor, target in log.transferred)
+            assert all(floor == target for floor, target in log.alighted)
+            assert result.trips == len(log.alighted) == result.metrics.passengers
+            # A journey adds the rides to the waits, across the transfers.
+            assert result.metrics.journey['mean'] > result.metrics.wait['mean']
+            assert not simulation.metrics.transferring.keys() & simulation.metrics.boarded.keys()
+
+    def test_runs_report_metrics(self):
+        """Every engine reports metrics on request, and only then."""
+        for engine in SIMULATIONS.values():
+            config = SimulationConfig(ticks=300, passenger_count=100, cars=2, seed=2, metrics=True)
+            result = engine(config).run()
+            assert result.metrics.passengers == result.trips
+            assert 0 <= result.metrics.wait['p50'] <= result.metrics.wait['p95'] <= result.metrics.wait['p99']
+            assert result.metrics.handling_capacity > 0
+            assert len(result.metrics.cars) == 2
+            assert engine(SimulationConfig(ticks=10, passenger_count=5)).run().metrics is None
@@ -0,0 +1,77 @@
+from typing import Optional
+
+from utils import create_faker, generate_full_name
+
+DEFAULT_NAME_POOL_SIZE = 1024
+
+
+class FakerNames:
+    """
+    Generates a realistic full name for a passenger the first time the name is needed.
+
+    Faker is imported and set up only on first use. With a seed, the name of a passenger depends
+    only on the seed and the passenger's id, not on the order in which names are rendered.
+    """
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        """Initializes the generator without creating the Faker instance yet."""
+        self.seed = seed
+        self._faker = None
+
+    def __call__(self, passenger_id: int) -> str:
+        """Returns the name of the passenger with the given id."""
+        if self.seed is None:
+            return generate_full_name()
+        if self._faker is None:
+            self._faker = create_faker()
+        self._faker.seed_instance(f"{self.seed}-{passenger_id}")
+        return self._faker.name()
+
+    def __getstate__(self) -> dict:
+        # The Faker instance is recreated on first use, the names depend only on the seed.
+        return dict(self.__dict__, _faker=None)
+
+
+class NamePool:
+    """
+    Hands out names from a pool generated once, so naming a passenger costs a list lookup.
+
+    Passengers whose ids differ by a multiple of the pool size share a name.
+    """
+
+    def __init__(self, size: int = DEFAULT_NAME_POOL_SIZE, seed: Optional[int] = None) -> None:
+        """Initializes the pool, the names are generated on first use."""
+        self.size = size
+        self.seed = seed
+        self._names = None
+
+    def __call__(self, passenger_id: int) -> str:
+        """Returns the name of the passenger with the given id."""
+        if self._names is None:
+            faker = create_faker(self.seed)
+            self._names = [faker.name() for _ in range(self.size)]
+        return self._names[passenger_id % self.size]
+
+
+class IdNames:
+    """Names passengers after their ids, without any name generator."""
+
+    def __call__(self, passenger_id: int) -> str:
+        """Returns the name of the passenger with the given id."""
+        return f"Passenger #{passenger_id}"
+
+
+NAMINGS = {
+    'faker': FakerNames,
+    'pool': NamePool,
+    'id': IdNames,
+}
+
+DEFAULT_NAMING = FakerNames()
+
+
+def create_naming(kind: str, seed: Optional[int] = None):
+    """Creates the named naming strategy, seeded when the strategy uses random names."""
+    if kind == 'id':
+        return IdNames()
+    return NAMINGS[kind](seed=seed)
@@ -0,0 +1,51 @@
+import subprocess
+import sys
+
+from elevator import Passenger, generate_random_passengers
+from naming import FakerNames, IdNames, NamePool, create_naming
+
+
+class TestNaming:
+    """Test suite for the passenger naming strategies."""
+
+    def test_faker_is_not_imported_eagerly(self):
+        """Importing the simulator and creating passengers does not load Faker."""
+        code = ("import sys; from elevator import generate_random_passengers; "
+                "generate_random_passengers(100); print('faker' in sys.modules)")
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        assert output.stdout.strip() == 'False'
+
+    def test_names_are_generated_lazily(self):
+        """A name is generated on first access and kept afterwards."""
+        calls = []
+
+        def naming(passenger_id):
+            calls.append(passenger_id)
+            return f"n{passenger_id}"
+
+        passenger = Passenger(passenger_id=7, naming=naming)
+        assert not calls
+        assert passenger.name == 'n7'
+        assert repr(passenger) == 'n7'
+        assert calls == [7]
+
+    def test_seeded_names_do_not_depend_on_render_order(self):
+        """With a seed, a passenger's name depends only on its id."""
+        first = FakerNames(seed=3)
+        second = FakerNames(seed=3)
+        forward = [first(passenger_id) for passenger_id in range(5)]
+        backward = [second(passenger_id) for passenger_id in reversed(range(5))]
+        assert forward == list(reversed(backward))
+        assert FakerNames(seed=4)(0) != forward[0] or FakerNames(seed=4)(1) != forward[1]
+
+    def test_name_pool(self):
+        """Pool names repeat with the pool size."""
+        pool = NamePool(size=4, seed=1)
+        assert pool(1) == pool(5)
+        assert len({pool(passenger_id) for passenger_id in range(4)}) > 1
+
+    def test_id_names(self):
+        """Id names need no generator at all."""
+        passengers = generate_random_passengers(3, naming=create_naming('id'))
+        assert [passenger.name for passenger in passengers] == ['Passenger #0', 'Passenger #1', 'Passenger #2']
+        assert isinstance(create_naming('id', seed=5), IdNames)
@@ -0,0 +1,130 @@
+from abc import ABC, abstractmethod
+from collections import deque
+from math import ceil
+from typing import Optional, TYPE_CHECKING
+
+from elevator import Elevator
+from scheduling import HallCall
+
+if TYPE_CHECKING:
+    from dispatcher import ElevatorBank
+
+# Number of recent calls the demand of every floor is counted over.
+DEFAULT_DEMAND_WINDOW = 200
+
+
+class DemandHistogram:
+    """
+    Rolling count of the hall calls made from every floor over the last `window` calls.
+
+    Attributes:
+        window (int): Number of recent calls counted.
+        counts (dict): Number of the recent calls made from every floor.
+    """
+
+    def __init__(self, window: int = DEFAULT_DEMAND_WINDOW) -> None:
+        """Initializes an empty histogram."""
+        self.window = window
+        self.counts = {}
+        self._recent = deque()
+        self._ranking = None
+
+    def record(self, floor: int) -> None:
+        """Counts a call from `floor`, forgetting the oldest call once the window is full."""
+        self._recent.append(floor)
+        self.counts[floor] = self.counts.get(floor, 0) + 1
+        if len(self._recent) > self.window:
+            oldest = self._recent.popleft()
+            self.counts[oldest] -= 1
+            if not self.counts[oldest]:
+                del self.counts[oldest]
+        self._ranking = None
+
+    def ranking(self) -> list:
+        """Returns the floors with recent calls, the busiest first and the lower floor first on a tie."""
+        if self._ranking is None:
+            self._ranking = sorted(self.counts, key=lambda floor: (-self.counts[floor], floor))
+        return self._ranking
+
+    def __len__(self) -> int:
+        return len(self._recent)
+
+
+class ParkingPolicy(ABC):
+    """Decides where a car waits for its next call once it has nothing to do."""
+
+    def observe(self, call: HallCall) -> None:
+        """Takes note of a hall call made to the bank."""
+
+    @abstractmethod
+    def park(self, bank: 'ElevatorBank', car: Elevator) -> Optional[int]:
+        """Returns the floor the idle car should wait on, None to leave it where it is."""
+
+
+class StayPolicy(ParkingPolicy):
+    """Leaves an idle car where it stopped."""
+
+    def park(self, bank: 'ElevatorBank', car: Elevator) -> Optional[int]:
+        return None
+
+
+class LobbyPolicy(ParkingPolicy):
+    """Sends every idle car back to the lobby, where most trips start in an office building."""
+
+    def park(self, bank: 'ElevatorBank', car: Elevator) -> Optional[int]:
+        lobby = bank.lobby
+        return lobby if car.serves(lobby) else None
+
+
+class DemandPolicy(ParkingPolicy):
+    """
+    Parks the idle cars on the floors with the most recent hall calls.
+
+    Every floor gets a share of the cars in proportion to its share of the recent calls, rounded up. An
+    idle car takes the busiest floor whose share is not yet used up by the other idle cars, and a car
+    already waiting on one of the busiest floors stays there, so the cars do not chase every change of
+    the ranking.
+
+    Parking pays off only while the calls gather where the idle cars are not: it cuts the waits of the
+    up-peak and down-peak profiles, but with calls spread over the floors, or coming both from the lobby
+    and from upstairs at lunch time, the runs to the parking floors keep the cars from the next calls and
+    the waits grow slightly. `StayPolicy` remains the default for that reason.
+
+    Attributes:
+        demand (DemandHistogram): The recent calls of every floor.
+    """
+
+    def __init__(self, window: int = DEFAULT_DEMAND_WINDOW) -> None:
+        """Initializes the policy counting the demand over the last `window` calls."""
+        self.demand = DemandHistogram(window)
+
+    def observe(self, call: HallCall) -> None:
+        self.demand.record(call.floor)
+
+    def park(self, bank: 'ElevatorBank', car: Elevator) -> Optional[int]:
+        calls = len(self.demand)
+        if not calls:
+            return None
+        cars = len(bank.elevators)
+        waiting = {}
+        for other, floor in bank.parked.items():
+            if other is not car and not other.passengers:
+                waiting[floor] = waiting.get(floor, 0) + 1
+
+        def has_room(floor: int) -> bool:
+            return waiting.get(floor, 0) < ceil(self.demand.counts[floor] * cars / calls)
+
+        ranking = self.demand.ranking()
+        if car.current_floor in ranking[:cars] and has_room(car.current_floor):
+            return car.current_floor
+        for floor in ranking:
+            if has_room(floor) and car.serves(floor):
+                return floor
+        return None
+
+
+PARKING_POLICIES = {
+    'stay': StayPolicy,
+    'lobby': LobbyPolicy,
+    'demand': DemandPolicy,
+}
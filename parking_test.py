@@ -0,0 +1,70 @@
+from dispatcher import create_bank
+from parking import DemandHistogram, DemandPolicy, LobbyPolicy
+from scheduling import HallCall
+from simulation import SIMULATIONS, SimulationConfig
+
+
+class TestParking:
+    """Test suite for the parking of idle cars."""
+
+    def test_demand_histogram_forgets_old_calls(self):
+        """Only the calls of the window count, the busiest floor ranks first."""
+        demand = DemandHistogram(window=4)
+        for floor in (3, 3, 7, 5, 5, 5):
+            demand.record(floor)
+        assert len(demand) == 4
+        assert demand.counts == {7: 1, 5: 3}
+        assert demand.ranking() == [5, 7]
+
+    def test_demand_policy_shares_the_cars_out(self):
+        """Floors get idle cars in proportion to their calls, one floor cannot take every car."""
+        bank = create_bank(4, top_floor=20, parking='demand')
+        for floor in [1] * 6 + [12] * 2:
+            bank.parking.observe(HallCall(floor))
+        targets = [bank.parking.park(bank, car) for car in bank.elevators[:1]]
+        bank.parked[bank.elevators[0]] = targets[0]
+        for car in bank.elevators[1:]:
+            targets.append(bank.parking.park(bank, car))
+            bank.parked[car] = targets[-1]
+        assert targets == [1, 1, 1, 12]
+
+    def test_idle_car_parks_and_gives_up_the_trip_for_a_call(self):
+        """An idle car heads for its parking floor, a call assigned on the way cancels the trip."""
+        bank = create_bank(1, top_floor=20, parking='lobby')
+        car = bank.elevators[0]
+        car.current_floor = 15
+        assert isinstance(bank.parking, LobbyPolicy)
+        assert bank.park_if_idle(car)
+        assert list(car.queue) == [1] and bank.parked == {car: 1}
+        bank.move()
+        assert car.current_floor == 14
+        bank.hall_call(18)
+        assert list(car.queue) == [18] and not bank.parked
+        assert not bank.park_if_idle(car)
+
+    def test_lobby_is_above_the_basements(self):
+        """Idle cars of a building with basements park at the lobby, not on the lowest basement."""
+        bank = create_bank(2, lower_floor=-2, top_floor=20, parking='lobby')
+        car = bank.elevators[0]
+        car.current_floor = 9
+        assert bank.lobby == 1 and bank.parking.park(bank, car) == 1
+        config = SimulationConfig(ticks=200, passenger_count=0, cars=2, lower_floor=-2, top_floor=20,
+                                  parking='lobby', naming='id')
+        simulation = SIMULATIONS['tick'](config)
+        simulation.bank.elevators[1].current_floor = 12
+        simulation.run()
+        assert [car.current_floor for car in simulation.bank.elevators] == [1, 1]
+
+    def test_parking_follows_the_lobby_demand(self):
+        """In the morning, cars parked by demand wait at the lobby and the arrivals wait less."""
+        for engine in ('tick', 'event'):
+            waits = {}
+            for parking in ('stay', 'demand'):
+                config = SimulationConfig(ticks=2000, cars=3, top_floor=20, capacity=8, dispatch='eta',
+                                          scheduler='collective', admission=True, traffic='up-peak',
+                                          traffic_rate=0.3, metrics=True, naming='id', seed=1, engine=engine,
+                                          parking=parking)
+                simulation = SIMULATIONS[engine](config)
+                waits[parking] = simulation.run().metrics.wait['mean']
+            assert isinstance(simulation.bank.parking, DemandPolicy)
+            assert waits['demand'] < waits['stay'] * 0.8
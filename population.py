@@ -0,0 +1,223 @@
+import random
+from array import array
+from typing import Optional, TYPE_CHECKING
+
+from constants import DEFAULT_LOWER_FLOOR, DEFAULT_TOP_FLOOR, DEFAULT_PASSENGER_WEIGHT
+from elevator import Elevator, Passenger
+from naming import DEFAULT_NAMING
+
+if TYPE_CHECKING:
+    from dispatcher import ElevatorBank
+
+RESTING = 0
+ACTIVE = 1
+AWAITING = 2
+RIDING = 3
+
+NO_CAR = -1
+
+
+class PassengerPopulation:
+    """
+    Stores the state of many passengers in columnar arrays instead of one object per passenger.
+
+    A passenger takes a few bytes per column. `PassengerView` objects created on access give the
+    passengers the usual `Passenger` behaviour, and views of the same passenger compare equal.
+
+    Attributes:
+        floors (array): Current floor of each passenger.
+        targets (array): Target floor of each passenger.
+        weights (array): Weight of each passenger in kg.
+        states (array): RESTING, ACTIVE (decided to travel), AWAITING (called a car) or RIDING.
+        cars (array): Index of the car assigned to each passenger in `elevators`, NO_CAR when unassigned.
+        elevators (list): Cars referenced by the `cars` column.
+        bank (Optional[ElevatorBank]): The bank dispatching the calls of every passenger.
+        naming: Generates the passenger names when they are first rendered.
+        names (dict): Names of the passengers that were named explicitly or rendered already.
+    """
+
+    def __init__(self, naming=None) -> None:
+        """Initializes an empty population."""
+        self.floors = array('i')
+        self.targets = array('i')
+        self.weights = array('f')
+        self.states = array('b')
+        self.cars = array('h')
+        self.elevators = []
+        self._car_indexes = {}
+        self.bank = None
+        self.naming = naming or DEFAULT_NAMING
+        self.names = {}
+
+    @classmethod
+    def generate(cls,
+                 count: int,
+                 lower_floor: int = DEFAULT_LOWER_FLOOR,
+                 top_floor: int = DEFAULT_TOP_FLOOR,
+                 rng: Optional[random.Random] = None,
+                 naming=None) -> 'PassengerPopulation':
+        """Creates a population of resting passengers on random floors, like `generate_random_passengers`."""
+        rng = rng or random
+        population = cls(naming)
+        for _ in range(count):
+            population.append(rng.randint(lower_floor, top_floor), rng.randint(lower_floor, top_floor))
+        return population
+
+    def append(self, current_floor: int, target_floor: int, name: Optional[str] = None,
+               weight: float = DEFAULT_PASSENGER_WEIGHT) -> 'PassengerView':
+        """Adds a resting passenger and returns its view."""
+        index = len(self.floors)
+        self.floors.append(current_floor)
+        self.targets.append(target_floor)
+        self.weights.append(weight)
+        self.states.append(RESTING)
+        self.cars.append(NO_CAR)
+        if name:
+            self.names[index] = name
+        return PassengerView(self, index)
+
+    def car_index(self, elevator: Optional[Elevator]) -> int:
+        """Returns the index of `elevator` in the `cars` column, registering new cars."""
+        if elevator is None:
+            return NO_CAR
+        index = self._car_indexes.get(elevator)
+        if index is None:
+            index = self._car_indexes[elevator] = len(self.elevators)
+            self.elevators.append(elevator)
+        return index
+
+    def set_bank(self, bank: 'ElevatorBank') -> None:
+        """Set the elevator bank dispatching the calls of every passenger."""
+        self.bank = bank
+
+    def __len__(self) -> int:
+        return len(self.floors)
+
+    def __getitem__(self, index: int) -> 'PassengerView':
+        if not 0 <= index < len(self.floors):
+            raise IndexError(index)
+        return PassengerView(self, index)
+
+    def __iter__(self):
+        for index in range(len(self.floors)):
+            yield PassengerView(self, index)
+
+
+class PassengerView(Passenger):
+    """
+    A passenger of a `PassengerPopulation`.
+
+    The view holds no state of its own: every attribute of `Passenger` reads and writes the columns
+    of the population, so the view works wherever a `Passenger` does.
+    """
+    __slots__ = ('population', 'index')
+
+    def __init__(self, population: PassengerPopulation, index: int) -> None:
+        """Points the view at the passenger stored at `index`."""
+        self.population = population
+        self.index = index
+
+    @property
+    def passenger_id(self) -> int:
+        return self.index
+
+    @property
+    def _name(self) -> Optional[str]:
+        return self.population.names.get(self.index)
+
+    @_name.setter
+    def _name(self, name: Optional[str]) -> None:
+        self.population.names[self.index] = name
+
+    @property
+    def _naming(self):
+        return self.population.naming
+
+    @property
+    def current_floor(self) -> int:
+        return self.population.floors[self.index]
+
+    @current_floor.setter
+    def current_floor(self, floor: int) -> None:
+        self.population.floors[self.index] = floor
+
+    @property
+    def target_floor(self) -> int:
+        return self.population.targets[self.index]
+
+    @target_floor.setter
+    def target_floor(self, floor: int) -> None:
+        self.population.targets[self.index] = floor
+
+    @property
+    def weight(self) -> float:
+        return self.population.weights[self.index]
+
+    @weight.setter
+    def weight(self, weight: float) -> None:
+        self.population.weights[self.index] = weight
+
+    @property
+    def _is_resting(self) -> bool:
+        return self.population.states[self.index] == RESTING
+
+    @_is_resting.setter
+    def _is_resting(self, resting: bool) -> None:
+        states = self.population.states
+        if resting:
+            states[self.index] = RESTING
+        elif states[self.index] == RESTING:
+            states[self.index] = ACTIVE
+
+    @property
+    def _awaits(self) -> bool:
+        return self.population.states[self.index] >= AWAITING
+
+    @_awaits.setter
+    def _awaits(self, awaits: bool) -> None:
+        states = self.population.states
+        if awaits:
+            if states[self.index] != RIDING:
+                states[self.index] = AWAITING
+        elif states[self.index] == AWAITING:
+            states[self.index] = ACTIVE
+
+    @property
+    def _in_elevator(self) -> bool:
+        return self.population.states[self.index] == RIDING
+
+    @_in_elevator.setter
+    def _in_elevator(self, in_elevator: bool) -> None:
+        states = self.population.states
+        if in_elevator:
+            states[self.index] = RIDING
+        elif states[self.index] == RIDING:
+            states[self.index] = AWAITING
+
+    @property
+    def _elevator(self) -> Optional[Elevator]:
+        index = self.population.cars[self.index]
+        return None if index == NO_CAR else self.population.elevators[index]
+
+    @_elevator.setter
+    def _elevator(self, elevator: Optional[Elevator]) -> None:
+        self.population.cars[self.index] = self.population.car_index(elevator)
+
+    @property
+    def _bank(self) -> Optional['ElevatorBank']:
+        return self.population.bank
+
+    @_bank.setter
+    def _bank(self, bank: Optional['ElevatorBank']) -> None:
+        self.population.bank = bank
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, PassengerView)
+                and other.population is self.population and other.index == self.index)
+
+    def __hash__(self) -> int:
+        return hash((id(self.population), self.index))
+
+    def __reduce__(self) -> tuple:
+        # The setters of the inherited slots write to the population, a view is rebuilt from its position.
+        return PassengerView, (self.population, self.index)
@@ -0,0 +1,65 @@
+from elevator import Elevator, Passenger
+from events import NullSink
+from population import PassengerPopulation, RESTING, RIDING
+from simulation import SIMULATIONS, SimulationConfig
+from utils import set_elevator_for_passengers
+
+
+class TestPassengerPopulation:
+    """Test suite for the columnar passenger store."""
+
+    def setup_method(self):
+        """Creates a population of three passengers and an elevator."""
+        self.population = PassengerPopulation()
+        for current_floor, target_floor in ((1, 4), (2, 5), (3, 1)):
+            self.population.append(current_floor, target_floor)
+        self.elevator = Elevator(sink=NullSink())
+        set_elevator_for_passengers(self.population, self.elevator)
+
+    def test_objects_have_no_instance_dict(self):
+        """Passengers, views and elevators keep their attributes in slots."""
+        for obj in (Passenger(), self.population[0], self.elevator):
+            assert not hasattr(obj, '__dict__')
+
+    def test_views_of_a_passenger_are_equal(self):
+        """Views are created on access, two views of one passenger are interchangeable."""
+        assert self.population[1] == self.population[1]
+        assert self.population[1] != self.population[2]
+        assert len({self.population[0], self.population[0]}) == 1
+        assert len(list(self.population)) == 3
+
+    def test_view_rides_the_elevator(self):
+        """A view goes through the whole trip and its state lands in the columns."""
+        passenger = self.population[1]
+        passenger._is_resting = False
+        passenger.move()
+        assert self.elevator.queue == {2}
+        self.elevator.move()
+        passenger.move()
+        assert self.population.states[1] == RIDING
+        assert passenger in self.elevator.passengers
+        for _ in range(3):
+            self.elevator.move()
+        assert self.population.floors[1] == 5
+        assert self.population.states[1] == RESTING
+        assert self.population[1]._elevator is self.elevator
+
+    def test_names_are_lazy(self):
+        """Names are rendered on demand and explicit names are kept."""
+        named = self.population.append(1, 2, name="John")
+        assert named.name == "John"
+        assert 0 not in self.population.names
+        assert self.population[0].name
+        assert 0 in self.population.names
+
+    def test_same_results_as_objects(self):
+        """A seeded run gives the same result with objects and with the columnar store."""
+        for engine in SIMULATIONS.values():
+            results = []
+            for columnar in (False, True):
+                config = SimulationConfig(ticks=1000, passenger_count=50, cars=2, seed=5, columnar=columnar)
+                simulation = engine(config)
+                result = simulation.run()
+                floors = [passenger.current_floor for passenger in simulation.passengers]
+                results.append((result.trips, result.waiting, floors))
+            assert results[0] == results[1]
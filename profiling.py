@@ -0,0 +1,152 @@
+from dataclasses import dataclass, field
+from functools import wraps
+from importlib import import_module
+from time import perf_counter
+
+# The methods timed in every phase of a run, as 'module.Class.method'. A car binds its one-floor moves
+# when it is created, their time counts as part of `Elevator.move`.
+PHASES = {
+    'direction': ('elevator.Elevator.choose_direction',),
+    'movement': ('elevator.Elevator.move', 'elevator.Elevator.rest', 'elevator.Elevator.travel_to',
+                 'simulation.KinematicSimulation.dispatch_car', 'simulation.KinematicSimulation.arrive_car'),
+    'doors': ('elevator.Elevator.open_doors', 'elevator.Elevator.close_doors',
+              'simulation.KinematicSimulation.open_car_doors', 'simulation.KinematicSimulation.close_car_doors'),
+    'boarding': ('dispatcher.ElevatorBank.board_waiting_passengers', 'elevator.Elevator.passengers_entering'),
+    'alighting': ('elevator.Elevator.disembark_passengers_if_needed',),
+    'ejection': ('elevator.Elevator.eject_random_passenger',),
+    'dispatch': ('dispatcher.ElevatorBank.hall_call',),
+    'passengers': ('elevator.Passenger.move', 'simulation.Simulation.update_travellers',
+                   'simulation.EventDrivenSimulation.start_trip', 'simulation.EventDrivenSimulation.resume_trip',
+                   'simulation.EventDrivenSimulation.arrive'),
+    'metrics': ('metrics.MetricsCollector.emit',),
+    'output': ('events.BufferedTextSink.emit', 'events.BufferedTextSink.flush', 'tracefile.TraceWriter.emit',
+               'tracefile.TraceWriter.flush'),
+}
+
+
+@dataclass
+class ProfileReport:
+    """
+    Time spent in every phase of a run.
+
+    Attributes:
+        total (float): Wall-clock seconds the profiler was enabled.
+        phases (dict): Calls and seconds of every phase, the seconds of a phase excluding the time spent
+            in the other phases it called.
+    """
+    total: float
+    phases: dict = field(default_factory=dict)
+
+    @property
+    def other(self) -> float:
+        """Returns the seconds spent outside of every phase, in the engine loop and the untimed methods."""
+        return max(self.total - sum(phase['seconds'] for phase in self.phases.values()), 0.0)
+
+    def __str__(self) -> str:
+        """Renders the report as a table, the slowest phase first."""
+        def share(seconds: float) -> str:
+            return f"{seconds / self.total:6.1%}" if self.total else "     -"
+
+        lines = [f"{'phase':>12} {'calls':>10} {'seconds':>9} {'share':>6}"]
+        for name, phase in sorted(self.phases.items(), key=lambda item: -item[1]['seconds']):
+            lines.append(f"{name:>12} {phase['calls']:10d} {phase['seconds']:9.3f} {share(phase['seconds'])}")
+        lines.append(f"{'other':>12} {'':>10} {self.other:9.3f} {share(self.other)}")
+        return '\n'.join(lines)
+
+
+class PhaseProfiler:
+    """
+    Measures the cumulative time and the number of calls of every phase of a simulation.
+
+    While enabled, the methods listed in `phases` are replaced on their classes by timing wrappers; when
+    disabled, the original methods are put back, so a run that is not profiled pays nothing. The time of
+    a phase excludes the time of the phases it calls, so the phases add up to the profiled time. Every
+    object of the timed classes is measured, the profiler is meant for one simulation at a time.
+
+    Use it as a context manager around the code to profile, enabling it again adds to the same figures:
+
+        with PhaseProfiler() as profiler:
+            simulation.run()
+        print(profiler.report())
+
+    Attributes:
+        phases (dict): The methods of every phase, as 'module.Class.method'.
+        calls (dict): Number of calls of every phase.
+        seconds (dict): Seconds spent in every phase.
+        total (float): Seconds the profiler was enabled.
+    """
+
+    def __init__(self, phases: dict = None) -> None:
+        """Initializes the profiler of `phases`, by default every phase of `PHASES`."""
+        self.phases = PHASES if phases is None else phases
+        self.calls = dict.fromkeys(self.phases, 0)
+        self.seconds = dict.fromkeys(self.phases, 0.0)
+        self.total = 0.0
+        self._originals = []
+        self._nested = []
+        self._started = None
+
+    @property
+    def enabled(self) -> bool:
+        """Checks whether the timed methods are currently replaced."""
+        return self._started is not None
+
+    def enable(self) -> None:
+        """Replaces the methods of every phase with their timing wrappers."""
+        if self.enabled:
+            return
+        for phase, targets in self.phases.items():
+            for target in targets:
+                module_name, class_name, method_name = target.rsplit('.', 2)
+                cls = getattr(import_module(module_name), class_name)
+                method = cls.__dict__[method_name]
+                self._originals.append((cls, method_name, method))
+                setattr(cls, method_name, self._timed(phase, method))
+        self._started = perf_counter()
+
+    def disable(self) -> None:
+        """Puts the original methods back."""
+        if not self.enabled:
+            return
+        self.total += perf_counter() - self._started
+        self._started = None
+        while self._originals:
+            cls, method_name, method = self._originals.pop()
+            setattr(cls, method_name, method)
+
+    def _timed(self, phase: str, method):
+        """Returns `method` wrapped to add its calls and its own time to `phase`."""
+        nested = self._nested
+        calls = self.calls
+        seconds = self.seconds
+
+        @wraps(method)
+        def timed(*args, **kwargs):
+            nested.append(0.0)
+            started = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - started
+                seconds[phase] += elapsed - nested.pop()
+                calls[phase] += 1
+                if nested:
+                    nested[-1] += elapsed
+
+        return timed
+
+    def report(self) -> ProfileReport:
+        """Returns the figures measured so far."""
+        total = self.total
+        if self.enabled:
+            total += perf_counter() - self._started
+        return ProfileReport(total=total,
+                             phases={phase: {'calls': self.calls[phase], 'seconds': self.seconds[phase]}
+                                     for phase in self.phases})
+
+    def __enter__(self) -> 'PhaseProfiler':
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.disable()
@@ -0,0 +1,79 @@
+import pytest
+
+from elevator import Elevator
+from events import NullSink
+from profiling import PhaseProfiler
+from simulation import SIMULATIONS, EventDrivenSimulation, SimulationConfig
+
+
+class TestProfiling:
+    """Test suite for the phase profiler."""
+
+    def test_disabled_by_default(self):
+        """Without profiling, the run reports nothing and the methods stay untouched."""
+        move = Elevator.move
+        simulation = SIMULATIONS['tick'](SimulationConfig(ticks=50, passenger_count=20, seed=1))
+        assert simulation.profiler is None
+        assert simulation.run().profile is None
+        assert Elevator.move is move
+
+    def test_profiled_run(self):
+        """Every engine reports its phases, and the methods are put back after the run."""
+        move = Elevator.move
+        for engine in SIMULATIONS.values():
+            result = engine(SimulationConfig(ticks=200, passenger_count=100, seed=1, profile=True)).run()
+            report = result.profile
+            assert Elevator.move is move
+            assert report.phases['passengers']['calls'] > 0
+            assert report.phases['movement']['calls'] > 0
+            assert report.phases['output']['calls'] == 0
+            timed = sum(phase['seconds'] for phase in report.phases.values())
+            assert timed <= report.total
+            assert 'passengers' in str(report)
+
+    def test_event_engine_counts_every_call(self, monkeypatch):
+        """
+        Events scheduled before profiling count once it is enabled, and those scheduled while it was
+        enabled stop counting once it is disabled.
+        """
+        started = []
+        start_trip = EventDrivenSimulation.start_trip
+
+        def counted(simulation, passenger):
+            started.append(passenger)
+            return start_trip(simulation, passenger)
+
+        monkeypatch.setattr(EventDrivenSimulation, 'start_trip', counted)
+        simulation = SIMULATIONS['event'](SimulationConfig(ticks=300, passenger_count=100, seed=1))
+        profiler = simulation.profiler = PhaseProfiler({'trips': ('simulation.EventDrivenSimulation.start_trip',)})
+        simulation.run()
+        assert profiler.report().phases['trips']['calls'] == len(started) > 0
+        simulation.profiler = None
+        simulation.run()
+        assert profiler.report().phases['trips']['calls'] < len(started)
+        assert EventDrivenSimulation.start_trip is counted
+
+    def test_nested_phases(self):
+        """A phase excludes the time of the phases it calls, and enabling again adds up."""
+        profiler = PhaseProfiler({'move': ('elevator.Elevator.move',),
+                                  'direction': ('elevator.Elevator.choose_direction',)})
+        elevator = Elevator(sink=NullSink())
+        elevator.add_floor_to_queue(5)
+        for _ in range(2):
+            with profiler:
+                elevator.move()
+                elevator.move()
+        report = profiler.report()
+        assert report.phases['move']['calls'] == 4
+        assert report.phases['direction']['calls'] == 4
+        assert report.phases['move']['seconds'] + report.phases['direction']['seconds'] <= report.total
+        assert elevator.current_floor == 5
+
+    def test_restored_after_error(self):
+        """The methods are put back when the profiled code raises."""
+        move = Elevator.move
+        with pytest.raises(RuntimeError):
+            with PhaseProfiler():
+                assert Elevator.move is not move
+                raise RuntimeError
+        assert Elevator.move is move
@@ -0,0 +1,282 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Optional, TYPE_CHECKING
+
+from constants import UP_NAME, DOWN_NAME
+
+if TYPE_CHECKING:
+    from call_queue import CallQueue
+    from elevator import Elevator
+
+
+@dataclass(frozen=True)
+class HallCall:
+    """
+    A call made from a landing.
+
+    Attributes:
+        floor (int): The floor the call was made from.
+        direction (str or None): 'up' or 'down' on a two-button panel, None for a bare floor call.
+        destination (int or None): The floor entered on a destination-dispatch panel.
+        refused_by (Elevator or None): The car that has just turned the caller away at its door, which the
+            bank passes over when another car can serve the call.
+    """
+    floor: int
+    direction: Optional[str] = None
+    destination: Optional[int] = None
+    refused_by: Optional['Elevator'] = None
+
+
+def direction_towards(floor: int, current_floor: int) -> Optional[str]:
+    """Returns the direction leading from `current_floor` to `floor`, None when they are the same."""
+    if floor > current_floor:
+        return UP_NAME
+    if floor < current_floor:
+        return DOWN_NAME
+    return None
+
+
+class Scheduler(ABC):
+    """
+    Decides where a car goes next and on which floors it stops.
+
+    A car keeps its calls in `queue`, every floor it intends to visit, and additionally in `car_calls`,
+    `up_calls` and `down_calls`, so a scheduler can tell the riders' stops from the landing calls and
+    the landing calls of both directions apart. Every car needs an instance of its own.
+
+    A car with admission control passes by the landing calls while it is full, and does not stay on a
+    floor for the callers it turned away there: they are served when the car comes back. While full, it
+    also chooses its direction from the riders' floors only, so a landing call it cannot answer, on its
+    own floor or beyond the riders' floors, does not hold it back.
+    """
+
+    def register_hall_call(self, elevator: 'Elevator', call: HallCall) -> None:
+        """Records a call from a landing, calls without a direction are handled like car calls."""
+        elevator.queue.add(call.floor)
+        if call.direction == UP_NAME:
+            elevator.up_calls.add(call.floor)
+        elif call.direction == DOWN_NAME:
+            elevator.down_calls.add(call.floor)
+        else:
+            elevator.car_calls.add(call.floor)
+
+    @abstractmethod
+    def choose_direction(self, elevator: 'Elevator') -> None:
+        """Sets the direction the car moves in next."""
+
+    @staticmethod
+    def calls(elevator: 'Elevator') -> 'CallQueue':
+        """Returns the floors the car can stop at: its riders' floors while full under admission control."""
+        if elevator.admission and elevator.car_calls and elevator.is_full:
+            return elevator.car_calls
+        return elevator.queue
+
+    def closest_call(self, elevator: 'Elevator') -> Optional[int]:
+        """Returns the queued floor the car heads for when it has no direction, None when the queue is empty."""
+        queue = self.calls(elevator)
+        floor = elevator.current_floor
+        if elevator.admission and elevator.doors_open:
+            other = queue.closest_other(floor)
+            if other is not None:
+                return other
+        return queue.closest(floor)
+
+    def stops_at(self, elevator: 'Elevator', floor: int) -> bool:
+        """Checks whether the car, travelling in its current direction, opens its doors on `floor`."""
+        if floor not in elevator.queue:
+            return False
+        if floor in elevator.car_calls:
+            return True
+        if elevator.admission and elevator.is_full:
+            return False
+        return self.answers_hall_call(elevator, floor)
+
+    def answers_hall_call(self, elevator: 'Elevator', floor: int) -> bool:
+        """Checks whether the car stops for the landing calls of `floor`, here always."""
+        return True
+
+    def should_stop(self, elevator: 'Elevator') -> bool:
+        """Checks whether the car opens its doors on the floor it has just reached."""
+        return self.stops_at(elevator, elevator.current_floor)
+
+    def next_stop(self, elevator: 'Elevator') -> Optional[int]:
+        """Returns the first floor ahead in the travel direction the car stops on, None when there is none."""
+        floor = elevator.current_floor
+        if elevator.direction == UP_NAME:
+            candidates = elevator.queue.above(floor)
+        elif elevator.direction == DOWN_NAME:
+            candidates = reversed(elevator.queue.below(floor))
+        else:
+            return None
+        for candidate in candidates:
+            if self.stops_at(elevator, candidate):
+                return candidate
+        return None
+
+    def clear_stop(self, elevator: 'Elevator') -> None:
+        """Removes the calls answered on the current floor, here every call of the floor."""
+        if not elevator.doors_open:
+            return
+        elevator.remove_floor_from_queue(elevator.current_floor)
+        elevator.boarding_direction = None
+
+
+class LegacyScheduler(Scheduler):
+    """
+    The original behaviour: head for the closest call, keep going while there are calls ahead and stop
+    on every called floor whichever way the callers travel.
+    """
+
+    def choose_direction(self, elevator: 'Elevator') -> None:
+        queue = self.calls(elevator)
+        current_floor = elevator.current_floor
+        closest_floor = self.closest_call(elevator)
+        has_calls_above = queue.has_above(current_floor)
+        has_calls_below = queue.has_below(current_floor)
+
+        # If there are no floors in the queue, the elevator remains idle.
+        if closest_floor is None:
+            elevator.direction = None
+            return
+
+        # If the elevator is currently idle, set the direction towards the closest floor.
+        if not elevator.direction:
+            elevator.direction = direction_towards(closest_floor, current_floor)
+            return
+
+        # If the elevator is currently going up, but there are no more calls above and there are calls below.
+        if elevator.direction == UP_NAME and not has_calls_above and has_calls_below:
+            elevator.direction = DOWN_NAME
+            return
+
+        # If the elevator is currently going down, but there are no more calls below and there are calls above.
+        if elevator.direction == DOWN_NAME and not has_calls_below and has_calls_above:
+            elevator.direction = UP_NAME
+            return
+
+        # If the elevator has reached the end of the shaft with no call ahead, it heads for the closest call.
+        if current_floor == (elevator.top_floor if elevator.direction == UP_NAME else elevator.lower_floor):
+            elevator.direction = direction_towards(closest_floor, current_floor)
+
+
+class LookScheduler(Scheduler):
+    """
+    LOOK: sweep in one direction while there are calls ahead, then turn around at the last one.
+    Unlike the legacy scheduler, a car with only its current floor left in the queue stops there
+    instead of moving on.
+    """
+
+    def choose_direction(self, elevator: 'Elevator') -> None:
+        queue = self.calls(elevator)
+        current_floor = elevator.current_floor
+        if elevator.direction == UP_NAME and queue.has_above(current_floor):
+            return
+        if elevator.direction == DOWN_NAME and queue.has_below(current_floor):
+            return
+        closest_floor = self.closest_call(elevator)
+        elevator.direction = None if closest_floor is None else direction_towards(closest_floor, current_floor)
+
+
+class ScanScheduler(Scheduler):
+    """SCAN: while there are calls, sweep all the way to the end of the shaft before turning around."""
+
+    def choose_direction(self, elevator: 'Elevator') -> None:
+        queue = elevator.queue
+        current_floor = elevator.current_floor
+        if not queue:
+            elevator.direction = None
+        elif elevator.direction == UP_NAME:
+            if current_floor == elevator.top_floor:
+                elevator.direction = DOWN_NAME
+        elif elevator.direction == DOWN_NAME:
+            if current_floor == elevator.lower_floor:
+                elevator.direction = UP_NAME
+        else:
+            elevator.direction = direction_towards(self.closest_call(elevator), current_floor)
+
+
+class CollectiveSelectiveScheduler(LookScheduler):
+    """
+    Collective-selective control: sweeps like LOOK, but on the way stops only for the riders' floors and
+    for landing calls in its travel direction. A landing call in the other direction is answered on the
+    way back, or right away when it is the last call ahead. Only the callers going the served direction
+    board, the others keep their call registered.
+    """
+
+    def answers_hall_call(self, elevator: 'Elevator', floor: int) -> bool:
+        if elevator.direction is None:
+            return True
+        if elevator.direction == UP_NAME:
+            return floor in elevator.up_calls or not elevator.queue.has_above(floor)
+        return floor in elevator.down_calls or not elevator.queue.has_below(floor)
+
+    def serving_direction(self, elevator: 'Elevator') -> Optional[str]:
+        """Returns the direction of the callers served on the current floor, None to serve everyone."""
+        floor = elevator.current_floor
+        if elevator.direction == UP_NAME:
+            if floor in elevator.up_calls or elevator.queue.has_above(floor):
+                return UP_NAME
+            return DOWN_NAME if floor in elevator.down_calls else None
+        if elevator.direction == DOWN_NAME:
+            if floor in elevator.down_calls or elevator.queue.has_below(floor):
+                return DOWN_NAME
+            return UP_NAME if floor in elevator.up_calls else None
+        return None
+
+    def clear_stop(self, elevator: 'Elevator') -> None:
+        """Removes the car call and the landing call of the served direction on the current floor."""
+        if not elevator.doors_open:
+            return
+        floor = elevator.current_floor
+        serving = self.serving_direction(elevator)
+        elevator.car_calls.discard(floor)
+        if serving != DOWN_NAME:
+            elevator.up_calls.discard(floor)
+        if serving != UP_NAME:
+            elevator.down_calls.discard(floor)
+        if floor not in elevator.up_calls and floor not in elevator.down_calls:
+            elevator.queue.discard(floor)
+        elevator.boarding_direction = serving
+
+
+class DestinationDispatchScheduler(CollectiveSelectiveScheduler):
+    """
+    Collective-selective control for destination-dispatch panels, where callers enter their destination
+    on the landing. The destinations of the callers picked up on a floor become stops as soon as the car
+    opens there, before anyone has boarded, so they count when the car decides where to go next. A car
+    with admission control cannot tell in advance who will fit, so its stops come from the riders only.
+
+    Attributes:
+        destinations (dict): Destinations entered on the landings, keyed by floor and direction.
+    """
+
+    def __init__(self) -> None:
+        """Initializes the scheduler with no destinations entered."""
+        self.destinations = {}
+
+    def register_hall_call(self, elevator: 'Elevator', call: HallCall) -> None:
+        super().register_hall_call(elevator, call)
+        if call.destination is not None and call.direction is not None:
+            self.destinations.setdefault((call.floor, call.direction), set()).add(call.destination)
+
+    def clear_stop(self, elevator: 'Elevator') -> None:
+        super().clear_stop(elevator)
+        if not elevator.doors_open:
+            return
+        floor = elevator.current_floor
+        for direction in (UP_NAME, DOWN_NAME):
+            if elevator.boarding_direction in (None, direction):
+                destinations = self.destinations.pop((floor, direction), ())
+                if elevator.admission:
+                    continue
+                elevator.queue.update(destinations)
+                elevator.car_calls.update(destinations)
+
+
+SCHEDULERS = {
+    'legacy': LegacyScheduler,
+    'look': LookScheduler,
+    'scan': ScanScheduler,
+    'collective': CollectiveSelectiveScheduler,
+    'destination': DestinationDispatchScheduler,
+}
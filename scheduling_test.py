@@ -0,0 +1,164 @@
+from constants import UP_NAME, DOWN_NAME
+from dispatcher import ElevatorBank
+from elevator import Elevator, Passenger
+from events import NullSink
+from scheduling import (CollectiveSelectiveScheduler, DestinationDispatchScheduler, HallCall, LookScheduler,
+                        ScanScheduler, SCHEDULERS)
+from simulation import SIMULATIONS, SimulationConfig
+from utils import set_bank_for_passengers, set_elevator_for_passengers
+
+
+def run_until_idle(car: Elevator, ticks: int = 30) -> list:
+    """Moves the car until its queue is empty and returns the floors it opened on."""
+    stops = []
+    for _ in range(ticks):
+        if not car.queue:
+            break
+        car.move()
+        if car.doors_open:
+            stops.append(car.current_floor)
+    return stops
+
+
+class TestSchedulers:
+    """Test suite for the directional hall calls and the car schedulers."""
+
+    def test_hall_calls_carry_the_direction(self):
+        """A passenger's call registers the button of their travel direction."""
+        car = Elevator(sink=NullSink())
+        up, down = Passenger(current_floor=3, target_floor=7), Passenger(current_floor=5, target_floor=2)
+        set_elevator_for_passengers([up, down], car)
+        up.call_elevator()
+        down.call_elevator()
+        assert car.queue == {3, 5}
+        assert car.up_calls == {3} and car.down_calls == {5}
+        assert not car.car_calls
+
+    def test_look_stops_on_its_only_call(self):
+        """LOOK opens on the current floor when it is the last call instead of moving past it."""
+        car = Elevator(sink=NullSink(), scheduler=LookScheduler())
+        car.current_floor = 4
+        car.direction = UP_NAME
+        car.add_floor_to_queue(4)
+        car.move()
+        assert car.current_floor == 4 and car.doors_open
+
+    def test_scan_sweeps_to_the_end_of_the_shaft(self):
+        """SCAN travels to the top floor before answering a call below."""
+        car = Elevator(sink=NullSink(), scheduler=ScanScheduler())
+        car.current_floor = 6
+        car.direction = UP_NAME
+        car.add_floor_to_queue(8, 2)
+        floors = []
+        while car.queue:
+            car.move()
+            floors.append(car.current_floor)
+        assert max(floors) == 10
+        assert floors[-1] == 2
+
+    def test_collective_selective_skips_calls_in_the_other_direction(self):
+        """Going up, the car passes a down call and answers it on the way back."""
+        car = Elevator(sink=NullSink(), scheduler=CollectiveSelectiveScheduler())
+        car.add_floor_to_queue(8)
+        car.add_hall_call(HallCall(4, DOWN_NAME))
+        car.add_hall_call(HallCall(6, UP_NAME))
+        assert run_until_idle(car) == [6, 8, 4]
+
+    def test_collective_selective_answers_the_last_call_in_either_direction(self):
+        """A down call beyond every other call is answered when the car gets there."""
+        car = Elevator(sink=NullSink(), scheduler=CollectiveSelectiveScheduler())
+        car.add_hall_call(HallCall(5, DOWN_NAME))
+        assert run_until_idle(car) == [5]
+        assert car.boarding_direction == DOWN_NAME
+
+    def test_passengers_going_the_other_way_keep_waiting(self):
+        """Only the callers of the served direction board, the others keep their call registered."""
+        car = Elevator(sink=NullSink(), scheduler=CollectiveSelectiveScheduler())
+        bank = ElevatorBank([car])
+        rider = Passenger(current_floor=1, target_floor=9)
+        up, down = Passenger(current_floor=4, target_floor=8), Passenger(current_floor=4, target_floor=2)
+        set_bank_for_passengers([rider, up, down], bank)
+        car.open_doors()
+        for passenger in (rider, up, down):
+            passenger._is_resting = False
+            passenger.move()
+        assert rider in car.passengers
+        for _ in range(3):
+            bank.move()
+        assert car.current_floor == 4 and car.boarding_direction == UP_NAME
+        assert up in car.passengers and down not in car.passengers
+        assert bank.waiting[(car, 4)] == [down]
+        assert car.down_calls == {4}
+        for _ in range(20):
+            bank.move()
+        assert down.current_floor == 2 and rider.current_floor == 9 and up.current_floor == 8
+
+    def test_destinations_become_stops_on_pickup(self):
+        """With a destination panel the car knows where its callers go as soon as it opens for them."""
+        scheduler = DestinationDispatchScheduler()
+        car = Elevator(sink=NullSink(), scheduler=scheduler)
+        car.add_hall_call(HallCall(3, UP_NAME, 7))
+        car.add_hall_call(HallCall(3, UP_NAME, 9))
+        assert 7 not in car.queue
+        car.move()
+        car.move()
+        assert car.current_floor == 3 and car.doors_open
+        assert car.queue == {7, 9} and car.car_calls == {7, 9}
+        assert not scheduler.destinations
+
+    def test_full_car_passes_landing_calls_by(self):
+        """A full car with admission control stops only for its riders, the landing calls wait for its return."""
+        for scheduler in SCHEDULERS.values():
+            car = Elevator(capacity=1, admission=True, scheduler=scheduler(), sink=NullSink())
+            rider = Passenger(current_floor=1, target_floor=5)
+            set_elevator_for_passengers([rider], car)
+            car.open_doors()
+            rider.enter_the_elevator()
+            rider.select_floor()
+            car.add_hall_call(HallCall(3, UP_NAME, 6))
+            assert run_until_idle(car) == [5, 3]
+
+    def test_full_car_leaves_a_landing_call_on_its_floor(self):
+        """A full idle car with a landing call on its own floor takes its rider home before serving the call."""
+        for scheduler in SCHEDULERS.values():
+            car = Elevator(capacity=1, admission=True, scheduler=scheduler(), sink=NullSink())
+            car.current_floor = 5
+            rider = Passenger(current_floor=5, target_floor=1)
+            set_elevator_for_passengers([rider], car)
+            car.open_doors()
+            rider.enter_the_elevator()
+            rider.select_floor()
+            car.close_doors()
+            car.add_hall_call(HallCall(5, UP_NAME, 9))
+            assert run_until_idle(car) == [1, 5]
+
+    def test_legacy_car_turns_at_the_end_of_the_shaft(self):
+        """A legacy car with only its own floor queued at the top or bottom of the shaft does not run off it."""
+        for floor, direction in ((10, UP_NAME), (1, DOWN_NAME)):
+            car = Elevator(top_floor=10, admission=True, sink=NullSink())
+            car.current_floor = floor
+            car.direction = direction
+            car.open_doors()
+            car.add_hall_call(HallCall(floor, UP_NAME))
+            car.move()
+            assert car.current_floor == floor and car.doors_open
+
+    def test_admission_runs_stay_in_the_shaft(self):
+        """Seeded admission runs that used to drive a legacy car off the shaft deliver their passengers."""
+        for engine, seed, zones in (('tick', 16, 1), ('event', 19, 1), ('tick', 16, 2), ('event', 19, 2)):
+            config = SimulationConfig(engine=engine, cars=4, admission=True, top_floor=12, passenger_count=80,
+                                      ticks=2000, seed=seed, zones=zones, naming='id', metrics=True)
+            result = SIMULATIONS[engine](config).run()
+            assert result.trips > 0 and result.metrics.refusals > 0
+
+    def test_every_scheduler_runs(self):
+        """Every scheduler delivers passengers with both engines and several cars."""
+        for name in SCHEDULERS:
+            for engine in SIMULATIONS.values():
+                config = SimulationConfig(ticks=500, passenger_count=60, cars=2, seed=1, scheduler=name,
+                                          dispatch='destination')
+                simulation = engine(config)
+                result = simulation.run()
+                assert result.trips > 0
+                assert all(isinstance(car.scheduler, SCHEDULERS[name]) for car in simulation.bank.elevators)
+                assert simulation.bank.elevators[0].scheduler is not simulation.bank.elevators[1].scheduler
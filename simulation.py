@@ -0,0 +1,585 @@
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from itertools import islice
+from random import Random
+from time import perf_counter
+from typing import Optional
+
+from building import Building
+from clock import create_clock
+from constants import (DEFAULT_CAPACITY, DEFAULT_LOWER_FLOOR, DEFAULT_TOP_FLOOR, DEFAULT_PASSENGER_COUNT,
+                       DEFAULT_TICKS, DEFAULT_TICK_DURATION, TRIP_PROBABILITY, TICK_ENGINE, EVENT_ENGINE,
+                       KINEMATIC_ENGINE, TICK_SECONDS, UP_NAME)
+from dispatcher import create_bank
+from elevator import Passenger, generate_random_passengers
+from engine import EventQueue, geometric_delay
+from events import BufferedTextSink, EventLevel, EventSink, FanOutSink, NullSink
+from kinematics import Kinematics
+from liveview import DEFAULT_FRAME_RATE, LiveView
+from metrics import HANDLING_CAPACITY_WINDOW, MetricsCollector, MetricsReport
+from naming import create_naming
+from population import PassengerPopulation
+from profiling import PhaseProfiler, ProfileReport
+from tracefile import TraceWriter
+from traffic import Arrival, create_traffic
+from utils import set_bank_for_passengers
+
+
+@dataclass
+class SimulationConfig:
+    """
+    Parameters of a single simulation run.
+
+    Attributes:
+        ticks (int): Number of ticks to simulate.
+        passenger_count (int): Number of passengers living in the building.
+        capacity (int): The maximum number of passengers a car can carry.
+        max_load (float or None): The maximum total weight of the passengers of a car in kg, None for no limit.
+        admission (bool): Full cars turn passengers away at the door, instead of pushing the overload out
+            before departure.
+        lower_floor (int): The lowest floor the cars can reach.
+        top_floor (int): The highest floor the cars can reach.
+        cars (int): Number of cars in the elevator bank.
+        zones (int): Number of low- to high-rise zones of consecutive floors, each served by its own cars.
+        sky_lobbies (tuple): Floors where the building is split into sections reached by shuttle cars, every
+            section with its own zones.
+        shuttles (int): Number of cars linking the lobby with the sky lobbies, out of `cars`.
+        parking (str): Name of the policy deciding where the idle cars wait, see `parking.PARKING_POLICIES`.
+        dispatch (str): Name of the policy assigning hall calls to cars, see `dispatcher.POLICIES`.
+        scheduler (str): Name of the scheduler deciding where each car goes and stops, see `scheduling.SCHEDULERS`.
+        realtime (bool): Paces every tick against the wall clock instead of running at CPU speed.
+        tick_duration (float): Wall-clock seconds per tick in real-time mode.
+        show_state (bool): Prints the state of the cars after every tick.
+        live (bool): Draws a live view of the cars in the terminal as the run goes, see `liveview`.
+        frame_rate (float): Maximum number of frames per wall-clock second of the live view.
+        log_level (EventLevel): The lowest level of events printed during the run, nothing is printed by default.
+        naming (str): How passenger names are generated, see `naming.NAMINGS`.
+        columnar (bool): Stores the passengers in a compact `PassengerPopulation` instead of one object each.
+        seed (int or None): Seed of the random generators of the run, a fresh random seed when None.
+        engine (str): 'tick' polls every passenger on every tick, 'event' schedules only the moments
+            when something happens, 'kinematic' does the same in continuous time with realistic car timings.
+        kinematics (Kinematics): Speeds, door and boarding times of the cars in the kinematic engine.
+        metrics (bool): Measures the wait and journey times of the passengers and the work of the cars.
+        trace (str or None): Binary file every event of the run is written to, see `tracefile`.
+        traffic (str or None): A profile of `traffic.TRAFFIC_PROFILES` or a CSV file of recorded arrivals.
+            People then arrive as the traffic dictates and leave once delivered, instead of the
+            `passenger_count` residents travelling at random.
+        traffic_rate (float): Average number of arrivals per minute of the traffic profiles.
+        profile (bool): Measures the time spent in every phase of the run, see `profiling`.
+    """
+    ticks: int = DEFAULT_TICKS
+    passenger_count: int = DEFAULT_PASSENGER_COUNT
+    capacity: int = DEFAULT_CAPACITY
+    max_load: Optional[float] = None
+    admission: bool = False
+    lower_floor: int = DEFAULT_LOWER_FLOOR
+    top_floor: int = DEFAULT_TOP_FLOOR
+    cars: int = 1
+    zones: int = 1
+    sky_lobbies: tuple = ()
+    shuttles: int = 0
+    parking: str = 'stay'
+    dispatch: str = 'nearest'
+    scheduler: str = 'legacy'
+    realtime: bool = False
+    tick_duration: float = DEFAULT_TICK_DURATION
+    show_state: bool = False
+    live: bool = False
+    frame_rate: float = DEFAULT_FRAME_RATE
+    log_level: EventLevel = EventLevel.OFF
+    naming: str = 'faker'
+    columnar: bool = False
+    seed: Optional[int] = None
+    engine: str = TICK_ENGINE
+    kinematics: Kinematics = field(default_factory=Kinematics)
+    metrics: bool = False
+    trace: Optional[str] = None
+    traffic: Optional[str] = None
+    traffic_rate: float = 10.0
+    profile: bool = False
+
+
+@dataclass
+class SimulationResult:
+    """
+    Summary of a finished simulation run.
+
+    Attributes:
+        ticks (int): Number of simulated ticks.
+        elapsed (float): Wall-clock seconds the run took.
+        trips (int): Number of passengers delivered to their target floor.
+        waiting (int): Number of passengers waiting for a car when the run ended.
+        metrics (MetricsReport or None): Wait and journey times and car usage, when measured.
+        profile (ProfileReport or None): Time spent in every phase of the run, when profiled.
+    """
+    ticks: int
+    elapsed: float
+    trips: int = 0
+    waiting: int = 0
+    metrics: Optional[MetricsReport] = None
+    profile: Optional[ProfileReport] = None
+
+    @property
+    def ticks_per_second(self) -> float:
+        """Returns the simulation throughput in ticks per wall-clock second."""
+        return self.ticks / self.elapsed if self.elapsed else float('inf')
+
+
+class Simulation:
+    """
+    Runs the elevator bank and its passengers tick by tick on a virtual or real-time clock.
+
+    Attributes:
+        config (SimulationConfig): Parameters of the run.
+        clock (VirtualClock): The clock driving the simulation.
+        sink (EventSink): Receives the events of the cars and the passengers.
+        rng (Random): Source of every random decision of the run.
+        naming: Generates the passenger names when they are first rendered.
+        bank (ElevatorBank): The simulated cars and their dispatcher.
+        building (Building or None): The floors served by every car, when the config splits the building into
+            zones or sections.
+        elevator (Elevator): The first car of the bank.
+        passengers (list or PassengerPopulation): Passengers living in the building. With a traffic source,
+            a dict used as a set of the passengers on their way.
+        traffic (TrafficSource or None): Produces the arrivals when the config names a traffic source.
+        metrics (MetricsCollector or None): Measures the run when the config asks for metrics.
+        trace (TraceWriter or None): Writes the events to the trace file of the config.
+        profiler (PhaseProfiler or None): Times the phases of the runs when the config asks for profiling.
+        view (LiveView or None): Draws the cars in the terminal when the config asks for a live view.
+        clock_unit (float): Seconds of building time in one unit of the clock, a tick is a minute.
+        kinematics (Kinematics or None): Timing model of the cars, None when a car moves a floor per tick.
+    """
+    clock_unit = TICK_SECONDS
+    kinematics = None
+
+    def __init__(self, config: Optional[SimulationConfig] = None, sink: Optional[EventSink] = None) -> None:
+        """Builds the elevator bank and the passengers described by the config."""
+        self.config = config or SimulationConfig()
+        self.clock = self._create_clock()
+        self.metrics = None
+        if self.config.metrics:
+            self.metrics = MetricsCollector(self.clock, HANDLING_CAPACITY_WINDOW / self.clock_unit)
+        self.trace = None
+        if self.config.trace:
+            self.trace = TraceWriter(self.config.trace, self.clock)
+        self.view = LiveView(self, frame_rate=self.config.frame_rate) if self.config.live else None
+        self.sink = self._combine_sinks(sink)
+        self.profiler = PhaseProfiler() if self.config.profile else None
+        self.rng = Random(self.config.seed)
+        self.naming = create_naming(self.config.naming, self.rng.getrandbits(32))
+        self.building = None
+        if self.config.zones > 1 or self.config.sky_lobbies:
+            self.building = Building.zoned(self.config.lower_floor, self.config.top_floor, self.config.cars,
+                                           self.config.zones, self.config.sky_lobbies, self.config.shuttles)
+        self.bank = create_bank(self.config.cars, self.config.dispatch, self.config.scheduler, self.building,
+                                self.config.parking, self.kinematics,
+                                capacity=self.config.capacity,
+                                max_load=self.config.max_load,
+                                admission=self.config.admission,
+                                lower_floor=self.config.lower_floor,
+                                top_floor=self.config.top_floor,
+                                sink=self.sink)
+        self.elevator = self.bank.elevators[0]
+        if self.trace:
+            # The cars get their trace ids in the order of the bank.
+            for car in self.bank.elevators:
+                self.trace.car_id(car)
+        self.traffic = create_traffic(self.config.traffic, self.config.traffic_rate)
+        if self.traffic:
+            if self.config.columnar:
+                raise ValueError("The columnar store holds a fixed population, traffic sources bring new passengers.")
+            self.passengers = {}
+            # The arrivals have a generator of their own, so they do not depend on what the cars do.
+            self._arrival_seed = self.rng.getrandbits(32)
+            self._arrivals = self._create_arrivals()
+            self._arrivals_taken = 0
+            self._pending_arrival = None
+            self._admitted = 0
+            return
+        generate = PassengerPopulation.generate if self.config.columnar else generate_random_passengers
+        self.passengers = generate(self.config.passenger_count,
+                                   self.config.lower_floor,
+                                   self.config.top_floor,
+                                   self.rng,
+                                   self.naming)
+        set_bank_for_passengers(self.passengers, self.bank)
+
+    def _create_clock(self):
+        """Creates the clock of the run, paced against the wall clock in real-time mode."""
+        return create_clock(self.config.realtime, self.config.tick_duration)
+
+    def _combine_sinks(self, sink: Optional[EventSink]) -> EventSink:
+        """Returns the sink receiving the events: `sink` or the one of the config, the metrics and the trace."""
+        sinks = [sink if sink else create_sink(self.config.log_level)]
+        sinks.extend(extra for extra in (self.metrics, self.trace, self.view) if extra)
+        return sinks[0] if len(sinks) == 1 else FanOutSink(*sinks)
+
+    def attach_sink(self, sink: Optional[EventSink] = None) -> None:
+        """Sends the events of the cars and the passengers to `sink`, or to a sink printing the configured level."""
+        self.sink = self._combine_sinks(sink)
+        for car in self.bank.elevators:
+            car.sink = self.sink
+
+    @property
+    def lobby(self) -> int:
+        """Returns the entrance floor of the building, where the traffic profiles enter and leave it."""
+        return self.bank.lobby
+
+    def _create_arrivals(self):
+        """Starts the arrivals of the traffic source from the beginning."""
+        return self.traffic.arrivals(Random(self._arrival_seed), self.config.lower_floor, self.config.top_floor,
+                                     self.lobby)
+
+    def next_arrival(self) -> Optional[Arrival]:
+        """Takes the next arrival of the traffic source, None once it has run dry."""
+        arrival = next(self._arrivals, None)
+        if arrival:
+            self._arrivals_taken += 1
+        return arrival
+
+    def __getstate__(self) -> dict:
+        """
+        Returns the state saved in a snapshot. The trace file stays with the original run, and a running
+        traffic source is saved as the number of arrivals taken from it. The live view stays with the terminal.
+        """
+        state = dict(self.__dict__, trace=None, view=None)
+        state.pop('_arrivals', None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Restores a snapshot, replaying the traffic source up to the arrivals already taken."""
+        self.__dict__.update(state)
+        if self.traffic:
+            self._arrivals = self._create_arrivals()
+            next(islice(self._arrivals, self._arrivals_taken, self._arrivals_taken), None)
+
+    def admit(self, arrival: Arrival) -> Passenger:
+        """Creates the passenger of an arrival, about to call a car."""
+        passenger = Passenger(current_floor=arrival.origin,
+                              target_floor=arrival.destination,
+                              passenger_id=self._admitted,
+                              naming=self.naming)
+        passenger.set_bank(self.bank)
+        passenger._is_resting = False
+        self.passengers[passenger] = None
+        self._admitted += 1
+        return passenger
+
+    def update_travellers(self) -> None:
+        """
+        Lets the delivered passengers leave, sends the ones pushed out of a car calling again and admits
+        the arrivals of the current tick.
+        """
+        for passenger in [passenger for passenger in self.passengers if passenger._is_resting]:
+            if passenger.current_floor == passenger.target_floor:
+                del self.passengers[passenger]
+            else:
+                passenger._is_resting = False
+        end = (self.clock.now + 1) * self.clock_unit
+        arrival = self._pending_arrival or self.next_arrival()
+        while arrival and arrival.time < end:
+            self.admit(arrival)
+            arrival = self.next_arrival()
+        self._pending_arrival = arrival
+
+    def step(self) -> None:
+        """Simulates a single tick: the cars move first, then every passenger acts."""
+        rng = self.rng
+        self.bank.move(rng)
+        if self.traffic:
+            self.update_travellers()
+        for passenger in self.passengers:
+            passenger.move(rng)
+        if self.config.show_state:
+            self.sink.flush()
+            print(self.bank)
+        elif self.config.realtime:
+            self.sink.flush()
+        self.clock.tick()
+        if self.view:
+            self.view.refresh()
+
+    def run(self, ticks: Optional[int] = None) -> SimulationResult:
+        """Runs `ticks` more ticks, the configured number by default, and returns the run summary."""
+        ticks = self.config.ticks if ticks is None else ticks
+        started = perf_counter()
+        with self.profiler or nullcontext():
+            for _ in range(ticks):
+                self.step()
+            self.close()
+        return self.result(perf_counter() - started, ticks)
+
+    def close(self) -> None:
+        """Writes out the buffered events, closes the trace file and draws the last frame of the live view."""
+        self.sink.flush()
+        if self.trace:
+            self.trace.close()
+        if self.view:
+            self.view.close()
+
+    def result(self, elapsed: float, ticks: int) -> SimulationResult:
+        """Summarizes the state of the simulation after a run of `ticks` ticks that took `elapsed` seconds."""
+        return SimulationResult(ticks=ticks,
+                                elapsed=elapsed,
+                                trips=sum(car.trips for car in self.bank.elevators),
+                                waiting=sum(not passenger._is_resting and not passenger._in_elevator
+                                            for passenger in self.passengers),
+                                metrics=self.metrics.report() if self.metrics else None,
+                                profile=self.profiler.report() if self.profiler else None)
+
+
+class EventDrivenSimulation(Simulation):
+    """
+    Discrete-event version of the simulation.
+
+    Instead of rolling the 1 in 51 dice for every resting passenger on every tick, the start of each
+    passenger's next trip is sampled from the equivalent geometric distribution and put on the event
+    queue. A car is scheduled only while it has floors in its queue or open doors, so the cost of a run
+    grows with the number of trips rather than with the population size times the duration.
+
+    Attributes:
+        events (EventQueue): Scheduled trip starts and car moves, by the name of the method handling them.
+            The method is looked up when the event runs, so a profiler enabled or disabled in between is
+            taken into account.
+        tick_length (float): Units of the clock in one tick.
+    """
+
+    def __init__(self, config: Optional[SimulationConfig] = None, sink: Optional[EventSink] = None) -> None:
+        """Builds the building and schedules the first trip of every passenger."""
+        super().__init__(config, sink)
+        self.events = EventQueue()
+        self.tick_length = 1
+        self._scheduled_cars = set()
+        if self.traffic:
+            self.schedule_next_arrival()
+        for passenger in self.passengers:
+            self.schedule_trip(passenger, self.clock.now)
+
+    def trip_delay(self) -> float:
+        """Samples the time a resting passenger stays on their floor."""
+        return geometric_delay(TRIP_PROBABILITY, self.rng.random())
+
+    def schedule_trip(self, passenger, now: float) -> None:
+        """
+        Samples when the resting passenger decides to go somewhere else. With a traffic source, a delivered
+        passenger leaves instead, and a passenger pushed out of a car calls again right away, as does a
+        passenger changing cars.
+        """
+        if self.traffic:
+            if passenger.current_floor == passenger.target_floor:
+                del self.passengers[passenger]
+            else:
+                self.events.schedule(now, 'resume_trip', passenger)
+            return
+        if not passenger._is_resting:
+            self.events.schedule(now, 'resume_trip', passenger)
+            return
+        self.events.schedule(now + self.trip_delay(), 'start_trip', passenger)
+
+    def schedule_next_arrival(self) -> None:
+        """Puts the next arrival of the traffic source on the event queue."""
+        arrival = self.next_arrival()
+        if arrival:
+            self.events.schedule(arrival.time / self.clock_unit, 'arrive', arrival)
+
+    def arrive(self, arrival: Arrival) -> None:
+        """A person arrives on a landing and calls a car."""
+        self.schedule_next_arrival()
+        self.begin_trip(self.admit(arrival))
+
+    def start_trip(self, passenger) -> None:
+        """The passenger picks a new target floor and calls a car."""
+        passenger._is_resting = False
+        passenger.set_a_new_target(self.rng)
+        self.begin_trip(passenger)
+
+    def resume_trip(self, passenger) -> None:
+        """The passenger calls a car again after being pushed out of one."""
+        passenger._is_resting = False
+        self.begin_trip(passenger)
+
+    def begin_trip(self, passenger) -> None:
+        """The passenger takes a car standing open on their floor or calls one."""
+        car = self.bank.car_with_open_doors_at(passenger.current_floor, passenger.travel_direction, passenger)
+        if car:
+            passenger.set_elevator(car)
+            passenger.enter_the_elevator()
+            passenger.select_floor()
+        else:
+            passenger.call_elevator()
+        self.wake_car(passenger._elevator)
+
+    def wake_car(self, car) -> None:
+        """Schedules the next move of the car unless it is already scheduled."""
+        if car not in self._scheduled_cars:
+            self._scheduled_cars.add(car)
+            self.events.schedule(self.clock.now + 1, 'move_car', car)
+
+    def move_car(self, car) -> None:
+        """Moves the car one step, then lets the passengers in and out."""
+        self._scheduled_cars.discard(car)
+        riders = list(car.passengers)
+        car.move(self.rng)
+        for passenger in riders:
+            if passenger not in car.passengers:
+                self.schedule_trip(passenger, self.clock.now)
+        if car.doors_open:
+            for passenger in self.bank.board_waiting_passengers(car):
+                self.wake_car(passenger._elevator)
+        if self.config.show_state:
+            self.sink.flush()
+            print(car)
+        if car.queue or car.doors_open or self.bank.park_if_idle(car):
+            self.wake_car(car)
+
+    def step(self) -> None:
+        """Processes every event scheduled for the earliest pending time."""
+        time = self.events.peek_time()
+        self.clock.advance_to(time)
+        while self.events and self.events.peek_time() == time:
+            _, callback, args = self.events.pop()
+            getattr(self, callback)(*args)
+        if self.config.realtime:
+            self.sink.flush()
+        if self.view:
+            self.view.refresh()
+
+    def run(self, ticks: Optional[int] = None) -> SimulationResult:
+        """
+        Processes the events scheduled in the next `ticks` ticks, the configured number by default, and
+        returns the run summary.
+        """
+        ticks = self.config.ticks if ticks is None else ticks
+        end = self.clock.now + ticks * self.tick_length
+        started = perf_counter()
+        with self.profiler or nullcontext():
+            while self.events and self.events.peek_time() < end:
+                self.step()
+            self.clock.advance_to(end)
+            self.close()
+        return self.result(perf_counter() - started, ticks)
+
+
+class KinematicSimulation(EventDrivenSimulation):
+    """
+    Discrete-event simulation in continuous time, with the cars timed by a kinematic model.
+
+    Time is measured in seconds. A car runs express to its next stop in a single event that lasts as
+    long as the jerk-limited drive takes over that distance, and a stop lasts the door times plus the
+    boarding time of every passenger getting in or out. Passengers start their trips as in the other
+    engines, a tick of the passenger model lasting `Kinematics.trip_period` seconds, so a run covers
+    `ticks` such periods. Calls made while a car is travelling are taken into account at its next stop.
+
+    Attributes:
+        kinematics (Kinematics): Timing model of the cars.
+    """
+    clock_unit = 1
+
+    def __init__(self, config: Optional[SimulationConfig] = None, sink: Optional[EventSink] = None) -> None:
+        """Builds the building, schedules the first trips and runs the clock in seconds."""
+        config = config or SimulationConfig()
+        self.kinematics = config.kinematics
+        super().__init__(config, sink)
+        self.tick_length = self.kinematics.trip_period
+
+    def _create_clock(self):
+        """Creates the clock of the run, counting seconds."""
+        return create_clock(self.config.realtime, self.config.tick_duration / self.kinematics.trip_period)
+
+    def trip_delay(self) -> float:
+        """Samples the seconds a resting passenger stays on their floor."""
+        return super().trip_delay() * self.kinematics.trip_period
+
+    def wake_car(self, car) -> None:
+        """Dispatches an idle car right away, a busy car takes the new calls into account at its next stop."""
+        if car not in self._scheduled_cars:
+            self._scheduled_cars.add(car)
+            self.events.schedule(self.clock.now, 'dispatch_car', car)
+
+    def dispatch_car(self, car) -> None:
+        """Sends the car with closed doors to its next stop, its parking floor or lets it rest."""
+        if not car.queue:
+            self.bank.park_if_idle(car)
+        car.choose_direction()
+        if not car.queue:
+            self._scheduled_cars.discard(car)
+            car.rest()
+            return
+        floor = car.scheduler.next_stop(car)
+        if floor is None and car.direction is not None:
+            # No stop ahead yet, the car moves on by a single floor like in the other engines.
+            floor = car.current_floor + (1 if car.direction == UP_NAME else -1)
+            if not car.lower_floor <= floor <= car.top_floor:
+                car.direction = None
+        if floor is None or car.direction is None:
+            floor = car.current_floor
+        arrival = self.clock.now + self.kinematics.flight_time(floor - car.current_floor)
+        self.events.schedule(arrival, 'arrive_car', car, floor)
+
+    def arrive_car(self, car, floor: int) -> None:
+        """The car reaches `floor` and opens its doors when it stops there."""
+        if floor != car.current_floor:
+            car.travel_to(floor)
+        if not car.scheduler.should_stop(car):
+            if car.direction is None:
+                self._scheduled_cars.discard(car)
+                car.rest()
+            else:
+                self.dispatch_car(car)
+            return
+        self.events.schedule(self.clock.now + self.kinematics.door_open_time, 'open_car_doors', car)
+
+    def open_car_doors(self, car) -> None:
+        """The doors are open: the riders of the floor get out and the waiting passengers get in."""
+        car.open_doors()
+        riders = list(car.passengers)
+        car.disembark_passengers_if_needed()
+        car.scheduler.clear_stop(car)
+        alighted = [passenger for passenger in riders if passenger not in car.passengers]
+        for passenger in alighted:
+            self.schedule_trip(passenger, self.clock.now)
+        staying = len(car.passengers)
+        for passenger in self.bank.board_waiting_passengers(car):
+            if passenger._elevator is not car:
+                self.wake_car(passenger._elevator)
+        transfers = len(alighted) + len(car.passengers) - staying
+        if self.config.show_state:
+            self.sink.flush()
+            print(car)
+        self.events.schedule(self.clock.now + transfers * self.kinematics.boarding_time, 'close_car_doors', car)
+
+    def close_car_doors(self, car) -> None:
+        """
+        Pushes out the overload, then closes the doors and dispatches the car once they are shut. A car
+        with admission control picks its direction while the doors are still open, as in the tick engine,
+        so it does not stay for the callers it turned away.
+        """
+        riders = list(car.passengers)
+        car.eject_random_passenger(self.rng)
+        for passenger in riders:
+            if passenger not in car.passengers:
+                self.schedule_trip(passenger, self.clock.now)
+        if car.admission:
+            car.choose_direction()
+        car.close_doors()
+        self.events.schedule(self.clock.now + self.kinematics.door_close_time, 'dispatch_car', car)
+
+
+SIMULATIONS = {
+    TICK_ENGINE: Simulation,
+    EVENT_ENGINE: EventDrivenSimulation,
+    KINEMATIC_ENGINE: KinematicSimulation,
+}
+
+
+def create_sink(level: EventLevel) -> EventSink:
+    """Creates a sink printing events at or above `level`, or discarding everything."""
+    if level >= EventLevel.OFF:
+        return NullSink()
+    return BufferedTextSink(level=level)
+
+
+def run_simulation(config: Optional[SimulationConfig] = None) -> SimulationResult:
+    """Runs a simulation of elevator operation and passenger movements."""
+    config = config or SimulationConfig()
+    return SIMULATIONS[config.engine](config).run()
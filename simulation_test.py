@@ -0,0 +1,79 @@
+from clock import RealTimeClock, VirtualClock
+from simulation import SIMULATIONS, Simulation, SimulationConfig, run_simulation
+
+
+class TestSimulation:
+    """Test suite for the simulation runner."""
+
+    def test_fast_forward_is_default(self):
+        """A batch run uses the virtual clock and does not wait for the wall clock."""
+        simulation = Simulation(SimulationConfig(ticks=500, passenger_count=5))
+        assert type(simulation.clock) is VirtualClock
+
+        result = simulation.run()
+        assert result.ticks == 500
+        assert simulation.clock.now == 500
+        assert result.elapsed < 5
+
+    def test_realtime_pacing(self):
+        """A real-time run spends at least `tick_duration` of wall-clock time per tick."""
+        config = SimulationConfig(ticks=5, passenger_count=2, realtime=True, tick_duration=0.01)
+        simulation = Simulation(config)
+        assert isinstance(simulation.clock, RealTimeClock)
+
+        result = simulation.run()
+        assert result.elapsed >= 0.04
+
+    def test_config_is_applied(self):
+        """Elevator settings and passenger count come from the config."""
+        config = SimulationConfig(ticks=300, passenger_count=30, capacity=8, lower_floor=1, top_floor=25)
+        simulation = Simulation(config)
+        assert simulation.elevator.capacity == 8
+        assert simulation.elevator.top_floor == 25
+        assert len(simulation.passengers) == 30
+
+        simulation.run()
+        for passenger in simulation.passengers:
+            assert 1 <= passenger.current_floor <= 25
+            assert 1 <= passenger.target_floor <= 25
+
+    def test_run_simulation_defaults(self):
+        """The module-level runner works without any configuration."""
+        result = run_simulation()
+        assert result.ticks == SimulationConfig().ticks
+
+    def test_seed_reproduces_run(self):
+        """Runs with the same seed are identical, whatever the engine."""
+        def outcome(engine, seed):
+            simulation = engine(SimulationConfig(ticks=1000, passenger_count=30, capacity=2, seed=seed))
+            result = simulation.run()
+            return result.trips, [(passenger.name, passenger.current_floor) for passenger in simulation.passengers]
+
+        for engine in SIMULATIONS.values():
+            assert outcome(engine, 11) == outcome(engine, 11)
+            assert outcome(engine, 11) != outcome(engine, 12)
+
+    def test_admission_control(self):
+        """With admission control no car is ever overloaded, whatever the engine and the crowd."""
+        for engine in SIMULATIONS.values():
+            config = SimulationConfig(ticks=60, passenger_count=600, cars=2, capacity=3, admission=True, metrics=True,
+                                      max_load=200, seed=2, naming='id')
+            simulation = engine(config)
+            result = simulation.run()
+            assert result.metrics.ejections == 0
+            assert result.metrics.refusals > 0
+            assert result.trips > 0
+            for car in simulation.bank.elevators:
+                assert len(car.passengers) <= 3 and car.load <= 200
+
+    def test_zones_and_sky_lobbies(self):
+        """Every engine delivers the passengers of a zoned building through its sky lobby."""
+        for engine in SIMULATIONS:
+            config = SimulationConfig(ticks=300, passenger_count=100, cars=6, zones=2, sky_lobbies=(20,), shuttles=2,
+                                      lower_floor=-1, top_floor=40, capacity=8, seed=3, engine=engine)
+            simulation = SIMULATIONS[engine](config)
+            result = simulation.run()
+            assert result.trips > 50
+            shuttles = simulation.bank.elevators[4:]
+            assert all(car.served_floors == {1, 20} for car in shuttles)
+            assert sum(car.trips for car in shuttles) > 0
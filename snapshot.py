@@ -0,0 +1,91 @@
+import io
+import pickle
+import struct
+import zlib
+from random import Random
+from typing import Optional
+
+from events import EventSink, NullSink
+from exceptions import InvalidSnapshotError
+from simulation import Simulation
+
+MAGIC = b'ELVSNAP\0'
+VERSION = 1
+# Magic and format version, followed by the compressed pickle of the simulation.
+HEADER = struct.Struct('<8sH')
+# Fast compression, the pickled object graph shrinks several times over already.
+COMPRESSION_LEVEL = 1
+# Placeholder of the event sink in the pickle.
+SINK_ID = 'sink'
+
+
+class _SnapshotPickler(pickle.Pickler):
+    """Pickles a simulation without its event sink, which may hold streams and open files."""
+
+    def __init__(self, file, simulation: Simulation) -> None:
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.sink = simulation.sink
+
+    def persistent_id(self, obj) -> Optional[str]:
+        return SINK_ID if obj is self.sink else None
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    """Unpickles a simulation, the cars get a placeholder sink until a real one is attached."""
+
+    def persistent_load(self, pid: str) -> EventSink:
+        if pid != SINK_ID:
+            raise pickle.UnpicklingError(f"unknown persistent id {pid!r}")
+        return NullSink()
+
+
+def snapshot(simulation: Simulation) -> bytes:
+    """
+    Saves the whole state of a simulation, between two steps, as a compressed binary blob: the cars and
+    their calls, the passengers, the pending events, the clock, the random generators and the metrics.
+
+    The event sink is not saved, and neither is the trace writer: a restored simulation writes no trace.
+    """
+    buffer = io.BytesIO()
+    _SnapshotPickler(buffer, simulation).dump(simulation)
+    return HEADER.pack(MAGIC, VERSION) + zlib.compress(buffer.getbuffer(), COMPRESSION_LEVEL)
+
+
+def restore(blob: bytes, sink: Optional[EventSink] = None, seed: Optional[int] = None) -> Simulation:
+    """
+    Recreates the simulation saved in `blob`, sending its events to `sink` or to a sink printing the level
+    of its config. With a `seed`, the random decisions taken from now on differ from those of the
+    original run, so several continuations of the same state can be compared; arrivals of a traffic
+    source come as they would have.
+    """
+    if len(blob) < HEADER.size:
+        raise InvalidSnapshotError("the header is incomplete")
+    magic, version = HEADER.unpack_from(blob)
+    if magic != MAGIC or version != VERSION:
+        raise InvalidSnapshotError(f"not a version {VERSION} snapshot")
+    try:
+        data = zlib.decompress(memoryview(blob)[HEADER.size:])
+    except zlib.error as error:
+        raise InvalidSnapshotError(f"the data is corrupt ({error})")
+    simulation = _SnapshotUnpickler(io.BytesIO(data)).load()
+    simulation.attach_sink(sink)
+    if seed is not None:
+        simulation.rng = Random(seed)
+    return simulation
+
+
+def fork(simulation: Simulation, sink: Optional[EventSink] = None, seed: Optional[int] = None) -> Simulation:
+    """Returns an independent copy of the simulation in its current state, see `restore`."""
+    return restore(snapshot(simulation), sink, seed)
+
+
+def save_snapshot(simulation: Simulation, path: str) -> None:
+    """Writes a snapshot of the simulation to `path`."""
+    with open(path, 'wb') as file:
+        file.write(snapshot(simulation))
+
+
+def load_snapshot(path: str, sink: Optional[EventSink] = None, seed: Optional[int] = None) -> Simulation:
+    """Restores the simulation saved in the file `path`, see `restore`."""
+    with open(path, 'rb') as file:
+        return restore(file.read(), sink, seed)
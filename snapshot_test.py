@@ -0,0 +1,75 @@
+import io
+
+import pytest
+
+from events import BufferedTextSink, EventLevel
+from exceptions import InvalidSnapshotError
+from simulation import SIMULATIONS, SimulationConfig
+from snapshot import fork, load_snapshot, restore, save_snapshot, snapshot
+
+
+def state(simulation) -> tuple:
+    """Returns what a continuation of the simulation is judged by."""
+    cars = simulation.bank.elevators
+    return ([(car.current_floor, car.direction, list(car.queue), len(car.passengers)) for car in cars],
+            [(passenger.name, passenger.current_floor, passenger.target_floor) for passenger in simulation.passengers],
+            simulation.clock.now)
+
+
+class TestSnapshot:
+    """Test suite for saving and restoring simulations."""
+
+    @pytest.mark.parametrize('engine', list(SIMULATIONS))
+    @pytest.mark.parametrize('options', [{}, {'columnar': True}, {'traffic': 'interfloor', 'traffic_rate': 1}])
+    def test_restored_run_continues_identically(self, engine, options):
+        """A restored simulation goes on exactly as the original would have."""
+        config = SimulationConfig(ticks=200, passenger_count=60, cars=2, capacity=4, engine=engine, seed=5,
+                                  naming='id', metrics=True, **options)
+        original = SIMULATIONS[engine](config)
+        original.run()
+        restored = restore(snapshot(original))
+        assert state(restored) == state(original)
+
+        expected, result = original.run(150), restored.run(150)
+        assert result.ticks == expected.ticks == 150
+        assert (result.trips, result.waiting) == (expected.trips, expected.waiting)
+        assert str(result.metrics) == str(expected.metrics)
+        assert state(restored) == state(original)
+
+    def test_fork(self):
+        """Forks are independent: they leave the original alone and a new seed takes them elsewhere."""
+        simulation = SIMULATIONS['event'](SimulationConfig(ticks=300, passenger_count=100, seed=1, naming='id'))
+        simulation.run()
+        before = state(simulation)
+        same, other = fork(simulation), fork(simulation, seed=2)
+        same.run(300)
+        other.run(300)
+        assert state(simulation) == before
+        assert state(same) != state(other)
+        simulation.run(300)
+        assert state(simulation) == state(same)
+
+    def test_sink_and_trace(self, tmp_path):
+        """The restored simulation reports to the new sink and leaves the trace of the original alone."""
+        config = SimulationConfig(ticks=100, passenger_count=20, seed=3, naming='id', trace=str(tmp_path / 'run.trace'))
+        simulation = SIMULATIONS['tick'](config)
+        simulation.run()
+        stream = io.StringIO()
+        restored = restore(snapshot(simulation), sink=BufferedTextSink(stream, level=EventLevel.INFO))
+        assert restored.trace is None
+        restored.run(100)
+        restored.close()
+        assert "Passenger #" in stream.getvalue()
+
+    def test_files(self, tmp_path):
+        """Snapshots are saved to files, and anything else is refused."""
+        path = str(tmp_path / 'warm.snapshot')
+        simulation = SIMULATIONS['kinematic'](SimulationConfig(ticks=10, passenger_count=50, seed=8, naming='id'))
+        simulation.run()
+        save_snapshot(simulation, path)
+        assert state(load_snapshot(path)) == state(simulation)
+
+        blob = snapshot(simulation)
+        for broken in (b'', b'ELVTRACE' + blob[8:], blob[:-10]):
+            with pytest.raises(InvalidSnapshotError):
+                restore(broken)
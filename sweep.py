@@ -0,0 +1,160 @@
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import fields, replace
+from itertools import product
+from typing import Iterator, Optional
+
+from constants import TICK_ENGINE
+from dispatcher import POLICIES
+from events import EventLevel
+from scheduling import SCHEDULERS
+from simulation import SIMULATIONS, SimulationConfig, run_simulation
+
+# Command line options of the sweep and the config fields they vary.
+GRID_OPTIONS = {
+    'capacity': 'capacity',
+    'passengers': 'passenger_count',
+    'top_floor': 'top_floor',
+    'cars': 'cars',
+    'dispatch': 'dispatch',
+    'scheduler': 'scheduler',
+}
+# Version of the job keys, bumped when a change of the simulation makes the stored results stale.
+KEY_VERSION = 1
+# Config fields always part of a job key: the grid axes and the options of the whole sweep.
+KEY_FIELDS = (*GRID_OPTIONS.values(), 'ticks', 'engine')
+# Config fields every job sets itself, which never tell two jobs apart.
+RUN_FIELDS = ('seed', 'realtime', 'show_state', 'log_level')
+
+
+def build_grid(base: SimulationConfig, **axes) -> list:
+    """Returns one config per combination of the values of `axes`, keyword names are config fields."""
+    names = list(axes)
+    return [replace(base, **dict(zip(names, values))) for values in product(*(axes[name] for name in names))]
+
+
+def job_key(config: SimulationConfig, seed: int) -> str:
+    """
+    Returns the identifier of a (config, seed) job in the sweep output: the key version, the seed, the grid
+    axes and the options of the sweep, and any other config field set away from its default. A field added
+    to the config later leaves the keys of the stored results unchanged.
+    """
+    defaults = SimulationConfig()
+    key_fields = {name: getattr(config, name) for name in KEY_FIELDS}
+    for config_field in fields(config):
+        name = config_field.name
+        value = getattr(config, name)
+        if name not in key_fields and name not in RUN_FIELDS and value != getattr(defaults, name):
+            key_fields[name] = value
+    return json.dumps({'version': KEY_VERSION, 'config': key_fields, 'seed': seed}, sort_keys=True, default=str)
+
+
+def run_job(config: SimulationConfig, seed: int) -> dict:
+    """
+    Runs a single simulation seeded with `seed` and returns its summary record.
+
+    Every simulation owns its random generators, so the result depends only on the seed and not on
+    which worker ran the job or what it ran before.
+    """
+    result = run_simulation(replace(config, seed=seed, realtime=False, show_state=False, log_level=EventLevel.OFF))
+    return {
+        'key': job_key(config, seed),
+        'seed': seed,
+        'capacity': config.capacity,
+        'passenger_count': config.passenger_count,
+        'top_floor': config.top_floor,
+        'cars': config.cars,
+        'dispatch': config.dispatch,
+        'scheduler': config.scheduler,
+        'ticks': result.ticks,
+        'trips': result.trips,
+        'waiting': result.waiting,
+        'elapsed': result.elapsed,
+    }
+
+
+def load_completed(output: str) -> set:
+    """Returns the keys of the jobs already recorded in the output file."""
+    completed = set()
+    if not os.path.exists(output):
+        return completed
+    with open(output) as file:
+        for line in file:
+            try:
+                completed.add(json.loads(line)['key'])
+            except (ValueError, KeyError):
+                # A line cut short by an interrupted sweep, the job runs again.
+                continue
+    return completed
+
+
+def _ends_with_newline(path: str) -> bool:
+    """Checks whether the last byte of the file is a line break."""
+    with open(path, 'rb') as file:
+        file.seek(-1, os.SEEK_END)
+        return file.read(1) == b'\n'
+
+
+def run_sweep(configs: list, seeds, output: Optional[str] = None, workers: Optional[int] = None) -> Iterator[dict]:
+    """
+    Runs every config with every seed on a pool of processes and yields the records as they finish.
+
+    When `output` is given each record is appended to it as a JSON line, and jobs already present
+    in the file are skipped, so an interrupted sweep resumes where it stopped.
+    """
+    completed = load_completed(output) if output else set()
+    jobs = [(config, seed) for config in configs for seed in seeds if job_key(config, seed) not in completed]
+    if not jobs:
+        return
+    file = open(output, 'a') if output else None
+    if file and file.tell() and not _ends_with_newline(output):
+        # Keeps the record cut short by an interruption on its own line.
+        file.write('\n')
+    try:
+        with ProcessPoolExecutor(workers) as pool:
+            futures = [pool.submit(run_job, config, seed) for config, seed in jobs]
+            for future in as_completed(futures):
+                record = future.result()
+                if file:
+                    file.write(json.dumps(record) + '\n')
+                    file.flush()
+                yield record
+    finally:
+        if file:
+            file.close()
+
+
+def parse_args(argv=None):
+    """Parses the command line arguments of the sweep."""
+    defaults = SimulationConfig()
+    parser = argparse.ArgumentParser(description="Runs a parameter sweep of the elevator simulation.")
+    parser.add_argument('--capacity', type=int, nargs='+', default=[defaults.capacity])
+    parser.add_argument('--passengers', type=int, nargs='+', default=[defaults.passenger_count])
+    parser.add_argument('--top-floor', type=int, nargs='+', default=[defaults.top_floor])
+    parser.add_argument('--cars', type=int, nargs='+', default=[defaults.cars])
+    parser.add_argument('--dispatch', choices=list(POLICIES), nargs='+', default=[defaults.dispatch])
+    parser.add_argument('--scheduler', choices=list(SCHEDULERS), nargs='+', default=[defaults.scheduler])
+    parser.add_argument('--seeds', type=int, default=1, help="number of seeds per grid cell")
+    parser.add_argument('--ticks', type=int, default=defaults.ticks, help="number of ticks per run")
+    parser.add_argument('--engine', choices=list(SIMULATIONS), default=TICK_ENGINE)
+    parser.add_argument('--workers', type=int, default=None, help="number of worker processes")
+    parser.add_argument('--output', default='sweep.jsonl', help="JSON lines file, resumed when it exists")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    """Runs the sweep described by the command line and prints the progress."""
+    args = parse_args(argv)
+    base = SimulationConfig(ticks=args.ticks, engine=args.engine)
+    configs = build_grid(base, **{field: getattr(args, option) for option, field in GRID_OPTIONS.items()})
+    for done, record in enumerate(run_sweep(configs, range(args.seeds), args.output, args.workers), start=1):
+        print(f"{done}: capacity={record['capacity']} passengers={record['passenger_count']} "
+              f"top_floor={record['top_floor']} cars={record['cars']} dispatch={record['dispatch']} "
+              f"scheduler={record['scheduler']} seed={record['seed']} "
+              f"trips={record['trips']} waiting={record['waiting']}")
+
+
+if __name__ == "__main__":
+    main()
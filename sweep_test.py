@@ -0,0 +1,61 @@
+import json
+from dataclasses import replace
+
+from constants import EVENT_ENGINE
+from simulation import SimulationConfig
+from sweep import build_grid, job_key, load_completed, run_sweep
+
+SIMULATED_FIELDS = ('key', 'trips', 'waiting', 'ticks')
+
+
+def simulated(records) -> list:
+    """Drops the wall-clock timing from the records and orders them."""
+    return sorted(tuple(record[field] for field in SIMULATED_FIELDS) for record in records)
+
+
+class TestSweep:
+    """Test suite for the parallel parameter sweep."""
+
+    def setup_method(self):
+        """Prepares a small grid of short runs."""
+        base = SimulationConfig(ticks=200, engine=EVENT_ENGINE)
+        self.configs = build_grid(base, capacity=[2, 6], passenger_count=[10, 40])
+
+    def test_build_grid(self):
+        """The grid holds one config per combination of values."""
+        assert len(self.configs) == 4
+        assert {(config.capacity, config.passenger_count) for config in self.configs} == {
+            (2, 10), (2, 40), (6, 10), (6, 40)}
+        assert all(config.ticks == 200 for config in self.configs)
+
+    def test_results_do_not_depend_on_worker_count(self):
+        """The same seeds give the same results with one or several workers."""
+        single = list(run_sweep(self.configs, range(2), workers=1))
+        several = list(run_sweep(self.configs, range(2), workers=3))
+        assert len(single) == 8
+        assert simulated(single) == simulated(several)
+
+    def test_job_key(self):
+        """A key names the version, the seed, the sweep options and the fields set away from their default."""
+        config = self.configs[0]
+        assert json.loads(job_key(config, 3)) == {
+            'version': 1, 'seed': 3,
+            'config': {'capacity': 2, 'passenger_count': 10, 'top_floor': config.top_floor, 'cars': 1,
+                       'dispatch': 'nearest', 'scheduler': 'legacy', 'ticks': 200, 'engine': EVENT_ENGINE}}
+        assert job_key(replace(config, seed=8, show_state=True), 3) == job_key(config, 3)
+        assert json.loads(job_key(replace(config, zones=2), 3))['config']['zones'] == 2
+
+    def test_resume(self, tmp_path):
+        """Jobs already in the output file are not run again."""
+        output = str(tmp_path / 'sweep.jsonl')
+        first = list(run_sweep(self.configs[:2], range(2), output=output, workers=2))
+        assert len(first) == 4
+        with open(output, 'a') as file:
+            file.write('{"key": "interrupted')
+
+        rest = list(run_sweep(self.configs, range(2), output=output, workers=2))
+        assert len(rest) == 4
+        assert len(load_completed(output)) == 8
+        with open(output) as file:
+            keys = [json.loads(line)['key'] for line in file if line.endswith('}\n')]
+        assert len(keys) == len(set(keys))
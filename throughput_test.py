@@ -0,0 +1,32 @@
+import json
+import os
+
+from benchmarks.throughput import AXES, BASE, Measurement, cases, compare, measure
+
+BASELINE = os.path.join(os.path.dirname(__file__), 'benchmarks', 'baseline.json')
+
+
+class TestThroughputBenchmark:
+    """Test suite for the throughput benchmark and its comparison with a baseline."""
+
+    def test_compare_reports_regressions(self):
+        """Slower, bigger or different cases are regressions, changes within the tolerance pass."""
+        baseline = {'fast': {'ticks_per_second': 1000, 'trips_per_second': 500, 'trips': 50, 'peak_kib': 100},
+                    'gone': {'ticks_per_second': 1000, 'trips_per_second': 500, 'trips': 50, 'peak_kib': 100}}
+        passing = {'fast': Measurement(ticks_per_second=850, trips_per_second=425, trips=50, peak_kib=115),
+                   'new': Measurement(ticks_per_second=1, trips_per_second=1, trips=1, peak_kib=1e6)}
+        assert compare(passing, baseline, tolerance=0.2) == []
+        failing = {'fast': Measurement(ticks_per_second=700, trips_per_second=350, trips=51, peak_kib=130)}
+        assert compare(failing, baseline, tolerance=0.2) == ['fast: 700 ticks/s, baseline 1000',
+                                                             'fast: 130 KiB peak, baseline 100',
+                                                             'fast: 51 trips, baseline 50']
+
+    def test_stored_baseline_matches_the_simulation(self):
+        """The committed baseline covers every case, and the quick cases still deliver its trip counts."""
+        with open(BASELINE) as file:
+            baseline = json.load(file)
+        configs = cases(BASE, AXES)
+        assert set(baseline) == set(configs)
+        results = {case: measure(configs[case], repeat=1) for case in ('capacity=8', 'cars=4', 'top_floor=40')}
+        # Timings and memory depend on the machine, only the trip counts are compared here.
+        assert compare(results, baseline, tolerance=float('inf')) == []
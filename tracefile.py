@@ -0,0 +1,245 @@
+import argparse
+import mmap
+import struct
+from bisect import bisect_left
+from typing import Iterator, NamedTuple, Optional
+
+from events import (Alighted, Arrived, Boarded, Called, DoorsClosed, DoorsOpened, Ejected, EventLevel, EventSink,
+                    FloorSelected, Refused, Transferred)
+from exceptions import InvalidTraceError
+
+MAGIC = b'ELVTRACE'
+VERSION = 1
+# Magic, format version and record size.
+HEADER = struct.Struct('<8sHH4x')
+# Time, passenger id, floor, car id, event type and a padding byte.
+RECORD = struct.Struct('<diihBx')
+DEFAULT_BATCH_SIZE = 65536
+NO_PASSENGER = -1
+
+# The code of an event type in a trace is its position in this tuple, new types go at the end.
+EVENT_TYPES = (DoorsOpened, DoorsClosed, Arrived, Boarded, Alighted, Ejected, Called, FloorSelected, Refused,
+               Transferred)
+EVENT_CODES = {event_type: code for code, event_type in enumerate(EVENT_TYPES)}
+EVENT_NAMES = {event_type.__name__.lower(): code for code, event_type in enumerate(EVENT_TYPES)}
+
+
+class TraceRecord(NamedTuple):
+    """A single event read back from a trace."""
+    time: float
+    passenger: int
+    floor: int
+    car: int
+    kind: int
+
+    @property
+    def event_type(self) -> type:
+        """Returns the event class the record was written from."""
+        return EVENT_TYPES[self.kind]
+
+
+class TraceWriter(EventSink):
+    """
+    Sink writing the events to a binary trace file, one fixed-width record per event.
+
+    Records are packed into a preallocated buffer and written out a batch at a time. A record holds
+    the simulation time, the passenger id (-1 for car events), the floor, the car id and the event
+    type, so a day of a busy building stays in the range of a few hundred megabytes.
+
+    Attributes:
+        path (str): The trace file.
+        clock (VirtualClock): The simulation clock timestamping the events.
+        cars (dict): Id of every car, in the order the cars were registered or first seen.
+        batch_size (int): Number of records buffered before they are written out.
+        records (int): Number of records written so far, including the buffered ones.
+    """
+
+    def __init__(self, path: str, clock, batch_size: int = DEFAULT_BATCH_SIZE,
+                 level: EventLevel = EventLevel.DEBUG) -> None:
+        """Creates the trace file and writes its header."""
+        self.path = path
+        self.clock = clock
+        self.cars = {}
+        self.batch_size = batch_size
+        self.level = level
+        self.records = 0
+        self._buffer = bytearray(batch_size * RECORD.size)
+        self._buffered = 0
+        self._file = open(path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+
+    def car_id(self, elevator) -> int:
+        """Returns the id of the car in the trace, registering new cars."""
+        car = self.cars.get(elevator)
+        if car is None:
+            car = self.cars[elevator] = len(self.cars)
+        return car
+
+    def emit(self, event) -> None:
+        car = self.car_id(event.elevator)
+        passenger = getattr(event, 'passenger', None)
+        floor = getattr(event, 'floor', None)
+        RECORD.pack_into(self._buffer, self._buffered * RECORD.size,
+                         self.clock.now,
+                         NO_PASSENGER if passenger is None else passenger.passenger_id,
+                         event.elevator.current_floor if floor is None else floor,
+                         car,
+                         EVENT_CODES[type(event)])
+        self._buffered += 1
+        self.records += 1
+        if self._buffered == self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes the buffered records to the file."""
+        if self._buffered and not self._file.closed:
+            self._file.write(memoryview(self._buffer)[:self._buffered * RECORD.size])
+            self._buffered = 0
+            self._file.flush()
+
+    def close(self) -> None:
+        """Writes the remaining records and closes the file."""
+        self.flush()
+        self._file.close()
+
+    def __enter__(self) -> 'TraceWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class TraceReader:
+    """
+    Reads a trace file through a memory map, so only the pages that are actually read are loaded.
+
+    Records are in time order, which lets `filter` find a time range with a binary search.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Maps the trace file and checks its header."""
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # An empty file cannot be mapped.
+            self._file.close()
+            raise InvalidTraceError(path, "the file is empty")
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise InvalidTraceError(path, "the header is incomplete")
+        magic, version, record_size = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self.close()
+            raise InvalidTraceError(path, f"not a version {VERSION} trace")
+        # A trailing partial record of an interrupted run is ignored.
+        self._count = (len(self._map) - HEADER.size) // RECORD.size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> TraceRecord:
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return TraceRecord(*RECORD.unpack_from(self._map, HEADER.size + index * RECORD.size))
+
+    def __iter__(self) -> Iterator[TraceRecord]:
+        return self._records(0, self._count)
+
+    def _records(self, start: int, stop: int) -> Iterator[TraceRecord]:
+        """Yields the records from index `start` up to `stop`."""
+        view = memoryview(self._map)[HEADER.size + start * RECORD.size:HEADER.size + stop * RECORD.size]
+        try:
+            for values in RECORD.iter_unpack(view):
+                yield TraceRecord(*values)
+        finally:
+            view.release()
+
+    def _time_index(self, time: float) -> int:
+        """Returns the index of the first record at or after `time`."""
+        times = _TimeColumn(self._map, self._count)
+        return bisect_left(times, time)
+
+    def filter(self,
+               kinds=None,
+               car: Optional[int] = None,
+               passenger: Optional[int] = None,
+               start: Optional[float] = None,
+               end: Optional[float] = None) -> Iterator[TraceRecord]:
+        """
+        Yields the records matching every given criterion: event types (classes or lowercase names),
+        car id, passenger id and the time range from `start` up to, but excluding, `end`.
+        """
+        codes = None
+        if kinds is not None:
+            codes = {EVENT_CODES[kind] if isinstance(kind, type) else EVENT_NAMES[kind] for kind in kinds}
+        first = self._time_index(start) if start is not None else 0
+        last = self._time_index(end) if end is not None else self._count
+        for record in self._records(first, last):
+            if codes is not None and record.kind not in codes:
+                continue
+            if car is not None and record.car != car:
+                continue
+            if passenger is not None and record.passenger != passenger:
+                continue
+            yield record
+
+    def to_numpy(self):
+        """
+        Returns the records as a NumPy structured array sharing the memory map, nothing is copied.
+        The array must be released before the reader is closed.
+        """
+        import numpy as np
+
+        dtype = np.dtype({'names': TraceRecord._fields,
+                          'formats': ['<f8', '<i4', '<i4', '<i2', 'u1'],
+                          'offsets': [0, 8, 12, 16, 18],
+                          'itemsize': RECORD.size})
+        return np.frombuffer(self._map, dtype=dtype, count=self._count, offset=HEADER.size)
+
+    def close(self) -> None:
+        """Unmaps and closes the file."""
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> 'TraceReader':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class _TimeColumn:
+    """Sequence view of the record times, for binary searches."""
+
+    def __init__(self, buffer, count: int) -> None:
+        self._buffer = buffer
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> float:
+        return struct.unpack_from('<d', self._buffer, HEADER.size + index * RECORD.size)[0]
+
+
+def main(argv=None) -> None:
+    """Prints the records of a trace matching the command line filters."""
+    parser = argparse.ArgumentParser(description="Prints the events of a simulation trace.")
+    parser.add_argument('path', help="trace file")
+    parser.add_argument('--kind', nargs='+', choices=list(EVENT_NAMES), help="event types to print")
+    parser.add_argument('--car', type=int, help="car id")
+    parser.add_argument('--passenger', type=int, help="passenger id")
+    parser.add_argument('--start', type=float, help="earliest time")
+    parser.add_argument('--end', type=float, help="time after the last printed event")
+    args = parser.parse_args(argv)
+    with TraceReader(args.path) as reader:
+        for record in reader.filter(args.kind, args.car, args.passenger, args.start, args.end):
+            passenger = '' if record.passenger == NO_PASSENGER else f" passenger={record.passenger}"
+            print(f"{record.time:g} car={record.car} floor={record.floor}{passenger} "
+                  f"{record.event_type.__name__}")
+
+
+if __name__ == "__main__":
+    main()
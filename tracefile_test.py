@@ -0,0 +1,95 @@
+import pytest
+
+from clock import VirtualClock
+from elevator import Elevator, Passenger
+from events import Alighted, Arrived, Boarded
+from exceptions import InvalidTraceError
+from simulation import SIMULATIONS, SimulationConfig
+from tracefile import NO_PASSENGER, RECORD, TraceReader, TraceWriter
+from utils import set_elevator_for_passengers
+
+
+class TestTraceFile:
+    """Test suite for the binary trace writer and reader."""
+
+    def write_trip(self, path, batch_size=4):
+        """Traces a passenger riding from floor 2 to floor 4, one tick per move."""
+        clock = VirtualClock()
+        writer = TraceWriter(path, clock, batch_size=batch_size)
+        elevator = Elevator(sink=writer)
+        passenger = Passenger(current_floor=2, target_floor=4, passenger_id=7)
+        set_elevator_for_passengers([passenger], elevator)
+        passenger._is_resting = False
+        with writer:
+            for _ in range(8):
+                elevator.move()
+                passenger.move()
+                clock.tick()
+        return writer
+
+    def test_round_trip(self, tmp_path):
+        """Every event comes back with its time, car, floor and passenger."""
+        path = str(tmp_path / 'trip.trace')
+        writer = self.write_trip(path)
+        with TraceReader(path) as reader:
+            assert len(reader) == writer.records
+            records = list(reader)
+            assert [record.time for record in records] == sorted(record.time for record in records)
+            boarded = next(record for record in records if record.event_type is Boarded)
+            assert (boarded.time, boarded.floor, boarded.passenger, boarded.car) == (1, 2, 7, 0)
+            alighted = next(record for record in records if record.event_type is Alighted)
+            assert (alighted.time, alighted.floor) == (3, 4)
+            assert all(record.passenger == NO_PASSENGER for record in records if record.event_type is Arrived)
+            assert reader[len(reader) - 1] == records[-1]
+
+    def test_filters(self, tmp_path):
+        """Records are filtered by type, car, passenger and time range."""
+        path = str(tmp_path / 'trip.trace')
+        self.write_trip(path)
+        with TraceReader(path) as reader:
+            arrivals = list(reader.filter(kinds=['arrived']))
+            assert [record.floor for record in arrivals] == [2, 3, 4]
+            assert list(reader.filter(kinds=[Arrived], start=2, end=4)) == arrivals[1:]
+            assert all(record.passenger == 7 for record in reader.filter(passenger=7))
+            assert not list(reader.filter(car=1))
+            assert not list(reader.filter(start=100))
+
+    def test_columns(self, tmp_path):
+        """The trace maps onto a NumPy structured array without a copy."""
+        path = str(tmp_path / 'trip.trace')
+        self.write_trip(path)
+        with TraceReader(path) as reader:
+            columns = reader.to_numpy()
+            assert len(columns) == len(reader)
+            assert list(columns['floor']) == [record.floor for record in reader]
+            assert not columns.flags.owndata
+            del columns
+
+    def test_truncated_and_invalid_files(self, tmp_path):
+        """A partial last record is ignored, a file of another format is refused."""
+        path = tmp_path / 'trip.trace'
+        self.write_trip(str(path))
+        data = path.read_bytes()
+        path.write_bytes(data[:-RECORD.size // 2])
+        with TraceReader(str(path)) as reader:
+            assert len(reader) == (len(data) - 16) // RECORD.size - 1
+        other = tmp_path / 'other.bin'
+        other.write_bytes(b'not a trace at all')
+        with pytest.raises(InvalidTraceError):
+            TraceReader(str(other))
+        empty = tmp_path / 'empty.bin'
+        empty.write_bytes(b'')
+        with pytest.raises(InvalidTraceError):
+            TraceReader(str(empty))
+
+    def test_simulation_trace(self, tmp_path):
+        """A traced run records one alighting per trip, with the car ids in bank order."""
+        for name, engine in SIMULATIONS.items():
+            path = str(tmp_path / f'{name}.trace')
+            config = SimulationConfig(ticks=300, passenger_count=50, cars=3, seed=4, trace=path)
+            simulation = engine(config)
+            result = simulation.run()
+            assert list(simulation.trace.cars.values()) == [0, 1, 2]
+            with TraceReader(path) as reader:
+                assert sum(1 for _ in reader.filter(kinds=['alighted'])) == result.trips
+                assert {record.car for record in reader} <= {0, 1, 2}
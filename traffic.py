@@ -0,0 +1,163 @@
+import csv
+import random
+from abc import ABC, abstractmethod
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+from building import random_floor_except
+from exceptions import InvalidFloorError
+
+SECONDS_PER_MINUTE = 60
+# Share of the lunch-time journeys going out of the building, coming back and between floors.
+LUNCH_MIX = (0.45, 0.45, 0.10)
+
+
+class Arrival(NamedTuple):
+    """A person arriving on a landing at `time` seconds, heading for `destination`."""
+    time: float
+    origin: int
+    destination: int
+
+
+class TrafficSource(ABC):
+    """Produces the arrivals of people at the landings, in time order."""
+
+    @abstractmethod
+    def arrivals(self, rng: random.Random, lower_floor: int, top_floor: int,
+                 lobby: Optional[int] = None) -> Iterator[Arrival]:
+        """
+        Yields the arrivals of a building with floors from `lower_floor` to `top_floor`, entered at `lobby`,
+        the lowest floor by default.
+        """
+
+
+class PoissonTraffic(TrafficSource):
+    """
+    Arrivals at random moments at a constant average rate, with the journeys drawn by `journey`.
+
+    Attributes:
+        rate (float): Average number of arrivals per minute.
+    """
+
+    def __init__(self, rate: float) -> None:
+        """Initializes the source with its average number of arrivals per minute."""
+        self.rate = rate
+
+    def arrivals(self, rng: random.Random, lower_floor: int, top_floor: int,
+                 lobby: Optional[int] = None) -> Iterator[Arrival]:
+        lobby = lower_floor if lobby is None else lobby
+        time = 0.0
+        rate = self.rate / SECONDS_PER_MINUTE
+        while True:
+            time += rng.expovariate(rate)
+            origin, destination = self.journey(rng, lower_floor, top_floor, lobby)
+            yield Arrival(time, origin, destination)
+
+    @abstractmethod
+    def journey(self, rng: random.Random, lower_floor: int, top_floor: int, lobby: int) -> tuple:
+        """Returns the origin and the destination of a journey."""
+
+
+def incoming_journey(rng: random.Random, lower_floor: int, top_floor: int, lobby: int) -> tuple:
+    """Returns a journey from the lobby to any other floor, the basements included."""
+    return lobby, random_floor_except(rng, lower_floor, top_floor, lobby)
+
+
+def outgoing_journey(rng: random.Random, lower_floor: int, top_floor: int, lobby: int) -> tuple:
+    """Returns a journey from any other floor to the lobby."""
+    return random_floor_except(rng, lower_floor, top_floor, lobby), lobby
+
+
+def interfloor_journey(rng: random.Random, lower_floor: int, top_floor: int, lobby: int) -> tuple:
+    """Returns a journey between two different floors, the lobby included."""
+    origin = rng.randint(lower_floor, top_floor)
+    destination = rng.randint(lower_floor, top_floor - 1)
+    return origin, destination + (destination >= origin)
+
+
+class UpPeakTraffic(PoissonTraffic):
+    """Morning traffic: everyone enters at the lobby and goes up."""
+
+    def journey(self, rng: random.Random, lower_floor: int, top_floor: int, lobby: int) -> tuple:
+        return incoming_journey(rng, lower_floor, top_floor, lobby)
+
+
+class DownPeakTraffic(PoissonTraffic):
+    """Evening traffic: everyone goes down to the lobby and leaves."""
+
+    def journey(self, rng: random.Random, lower_floor: int, top_floor: int, lobby: int) -> tuple:
+        return outgoing_journey(rng, lower_floor, top_floor, lobby)
+
+
+class InterfloorTraffic(PoissonTraffic):
+    """Traffic between the floors of the building."""
+
+    def journey(self, rng: random.Random, lower_floor: int, top_floor: int, lobby: int) -> tuple:
+        return interfloor_journey(rng, lower_floor, top_floor, lobby)
+
+
+class LunchTraffic(PoissonTraffic):
+    """Lunch-time traffic: a mix of journeys out of the building, back into it and between floors."""
+
+    def journey(self, rng: random.Random, lower_floor: int, top_floor: int, lobby: int) -> tuple:
+        outgoing, incoming, _ = LUNCH_MIX
+        draw = rng.random()
+        if draw < outgoing:
+            return outgoing_journey(rng, lower_floor, top_floor, lobby)
+        if draw < outgoing + incoming:
+            return incoming_journey(rng, lower_floor, top_floor, lobby)
+        return interfloor_journey(rng, lower_floor, top_floor, lobby)
+
+
+class RecordedTraffic(TrafficSource):
+    """
+    Replays the arrivals recorded in a CSV file with the columns `time`, `origin` and `destination`,
+    times in seconds and in increasing order. The file is read lazily, one row at a time.
+
+    Attributes:
+        path (str): The recorded arrivals.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initializes the source reading `path`."""
+        self.path = path
+
+    def arrivals(self, rng: random.Random, lower_floor: int, top_floor: int,
+                 lobby: Optional[int] = None) -> Iterator[Arrival]:
+        with open(self.path, newline='') as file:
+            previous = 0.0
+            for row in csv.DictReader(file):
+                arrival = Arrival(float(row['time']), int(row['origin']), int(row['destination']))
+                for floor in (arrival.origin, arrival.destination):
+                    if not lower_floor <= floor <= top_floor:
+                        raise InvalidFloorError(floor, lower_floor, top_floor)
+                if arrival.time < previous:
+                    raise ValueError(f"{self.path}: arrival at {arrival.time} recorded after {previous}")
+                previous = arrival.time
+                if arrival.origin != arrival.destination:
+                    yield arrival
+
+
+def write_arrivals(path: str, arrivals: Iterable[Arrival]) -> None:
+    """Records the arrivals in a CSV file that `RecordedTraffic` replays."""
+    with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(Arrival._fields)
+        writer.writerows(arrivals)
+
+
+TRAFFIC_PROFILES = {
+    'up-peak': UpPeakTraffic,
+    'down-peak': DownPeakTraffic,
+    'lunch': LunchTraffic,
+    'interfloor': InterfloorTraffic,
+}
+
+
+def create_traffic(traffic: Optional[str], rate: float) -> Optional[TrafficSource]:
+    """Creates the named traffic profile with `rate` arrivals per minute, or replays the file `traffic`."""
+    if traffic is None:
+        return None
+    profile = TRAFFIC_PROFILES.get(traffic)
+    if profile:
+        return profile(rate)
+    return RecordedTraffic(traffic)
@@ -0,0 +1,91 @@
+from itertools import islice
+from random import Random
+
+import pytest
+
+from exceptions import InvalidFloorError
+from simulation import SIMULATIONS, SimulationConfig
+from traffic import (Arrival, DownPeakTraffic, InterfloorTraffic, LunchTraffic, RecordedTraffic, UpPeakTraffic,
+                     create_traffic, write_arrivals)
+
+
+def sample(source, count=2000, lower_floor=1, top_floor=10):
+    """Returns the first `count` arrivals of the source in a seeded building."""
+    return list(islice(source.arrivals(Random(1), lower_floor, top_floor), count))
+
+
+class TestTraffic:
+    """Test suite for the traffic sources and the runs they drive."""
+
+    def test_profiles(self):
+        """Each profile draws the journeys of its time of day."""
+        up = sample(UpPeakTraffic(10))
+        assert all(arrival.origin == 1 and 2 <= arrival.destination <= 10 for arrival in up)
+        down = sample(DownPeakTraffic(10))
+        assert all(arrival.destination == 1 and 2 <= arrival.origin <= 10 for arrival in down)
+        interfloor = sample(InterfloorTraffic(10))
+        assert all(arrival.origin != arrival.destination for arrival in interfloor)
+        assert {arrival.destination for arrival in interfloor} == set(range(1, 11))
+        lunch = sample(LunchTraffic(10))
+        to_lobby = sum(arrival.destination == 1 for arrival in lunch) / len(lunch)
+        from_lobby = sum(arrival.origin == 1 for arrival in lunch) / len(lunch)
+        assert 0.42 < to_lobby < 0.55 and 0.42 < from_lobby < 0.55
+
+    def test_profiles_enter_at_the_lobby_above_the_basements(self):
+        """With basements, people enter and leave at the lobby, and some of them ride down to a basement."""
+        up = list(islice(UpPeakTraffic(10).arrivals(Random(1), -2, 10, lobby=1), 2000))
+        assert all(arrival.origin == 1 and arrival.destination != 1 for arrival in up)
+        assert {arrival.destination for arrival in up} == set(range(-2, 11)) - {1}
+        down = list(islice(DownPeakTraffic(10).arrivals(Random(1), -2, 10, lobby=1), 2000))
+        assert all(arrival.destination == 1 and arrival.origin != 1 for arrival in down)
+        simulation = SIMULATIONS['event'](SimulationConfig(lower_floor=-2, top_floor=12, cars=4, zones=2,
+                                                           traffic='up-peak', seed=1))
+        assert simulation.lobby == 1 and simulation.next_arrival().origin == 1
+
+    def test_poisson_rate(self):
+        """Arrivals come in time order at the requested rate per minute."""
+        arrivals = sample(UpPeakTraffic(6), count=6000)
+        times = [arrival.time for arrival in arrivals]
+        assert times == sorted(times)
+        assert 0.95 < len(arrivals) / (times[-1] / 60) / 6 < 1.05
+
+    def test_recorded_traffic(self, tmp_path):
+        """Recorded arrivals are replayed as written, checked against the building."""
+        path = str(tmp_path / 'arrivals.csv')
+        recorded = [Arrival(0.5, 1, 4), Arrival(30.0, 6, 1), Arrival(30.0, 3, 3), Arrival(95.25, 2, 9)]
+        write_arrivals(path, recorded)
+        arrivals = RecordedTraffic(path).arrivals(Random(), 1, 10)
+        assert next(arrivals) == recorded[0]
+        # A journey to the floor of origin is no journey at all.
+        assert list(arrivals) == [recorded[1], recorded[3]]
+        with pytest.raises(InvalidFloorError):
+            list(RecordedTraffic(path).arrivals(Random(), 1, 5))
+        write_arrivals(path, [Arrival(10, 1, 2), Arrival(5, 2, 1)])
+        with pytest.raises(ValueError):
+            list(RecordedTraffic(path).arrivals(Random(), 1, 10))
+
+    def test_create_traffic(self, tmp_path):
+        """Profiles are created by name, anything else is a recording."""
+        assert create_traffic(None, 10) is None
+        assert isinstance(create_traffic('lunch', 10), LunchTraffic)
+        assert create_traffic('lunch', 4).rate == 4
+        assert create_traffic(str(tmp_path / 'day.csv'), 10).path == str(tmp_path / 'day.csv')
+
+    def test_replay_delivers_every_arrival(self, tmp_path):
+        """Every engine delivers the recorded people, who then leave the building."""
+        path = str(tmp_path / 'arrivals.csv')
+        write_arrivals(path, [Arrival(10, 1, 5), Arrival(20, 7, 2), Arrival(400, 3, 9)])
+        for engine in SIMULATIONS.values():
+            simulation = engine(SimulationConfig(ticks=60, traffic=path, seed=1))
+            result = simulation.run()
+            assert result.trips == 3
+            assert not simulation.passengers
+
+    def test_traffic_runs_are_reproducible(self):
+        """A seed reproduces a run driven by a traffic profile."""
+        for engine in SIMULATIONS.values():
+            results = [engine(SimulationConfig(ticks=30, cars=2, traffic='interfloor', traffic_rate=2,
+                                               seed=3)).run().trips for _ in range(2)]
+            assert results[0] == results[1] > 0
+        with pytest.raises(ValueError):
+            SIMULATIONS['tick'](SimulationConfig(traffic='lunch', columnar=True))
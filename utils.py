@@ -1,8 +1,11 @@
 import bisect
+from typing import Optional, TYPE_CHECKING
 
-from faker import Faker
+if TYPE_CHECKING:
+    from faker import Faker
 
-fake = Faker()
+# The shared name generator, Faker is slow to import and set up, so it is created on first use.
+_fake = None
 
 
 def find_closest(sorted_list: list, val: int) -> int:
@@ -39,12 +42,33 @@ def has_smaller(sorted_list: list, val: int) -> int:
     return pos > 0
 
 
-def generate_full_name() -> str:
-    """Generates a random passenger's full name"""
-    return fake.name()
+def create_faker(seed: Optional[int] = None) -> 'Faker':
+    """Creates a name generator of its own, seeded when `seed` is given"""
+    from faker import Faker
+
+    faker = Faker()
+    if seed is not None:
+        faker.seed_instance(seed)
+    return faker
+
+
+def generate_full_name(faker: Optional['Faker'] = None) -> str:
+    """Generates a random passenger's full name with `faker` or the shared generator"""
+    global _fake
+    if faker is None:
+        if _fake is None:
+            _fake = create_faker()
+        faker = _fake
+    return faker.name()
 
 
 def set_elevator_for_passengers(passengers_list, elevator):
     """Sets up a specific elevator for passengers"""
     for passenger in passengers_list:
         passenger.set_elevator(elevator)
+
+
+def set_bank_for_passengers(passengers_list, bank):
+    """Sets up an elevator bank dispatching the calls of the passengers"""
+    for passenger in passengers_list:
+        passenger.set_bank(bank)